@@ -9,6 +9,33 @@ class Settings(BaseSettings):
     supabase_url: str = ""
     supabase_key: str = ""
     api_key: str = ""
+    sheets_pool_size: int = 10
+    sheets_cache_ttl_seconds: float = 300.0
+    sheets_max_workers: int = 8
+    groq_max_workers: int = 4
+    storage_max_workers: int = 4
+    # "sheets" keeps Google Sheets as the system of record; "sqlite" serves
+    # everything from a local database and mirrors writes to Sheets.
+    storage_backend: str = "sheets"
+    sqlite_path: str = "aicc.db"
+    sheets_mirror: bool = True
+    # Acknowledge Sheets writes once journaled and flush them in batches.
+    sheets_write_behind: bool = False
+    sheets_journal_path: str = "sheets-journal.jsonl"
+    sheets_flush_interval_seconds: float = 5.0
+    # Google's default per-user Sheets quotas; requests are paced to stay
+    # under them and 429/5xx responses are retried with backoff.
+    sheets_read_quota_per_minute: int = 60
+    sheets_write_quota_per_minute: int = 60
+    sheets_max_retries: int = 5
+    # Split call logs into monthly worksheets listed in a manifest sheet,
+    # and compact months older than the archive age into one worksheet
+    # per year.
+    sheets_partition_call_logs: bool = False
+    sheets_archive_after_months: int = 3
+    sheets_archive_interval_seconds: float = 86400.0
+    # Revisions kept for delta sync; older cursors get a full resync.
+    sync_changelog_size: int = 10000
 
     model_config = {"env_file": ".env"}
 
@@ -1,9 +1,28 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routers import call_plan, calls, contacts, dashboard, recordings
+from app.auth import get_current_user
+from app.routers import call_plan, calls, contacts, dashboard, recordings, sync
+from app.services.executors import sheets_executor, shutdown_executors
+from app.services.sheets import (
+    SheetsService,
+    close_sheets_service,
+    get_sheets_service,
+    init_sheets_service,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await sheets_executor.run(init_sheets_service)
+    yield
+    shutdown_executors()
+    close_sheets_service()
 
-app = FastAPI(title="AICC Backend", version="0.1.0")
+
+app = FastAPI(title="AICC Backend", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -11,6 +30,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count"],
 )
 
 app.include_router(contacts.router)
@@ -18,8 +38,18 @@ app.include_router(call_plan.router)
 app.include_router(calls.router)
 app.include_router(recordings.router)
 app.include_router(dashboard.router)
+app.include_router(sync.router)
 
 
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/health/sheets")
+async def sheets_health(
+    sheets: SheetsService = Depends(get_sheets_service),
+    user: dict = Depends(get_current_user),
+):
+    # Quota pacing: request and retry counts and time spent queued.
+    return sheets.quota_metrics()
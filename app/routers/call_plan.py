@@ -1,41 +1,34 @@
-from datetime import date
-
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 
 from app.auth import get_current_user
+from app.services.executors import sheets_executor
 from app.services.sheets import SheetsService, get_sheets_service
 
 router = APIRouter(prefix="/api/callplan", tags=["call_plan"])
 
-EXCLUDED_STAGES = {"Won", "Lost", "NotInterested"}
+MAX_PAGE_SIZE = 500
 
 
 @router.get("/today")
 async def todays_call_plan(
+    response: Response,
+    offset: int = Query(0, ge=0),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
     sheets: SheetsService = Depends(get_sheets_service),
     user: dict = Depends(get_current_user),
 ):
-    contacts = sheets.get_all_contacts()
-    today = date.today().isoformat()
-
-    follow_ups = []
-    new_contacts = []
-
-    for c in contacts:
-        if c.get("deal_stage") in EXCLUDED_STAGES:
-            continue
-
-        # Follow-up due today or earlier
-        if c.get("next_follow_up") and c["next_follow_up"] <= today:
-            follow_ups.append(_to_plan_item(c, "Follow-up due"))
-        # New contact never called
-        elif c.get("deal_stage") == "New" and c.get("call_count", 0) == 0:
-            new_contacts.append(_to_plan_item(c, "New contact"))
+    """Due follow-ups and never-called new contacts, highest priority first.
 
-    return follow_ups + new_contacts
+    Priority weighs how overdue a follow-up is, the deal stage, the number
+    of calls so far and how the last call went. The plan size before
+    paging is sent in the X-Total-Count header.
+    """
+    total, plan = await sheets_executor.run(sheets.get_call_plan, limit, offset)
+    response.headers["X-Total-Count"] = str(total)
+    return [_to_plan_item(c, reason, score) for reason, score, c in plan]
 
 
-def _to_plan_item(contact: dict, reason: str) -> dict:
+def _to_plan_item(contact: dict, reason: str, priority: int) -> dict:
     return {
         "id": contact["id"],
         "name": contact["name"],
@@ -46,4 +39,5 @@ def _to_plan_item(contact: dict, reason: str) -> dict:
         "call_count": contact.get("call_count", 0),
         "last_call_summary": contact.get("last_call_summary"),
         "reason": reason,
+        "priority": priority,
     }
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException
 
 from app.auth import get_current_user
 from app.models import CallLogCreate
+from app.services.executors import sheets_executor
 from app.services.sheets import SheetsService, get_sheets_service
 
 router = APIRouter(prefix="/api/calls", tags=["calls"])
@@ -23,12 +24,46 @@ async def log_call(
     sheets: SheetsService = Depends(get_sheets_service),
     user: dict = Depends(get_current_user),
 ):
-    contact = sheets.get_contact_by_id(call.contact_id)
-    if contact is None:
+    # The log append and the contact update go out in one upstream request.
+    recorded = await sheets_executor.run(sheets.record_call, call.contact_id, _build_call(call))
+    if recorded is None:
         raise HTTPException(status_code=404, detail="Contact not found")
 
-    # Build call log data
-    log_data = {
+    call_log, _ = recorded
+    return call_log
+
+
+@router.post("/log/batch", status_code=201)
+async def log_calls(
+    calls: list[CallLogCreate],
+    sheets: SheetsService = Depends(get_sheets_service),
+    user: dict = Depends(get_current_user),
+):
+    """Log many calls at once, e.g. when the app syncs after being offline.
+
+    All call logs and contact updates go out together, with each call
+    counted on top of the ones before it. Calls for unknown contacts are
+    reported per row and do not fail the batch.
+    """
+    recorded = await sheets_executor.run(
+        sheets.record_calls, [(call.contact_id, _build_call(call)) for call in calls]
+    )
+    results = [
+        {"row": row_num, "status": "logged", "call_log": entry[0]}
+        if entry is not None
+        else {"row": row_num, "status": "error", "detail": "Contact not found"}
+        for row_num, entry in enumerate(recorded, start=1)
+    ]
+    logged = sum(entry is not None for entry in recorded)
+    return {"logged": logged, "failed": len(results) - logged, "results": results}
+
+
+def _build_call(call: CallLogCreate):
+    return lambda contact: (_call_log_data(call, contact), _contact_update(call, contact))
+
+
+def _call_log_data(call: CallLogCreate, contact: dict) -> dict:
+    return {
         "contact_id": call.contact_id,
         "contact_name": contact.get("name") or "",
         "duration_seconds": call.duration_seconds,
@@ -37,8 +72,9 @@ async def log_call(
         "deal_stage": call.deal_stage.value if call.deal_stage else contact.get("deal_stage") or "",
         "recording_url": call.recording_url or "",
     }
-    call_log = sheets.append_call_log(log_data)
 
+
+def _contact_update(call: CallLogCreate, contact: dict) -> dict:
     # Compute follow-up
     disposition = call.disposition.value
     if disposition in FOLLOW_UP_RULES:
@@ -50,7 +86,6 @@ async def log_call(
     else:
         next_follow_up = None
 
-    # Update contact
     update_data = {
         "call_count": contact.get("call_count", 0) + 1,
         "last_called": date.today().isoformat(),
@@ -59,10 +94,4 @@ async def log_call(
         update_data["last_call_summary"] = call.summary
     if next_follow_up is not None:
         update_data["next_follow_up"] = next_follow_up
-
-    try:
-        sheets.update_contact(call.contact_id, update_data)
-    except ValueError:
-        raise HTTPException(status_code=404, detail="Contact not found")
-
-    return call_log
+    return update_data
@@ -1,54 +1,172 @@
-from fastapi import APIRouter, Depends, HTTPException
+import codecs
+import csv
+import heapq
+import json
+import logging
+import operator
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from google.auth.exceptions import TransportError
+from gspread.exceptions import APIError
+from pydantic import ValidationError
+from requests.exceptions import RequestException
 
 from app.auth import get_current_user
 from app.models import ContactCreate, ContactUpdate
-from app.services.sheets import SheetsService, get_sheets_service
+from app.services.executors import sheets_executor
+from app.services.sheets import CONTACT_HEADERS, SheetsService, get_sheets_service
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/contacts", tags=["contacts"])
 
+# Rows written per append_rows call during an import.
+IMPORT_CHUNK_SIZE = 500
+
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+
+MAX_PAGE_SIZE = 500
+
 
 @router.get("")
 async def list_contacts(
+    response: Response,
     deal_stage: str | None = None,
     city: str | None = None,
     industry: str | None = None,
+    sort: str | None = None,
+    fields: str | None = None,
+    offset: int = Query(0, ge=0),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
     sheets: SheetsService = Depends(get_sheets_service),
     user: dict = Depends(get_current_user),
 ):
-    contacts = sheets.get_all_contacts()
-    if deal_stage:
-        contacts = [c for c in contacts if c.get("deal_stage") == deal_stage]
-    if city:
-        contacts = [c for c in contacts if c.get("city") == city]
-    if industry:
-        contacts = [c for c in contacts if c.get("industry") == industry]
+    """List contacts, optionally filtered, sorted, paged and projected.
+
+    ``sort`` is a column name, prefixed with ``-`` for descending order;
+    empty values sort last either way. ``fields`` is a comma-separated
+    list of columns to return. The number of matches before paging is
+    sent in the X-Total-Count header.
+    """
+    sort_key, descending = _parse_sort(sort)
+    columns = _parse_fields(fields)
+
+    filters = {
+        field: value
+        for field, value in (("deal_stage", deal_stage), ("city", city), ("industry", industry))
+        if value
+    }
+    contacts = await sheets_executor.run(sheets.find_contacts, **filters)
+    response.headers["X-Total-Count"] = str(len(contacts))
+
+    end = offset + limit if limit is not None else None
+    if sort_key:
+        contacts = _sort_contacts(contacts, sort_key, descending, end)
+    contacts = contacts[offset:end]
+    if columns:
+        contacts = [{key: c.get(key) for key in columns} for c in contacts]
     return contacts
 
 
+@router.get("/search")
+async def search_contacts(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    sheets: SheetsService = Depends(get_sheets_service),
+    user: dict = Depends(get_current_user),
+):
+    """Contacts whose name, notes or call summaries match ``q``, best first.
+
+    Each word of ``q`` matches as a prefix, so partial words work.
+    """
+    return await sheets_executor.run(sheets.search_contacts, q, limit)
+
+
 @router.get("/{contact_id}")
 async def get_contact(
     contact_id: str,
     sheets: SheetsService = Depends(get_sheets_service),
     user: dict = Depends(get_current_user),
 ):
-    contact = sheets.get_contact_by_id(contact_id)
+    contact = await sheets_executor.run(sheets.get_contact_by_id, contact_id)
     if contact is None:
         raise HTTPException(status_code=404, detail="Contact not found")
     return contact
 
 
+@router.get("/{contact_id}/calls")
+async def get_contact_calls(
+    contact_id: str,
+    response: Response,
+    offset: int = Query(0, ge=0),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    sheets: SheetsService = Depends(get_sheets_service),
+    user: dict = Depends(get_current_user),
+):
+    """A contact's call logs, newest first.
+
+    The contact's total number of calls is sent in the X-Total-Count header.
+    """
+    contact = await sheets_executor.run(sheets.get_contact_by_id, contact_id)
+    if contact is None:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    total, calls = await sheets_executor.run(sheets.get_call_history, contact_id, limit, offset)
+    response.headers["X-Total-Count"] = str(total)
+    return calls
+
+
 @router.post("", status_code=201)
 async def create_contact(
     contact: ContactCreate,
     sheets: SheetsService = Depends(get_sheets_service),
     user: dict = Depends(get_current_user),
 ):
-    data = contact.model_dump()
-    if data.get("next_follow_up"):
-        data["next_follow_up"] = data["next_follow_up"].isoformat()
-    if data.get("deal_stage"):
-        data["deal_stage"] = data["deal_stage"].value
-    return sheets.create_contact(data)
+    return await sheets_executor.run(sheets.create_contact, _contact_data(contact))
+
+
+@router.post("/import")
+async def import_contacts(
+    request: Request,
+    sheets: SheetsService = Depends(get_sheets_service),
+    user: dict = Depends(get_current_user),
+):
+    """Bulk-create contacts from a JSON array, CSV or NDJSON body.
+
+    CSV and NDJSON bodies are parsed as they stream in. Valid rows are
+    written in chunks of IMPORT_CHUNK_SIZE, and every input row gets a
+    result entry, so one bad row does not fail the whole import.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "text/csv":
+        items = _iter_csv(request)
+    elif content_type in NDJSON_CONTENT_TYPES:
+        items = _iter_ndjson(request)
+    elif content_type == "application/json":
+        items = await _iter_json_array(request)
+    else:
+        raise HTTPException(status_code=415, detail="Unsupported content type")
+
+    results: list[dict] = []
+    pending: list[tuple[int, dict]] = []
+    async for row_num, item in items:
+        try:
+            if isinstance(item, str):
+                contact = ContactCreate.model_validate_json(item)
+            else:
+                contact = ContactCreate.model_validate(item)
+        except ValidationError as e:
+            results.append({"row": row_num, "status": "error", "errors": _validation_errors(e)})
+            continue
+        pending.append((row_num, _contact_data(contact)))
+        if len(pending) >= IMPORT_CHUNK_SIZE:
+            results.extend(await _write_import_chunk(sheets, pending))
+            pending = []
+    results.extend(await _write_import_chunk(sheets, pending))
+
+    results.sort(key=lambda r: r["row"])
+    created = sum(1 for r in results if r["status"] == "created")
+    return {"created": created, "failed": len(results) - created, "results": results}
 
 
 @router.put("/{contact_id}")
@@ -64,7 +182,7 @@ async def update_contact(
     if "deal_stage" in data and data["deal_stage"]:
         data["deal_stage"] = data["deal_stage"].value
     try:
-        return sheets.update_contact(contact_id, data)
+        return await sheets_executor.run(sheets.update_contact, contact_id, data)
     except ValueError:
         raise HTTPException(status_code=404, detail="Contact not found")
 
@@ -76,6 +194,138 @@ async def delete_contact(
     user: dict = Depends(get_current_user),
 ):
     try:
-        sheets.delete_contact(contact_id)
+        await sheets_executor.run(sheets.delete_contact, contact_id)
     except ValueError:
         raise HTTPException(status_code=404, detail="Contact not found")
+
+
+def _contact_data(contact: ContactCreate) -> dict:
+    data = contact.model_dump()
+    if data.get("next_follow_up"):
+        data["next_follow_up"] = data["next_follow_up"].isoformat()
+    if data.get("deal_stage"):
+        data["deal_stage"] = data["deal_stage"].value
+    return data
+
+
+def _validation_errors(error: ValidationError) -> list[dict]:
+    return [
+        {"field": ".".join(str(part) for part in err["loc"]), "message": err["msg"]}
+        for err in error.errors()
+    ]
+
+
+def _parse_sort(sort: str | None) -> tuple[str | None, bool]:
+    if not sort:
+        return None, False
+    descending = sort.startswith("-")
+    key = sort.lstrip("-")
+    if key not in CONTACT_HEADERS:
+        raise HTTPException(status_code=422, detail=f"Cannot sort by {key!r}")
+    return key, descending
+
+
+def _parse_fields(fields: str | None) -> list[str]:
+    if not fields:
+        return []
+    columns = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in columns if f not in CONTACT_HEADERS]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown fields: {', '.join(unknown)}")
+    return columns
+
+
+def _sort_contacts(
+    contacts: list[dict], key: str, descending: bool, end: int | None
+) -> list[dict]:
+    present = [c for c in contacts if c.get(key) is not None]
+    missing = [c for c in contacts if c.get(key) is None]
+    sort_key = operator.itemgetter(key)
+    if end is None:
+        present.sort(key=sort_key, reverse=descending)
+    elif descending:
+        # Only the first page needs ordering: O(n log k) instead of a full sort.
+        present = heapq.nlargest(end, present, key=sort_key)
+    else:
+        present = heapq.nsmallest(end, present, key=sort_key)
+    return present + missing
+
+
+async def _write_import_chunk(
+    sheets: SheetsService, pending: list[tuple[int, dict]]
+) -> list[dict]:
+    if not pending:
+        return []
+    try:
+        created = await sheets_executor.run(
+            sheets.create_contacts, [data for _, data in pending]
+        )
+    except (APIError, RequestException, TransportError):
+        # The rest of the import can still succeed, so this chunk is
+        # reported per row; anything else is a bug and propagates.
+        logger.exception("Import of %d contacts failed", len(pending))
+        return [
+            {"row": row_num, "status": "error", "errors": [{"field": "", "message": "Write failed"}]}
+            for row_num, _ in pending
+        ]
+    return [
+        {"row": row_num, "status": "created", "id": contact["id"]}
+        for (row_num, _), contact in zip(pending, created)
+    ]
+
+
+async def _iter_lines(request: Request) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in request.stream():
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def _iter_csv(request: Request) -> AsyncIterator[tuple[int, dict]]:
+    header: list[str] | None = None
+    record: str | None = None
+    row_num = 0
+    async for line in _iter_lines(request):
+        record = line if record is None else f"{record}\n{line}"
+        # An odd number of quotes means a quoted field spans lines.
+        if record.count('"') % 2:
+            continue
+        text, record = record, None
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [h.strip() for h in values]
+            continue
+        row_num += 1
+        yield row_num, {k: v for k, v in zip(header, values) if v != ""}
+
+
+async def _iter_ndjson(request: Request) -> AsyncIterator[tuple[int, str]]:
+    row_num = 0
+    async for line in _iter_lines(request):
+        if not line.strip():
+            continue
+        row_num += 1
+        yield row_num, line
+
+
+async def _iter_json_array(request: Request) -> AsyncIterator[tuple[int, object]]:
+    try:
+        items = json.loads(await request.body())
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=422, detail="Expected a JSON array of contacts")
+
+    async def _iter():
+        for row_num, item in enumerate(items, start=1):
+            yield row_num, item
+
+    return _iter()
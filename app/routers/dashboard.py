@@ -1,46 +1,33 @@
-from datetime import date, timedelta
+from datetime import date
+from typing import Literal
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 
 from app.auth import get_current_user
+from app.services.executors import sheets_executor
 from app.services.sheets import SheetsService, get_sheets_service
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
+# Longest range served by /range, to bound the size of a daily series.
+MAX_RANGE_DAYS = 366
+
 
 @router.get("/stats")
 async def get_stats(
     sheets: SheetsService = Depends(get_sheets_service),
     user: dict = Depends(get_current_user),
 ):
-    today = date.today()
-    today_str = today.isoformat()
-
-    # Today's call logs
-    todays_logs = sheets.get_call_logs_by_date(today_str)
-    calls_today = len(todays_logs)
-    connected_today = sum(
-        1 for log in todays_logs if log.get("disposition") == "Connected"
-    )
+    # Today's counts and the streak (consecutive days with >= 1 call,
+    # ending today) come from per-day counters kept as calls are logged.
+    activity = await sheets_executor.run(sheets.get_call_activity, date.today())
+    calls_today = activity["calls"]
+    connected_today = activity["connected"]
     conversion_rate = connected_today / calls_today if calls_today > 0 else 0.0
+    streak = activity["streak"]
 
-    # Streak: consecutive days with >= 1 call, ending today
-    streak = 0
-    check_date = today
-    while True:
-        logs = sheets.get_call_logs_by_date(check_date.isoformat())
-        if not logs:
-            break
-        streak += 1
-        check_date -= timedelta(days=1)
-
-    # Pipeline: contact count per deal stage
-    contacts = sheets.get_all_contacts()
-    pipeline: dict[str, int] = {}
-    for c in contacts:
-        stage = c.get("deal_stage")
-        if stage:
-            pipeline[stage] = pipeline.get(stage, 0) + 1
+    # Pipeline: contact count per deal stage, from the deal_stage index
+    pipeline = await sheets_executor.run(sheets.count_contacts_by, "deal_stage")
 
     return {
         "calls_today": calls_today,
@@ -49,3 +36,26 @@ async def get_stats(
         "streak": streak,
         "pipeline": pipeline,
     }
+
+
+@router.get("/range")
+async def get_range(
+    start: date,
+    end: date,
+    interval: Literal["day", "week"] = "day",
+    sheets: SheetsService = Depends(get_sheets_service),
+    user: dict = Depends(get_current_user),
+):
+    """Call activity per day or week from ``start`` to ``end`` inclusive.
+
+    Each point has the call count, connected calls, connect rate, average
+    duration and the count per disposition. Weeks start on Monday.
+    """
+    if end < start:
+        raise HTTPException(status_code=422, detail="end must not be before start")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=422, detail=f"Range must be at most {MAX_RANGE_DAYS} days"
+        )
+    series = await sheets_executor.run(sheets.get_call_series, start, end, interval)
+    return {"start": start, "end": end, "interval": interval, "series": series}
@@ -2,6 +2,7 @@ import httpx
 from fastapi import APIRouter, Depends, HTTPException, UploadFile
 
 from app.auth import get_current_user
+from app.services.executors import groq_executor, sheets_executor, storage_executor
 from app.services.groq_service import GroqService, get_groq_service
 from app.services.sheets import SheetsService, get_sheets_service
 from app.services.storage import StorageService, get_storage_service
@@ -26,7 +27,9 @@ async def upload_recording(
     user: dict = Depends(get_current_user),
 ):
     data = await file.read()
-    url = storage.upload(data, file.filename, file.content_type or "audio/mpeg")
+    url = await storage_executor.run(
+        storage.upload, data, file.filename, file.content_type or "audio/mpeg"
+    )
     return {"url": url}
 
 
@@ -36,10 +39,10 @@ async def transcribe_recording(
     groq: GroqService = Depends(get_groq_service),
     user: dict = Depends(get_current_user),
 ):
-    response = httpx.get(request.recording_url)
+    response = await storage_executor.run(httpx.get, request.recording_url)
     response.raise_for_status()
     filename = request.recording_url.rsplit("/", 1)[-1] or "audio.mp3"
-    text = groq.transcribe(response.content, filename)
+    text = await groq_executor.run(groq.transcribe, response.content, filename)
     return {"text": text}
 
 
@@ -50,11 +53,12 @@ async def summarize_recording(
     sheets: SheetsService = Depends(get_sheets_service),
     user: dict = Depends(get_current_user),
 ):
-    contact = sheets.get_contact_by_id(request.contact_id)
+    contact = await sheets_executor.run(sheets.get_contact_by_id, request.contact_id)
     if contact is None:
         raise HTTPException(status_code=404, detail="Contact not found")
 
-    result = groq.summarize(
+    result = await groq_executor.run(
+        groq.summarize,
         transcript=request.transcript,
         contact_name=contact.get("contact_person") or contact.get("name", ""),
         business=contact.get("name"),
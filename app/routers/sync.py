@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+
+from app.auth import get_current_user
+from app.services.executors import sheets_executor
+from app.services.sheets import SheetsService, get_sheets_service
+
+router = APIRouter(prefix="/api/sync", tags=["sync"])
+
+
+@router.get("")
+async def sync(
+    since: str | None = None,
+    sheets: SheetsService = Depends(get_sheets_service),
+    user: dict = Depends(get_current_user),
+):
+    """Changes since the cursor returned by the previous sync.
+
+    Omit ``since`` on first sync. When ``reset`` is true the response is a
+    full snapshot and the client should replace its local copy; otherwise
+    it carries only changed contacts, deleted contact ids and new call logs.
+    """
+    return await sheets_executor.run(sheets.get_changes, since)
@@ -0,0 +1,38 @@
+from collections import Counter
+from datetime import date, timedelta
+
+INTERVALS = ("day", "week")
+
+
+def bucket_starts(start: date, end: date, interval: str) -> list[date]:
+    """First day of each bucket covering ``start``..``end`` inclusive.
+
+    Weeks run Monday to Sunday; the first and last weeks are clipped to
+    the range.
+    """
+    if interval == "day":
+        return [start + timedelta(days=n) for n in range((end - start).days + 1)]
+    if interval == "week":
+        monday = start - timedelta(days=start.weekday())
+        return [start] + [
+            monday + timedelta(days=n)
+            for n in range(7, (end - monday).days + 1, 7)
+        ]
+    raise ValueError(f"Unknown interval {interval!r}")
+
+
+def summarize(start: date, calls: int, total_duration: int, dispositions: Counter) -> dict:
+    """One point of a call-activity series."""
+    connected = dispositions.get("Connected", 0)
+    return {
+        "start": start.isoformat(),
+        "calls": calls,
+        "connected": connected,
+        "connect_rate": connected / calls if calls else 0.0,
+        "avg_duration_seconds": total_duration / calls if calls else 0.0,
+        "dispositions": {
+            disposition: count
+            for disposition, count in dispositions.most_common()
+            if disposition is not None
+        },
+    }
@@ -0,0 +1,97 @@
+import heapq
+from collections.abc import Iterable, Mapping
+from datetime import date
+
+# Closed deals never come back into the plan.
+EXCLUDED_STAGES = frozenset({"Won", "Lost", "NotInterested"})
+
+FOLLOW_UP_DUE = "Follow-up due"
+NEW_CONTACT = "New contact"
+
+# Priority points. Due follow-ups outrank new contacts, and gain weight
+# for each day they are overdue (up to MAX_OVERDUE_DAYS). Stages closer
+# to a deal and warm last calls add points; repeated calls cost points.
+REASON_WEIGHTS = {FOLLOW_UP_DUE: 100, NEW_CONTACT: 50}
+OVERDUE_DAY_WEIGHT = 3
+MAX_OVERDUE_DAYS = 30
+STAGE_WEIGHTS = {"Contacted": 10, "Qualified": 20, "Proposal": 30, "Negotiation": 40}
+CALL_COUNT_WEIGHT = -2
+MAX_CALL_COUNT = 10
+DISPOSITION_WEIGHTS = {"Callback": 25, "Connected": 10, "Voicemail": -5, "NoAnswer": -10}
+
+
+def plan_reason(contact: Mapping, today: str) -> str | None:
+    """Why ``contact`` belongs in the call plan for ``today``, or None."""
+    if contact["deal_stage"] in EXCLUDED_STAGES:
+        return None
+    # Follow-up due today or earlier
+    if contact["next_follow_up"] and contact["next_follow_up"] <= today:
+        return FOLLOW_UP_DUE
+    # New contact never called
+    if contact["deal_stage"] == "New" and not contact["call_count"]:
+        return NEW_CONTACT
+    return None
+
+
+def priority(contact: Mapping, reason: str, today: date, last_disposition: str | None) -> int:
+    """Score for ordering the call plan; higher is called first."""
+    score = REASON_WEIGHTS[reason]
+    if reason == FOLLOW_UP_DUE:
+        try:
+            overdue = (today - date.fromisoformat(contact["next_follow_up"][:10])).days
+        except ValueError:
+            # Hand-typed dates in the sheet still compare as due; they
+            # just earn no overdue points.
+            overdue = 0
+        score += OVERDUE_DAY_WEIGHT * min(max(overdue, 0), MAX_OVERDUE_DAYS)
+    score += STAGE_WEIGHTS.get(contact["deal_stage"], 0)
+    score += CALL_COUNT_WEIGHT * min(contact["call_count"] or 0, MAX_CALL_COUNT)
+    score += DISPOSITION_WEIGHTS.get(last_disposition, 0)
+    return score
+
+
+def top(scored: Iterable[tuple[int, object, object]], k: int | None) -> list:
+    """Items of ``(score, position, item)`` triples, best score first.
+
+    Ties keep ascending position. With ``k`` set, only the best ``k`` are
+    kept, in a heap of that size, so selection costs O(n log k).
+    """
+    if k is None:
+        ranked = sorted(scored, key=_rank_key)
+    else:
+        ranked = heapq.nsmallest(k, scored, key=_rank_key)
+    return [item for _, _, item in ranked]
+
+
+def _rank_key(entry: tuple) -> tuple:
+    score, position, _ = entry
+    return -score, position
+
+
+class CallPlan:
+    """Contacts due a call on ``day``, kept current as contacts change.
+
+    The plan is built once per day and then updated one contact at a time,
+    so reading it costs the size of the plan rather than of the sheet.
+    """
+
+    def __init__(self):
+        self.day: str | None = None
+        self._reasons: dict[str, str] = {}
+
+    def reset(self, day: str) -> None:
+        self.day = day
+        self._reasons = {}
+
+    def update(self, contact_id: str, record: Mapping | None) -> None:
+        reason = plan_reason(record, self.day) if record is not None else None
+        if reason is None:
+            self._reasons.pop(contact_id, None)
+        else:
+            self._reasons[contact_id] = reason
+
+    def __len__(self) -> int:
+        return len(self._reasons)
+
+    def items(self):
+        return self._reasons.items()
@@ -0,0 +1,199 @@
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+
+class _ObjectColumn:
+    __slots__ = ("values",)
+
+    def __init__(self):
+        self.values: list = []
+
+    def append(self, value) -> None:
+        self.values.append(value)
+
+    def get(self, i: int):
+        return self.values[i]
+
+    def set(self, i: int, value) -> None:
+        self.values[i] = value
+
+    def delete(self, i: int) -> None:
+        del self.values[i]
+
+
+class _IntColumn(_ObjectColumn):
+    __slots__ = ()
+
+    def __init__(self):
+        self.values = array("q")
+
+
+class _EnumColumn:
+    """Low-cardinality strings stored as codes into a shared vocabulary."""
+
+    __slots__ = ("codes", "vocabulary", "_lookup")
+
+    def __init__(self):
+        self.codes = array("H")
+        self.vocabulary: list = [None]
+        self._lookup: dict = {None: 0}
+
+    def _encode(self, value) -> int:
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.vocabulary)
+            self.vocabulary.append(value)
+            self._lookup[value] = code
+            if code > 0xFFFF and self.codes.typecode == "H":
+                self.codes = array("I", self.codes)
+        return code
+
+    def append(self, value) -> None:
+        # Encode first: it may swap in a wider codes array.
+        code = self._encode(value)
+        self.codes.append(code)
+
+    def get(self, i: int):
+        return self.vocabulary[self.codes[i]]
+
+    def set(self, i: int, value) -> None:
+        code = self._encode(value)
+        self.codes[i] = code
+
+    def delete(self, i: int) -> None:
+        del self.codes[i]
+
+
+class RowView(Mapping):
+    """Read-only mapping over one row of a Table.
+
+    Only valid until the table deletes a row before it; call ``dict()`` on
+    it to keep the values.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "Table", index: int):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        return self._table.get(self._index, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.headers)
+
+    def __len__(self) -> int:
+        return len(self._table.headers)
+
+    def __repr__(self) -> str:
+        return f"RowView({self.copy()!r})"
+
+    def copy(self) -> dict:
+        """The row as a new dict; much faster than ``dict(view)``."""
+        return self._table.record(self._index)
+
+
+class Table:
+    """Records with a fixed set of keys, stored column by column.
+
+    Integer columns live in ``array('q')``, enum columns as 16-bit codes
+    (widened to 32-bit if needed) into a per-column vocabulary, and other
+    columns as plain lists, so a row costs a few machine words instead of
+    a dict. Indexing yields RowView mappings; records go in as dicts.
+    """
+
+    def __init__(
+        self,
+        headers: Iterable[str],
+        int_columns: Iterable[str] = (),
+        enum_columns: Iterable[str] = (),
+    ):
+        self.headers = tuple(headers)
+        int_columns, enum_columns = set(int_columns), set(enum_columns)
+        self._positions = {key: i for i, key in enumerate(self.headers)}
+        self._columns = [
+            _IntColumn() if key in int_columns
+            else _EnumColumn() if key in enum_columns
+            else _ObjectColumn()
+            for key in self.headers
+        ]
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[RowView]:
+        for i in range(self._length):
+            yield RowView(self, i)
+
+    def _check(self, i: int) -> int:
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError("Table index out of range")
+        return i
+
+    def __getitem__(self, i: int) -> RowView:
+        return RowView(self, self._check(i))
+
+    def __setitem__(self, i: int, record: Mapping) -> None:
+        i = self._check(i)
+        for key, column in zip(self.headers, self._columns):
+            column.set(i, record[key])
+
+    def __delitem__(self, i: int) -> None:
+        i = self._check(i)
+        for column in self._columns:
+            column.delete(i)
+        self._length -= 1
+
+    def append(self, record: Mapping) -> None:
+        for key, column in zip(self.headers, self._columns):
+            column.append(record[key])
+        self._length += 1
+
+    def get(self, i: int, key: str) -> Any:
+        return self._columns[self._positions[key]].get(i)
+
+    def record(self, i: int) -> dict:
+        i = self._check(i)
+        return {key: column.get(i) for key, column in zip(self.headers, self._columns)}
+
+    def records(self, indices: Iterable[int] | None = None) -> list[dict]:
+        """Rows as dicts: all of them, or those at ``indices`` in that order."""
+        if indices is None:
+            columns = [self.column(key) for key in self.headers]
+            return [dict(zip(self.headers, values)) for values in zip(*columns)]
+        getters = [
+            (lambda i, c=column: c.vocabulary[c.codes[i]]) if isinstance(column, _EnumColumn)
+            else column.values.__getitem__
+            for column in self._columns
+        ]
+        return [
+            {key: get(i) for key, get in zip(self.headers, getters)}
+            for i in indices
+        ]
+
+    def column(self, key: str) -> list:
+        """All values of one column, in row order."""
+        column = self._columns[self._positions[key]]
+        if isinstance(column, _EnumColumn):
+            vocabulary = column.vocabulary
+            return [vocabulary[code] for code in column.codes]
+        return list(column.values)
+
+    def codes(self, key: str) -> tuple[array, list]:
+        """An enum column's codes and the vocabulary they index, uncopied."""
+        column = self._columns[self._positions[key]]
+        if not isinstance(column, _EnumColumn):
+            raise TypeError(f"{key!r} is not an enum column")
+        return column.codes, column.vocabulary
+
+    def ints(self, key: str) -> array:
+        """An int column's backing array, uncopied."""
+        column = self._columns[self._positions[key]]
+        if not isinstance(column, _IntColumn):
+            raise TypeError(f"{key!r} is not an int column")
+        return column.values
@@ -0,0 +1,50 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+from app.config import settings
+
+
+class BoundedExecutor:
+    """A dedicated thread pool for one blocking upstream client.
+
+    Routers await ``run`` instead of calling gspread, Groq or Supabase
+    directly, so a slow response only ties up a worker of that upstream's
+    pool and the event loop keeps serving other requests.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self._name = name
+        self._max_workers = max_workers
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix=self._name
+                )
+            return self._pool
+
+    async def run(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_pool(), partial(fn, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+
+sheets_executor = BoundedExecutor("sheets", settings.sheets_max_workers)
+groq_executor = BoundedExecutor("groq", settings.groq_max_workers)
+storage_executor = BoundedExecutor("storage", settings.storage_max_workers)
+
+
+def shutdown_executors() -> None:
+    for executor in (sheets_executor, groq_executor, storage_executor):
+        executor.shutdown()
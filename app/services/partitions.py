@@ -0,0 +1,117 @@
+import re
+from calendar import monthrange
+
+# Worksheet listing the call-log partitions, one row per worksheet.
+MANIFEST_TITLE = "CallLogPartitions"
+MANIFEST_HEADERS = ["title", "first_day", "last_day"]
+
+# The original single call-log worksheet. Unpartitioned, it is the one
+# partition and covers every date.
+LEGACY_TITLE = "CallLogs"
+
+# Sorts after every date, so ("", END_OF_TIME) is the whole history.
+END_OF_TIME = "\U0010ffff"
+
+_MONTH_RE = re.compile(r"\d{4}-(0[1-9]|1[0-2])")
+
+
+class Partition:
+    """A call-log worksheet holding the logs dated ``first_day``..``last_day``."""
+
+    __slots__ = ("title", "first_day", "last_day")
+
+    def __init__(self, title: str, first_day: str, last_day: str):
+        self.title = title
+        self.first_day = first_day
+        self.last_day = last_day
+
+    def __repr__(self) -> str:
+        return f"Partition({self.title!r}, {self.first_day!r}, {self.last_day!r})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Partition) and (
+            (self.title, self.first_day, self.last_day)
+            == (other.title, other.first_day, other.last_day)
+        )
+
+    @property
+    def is_month(self) -> bool:
+        month = month_of(self.first_day)
+        return month is not None and self == month_partition(month)
+
+
+def month_of(timestamp: str | None) -> str | None:
+    """The ``YYYY-MM`` an ISO timestamp falls in, or None if it has no date."""
+    month = (timestamp or "")[:7]
+    return month if _MONTH_RE.fullmatch(month) else None
+
+
+def month_partition(month: str) -> Partition:
+    year, number = map(int, month.split("-"))
+    last = monthrange(year, number)[1]
+    return Partition(f"CallLogs {month}", f"{month}-01", f"{month}-{last:02d}")
+
+
+def archive_title(year: str) -> str:
+    return f"CallLogs {year}"
+
+
+def archive_partition(year: str, first_day: str, last_day: str) -> Partition:
+    """One year's archive, spanning the months compacted into it so far."""
+    return Partition(archive_title(year), first_day, last_day)
+
+
+class PartitionManifest:
+    """The call-log partitions in date order. Their date ranges never overlap.
+
+    Instances are never changed in place. ``replace`` returns a new
+    manifest, so a reader can keep iterating an old one.
+    """
+
+    def __init__(self, partitions: list[Partition]):
+        unique = {}
+        for partition in partitions:
+            unique.setdefault(partition.title, partition)
+        # An interrupted rewrite of the manifest sheet can leave entries
+        # for months that were already compacted into an archive.
+        archives = [p for p in unique.values() if not p.is_month]
+        self.partitions = sorted(
+            (
+                p for p in unique.values()
+                if not p.is_month or not any(
+                    a.first_day <= p.first_day and p.last_day <= a.last_day for a in archives
+                )
+            ),
+            key=lambda p: p.first_day,
+        )
+
+    @classmethod
+    def unpartitioned(cls) -> "PartitionManifest":
+        return cls([Partition(LEGACY_TITLE, "", END_OF_TIME)])
+
+    @classmethod
+    def from_rows(cls, rows: list[list[str]]) -> "PartitionManifest":
+        return cls([Partition(*row[:3]) for row in rows[1:] if len(row) >= 3 and row[0]])
+
+    def rows(self) -> list[list[str]]:
+        return [MANIFEST_HEADERS, *([p.title, p.first_day, p.last_day] for p in self.partitions)]
+
+    def get(self, title: str) -> Partition | None:
+        return next((p for p in self.partitions if p.title == title), None)
+
+    def covering(self, first_day: str, last_day: str) -> list[Partition]:
+        """Partitions that may hold logs dated ``first_day``..``last_day``."""
+        return [p for p in self.partitions if p.first_day <= last_day and first_day <= p.last_day]
+
+    def route(self, day: str) -> Partition | None:
+        """The partition that holds logs dated ``day``, if there is one."""
+        return next((p for p in self.partitions if p.first_day <= day <= p.last_day), None)
+
+    def replace(self, removed=(), added: Partition | None = None) -> "PartitionManifest":
+        removed = set(removed)
+        if added is not None:
+            removed.add(added.title)
+        partitions = [p for p in self.partitions if p.title not in removed]
+        if added is not None:
+            partitions.append(added)
+        return PartitionManifest(partitions)
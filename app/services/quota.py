@@ -0,0 +1,206 @@
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from gspread.exceptions import APIError
+from gspread.http_client import HTTPClient
+
+logger = logging.getLogger(__name__)
+
+# Lower values are served first when requests queue for quota.
+INTERACTIVE = 0
+BACKGROUND = 1
+
+_priority: ContextVar[int] = ContextVar("sheets_priority", default=INTERACTIVE)
+
+# Jittered exponential backoff: attempt n sleeps a random time up to
+# min(BACKOFF_CAP, BACKOFF_BASE * 2**n) seconds.
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 64.0
+
+
+@contextmanager
+def background_priority():
+    """Let interactive Sheets requests go first for calls made inside."""
+    token = _priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    """Tokens refill at ``rate`` per second up to ``capacity``. Not thread-safe."""
+
+    def __init__(self, rate: float, capacity: float):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take a token and return 0, or return the seconds until one is available."""
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self._rate
+
+
+class QuotaLimiter:
+    """Client-side pacing for the Sheets per-minute read and write quotas.
+
+    Each kind of request draws from its own token bucket. Requests that
+    have to wait are queued by priority and then arrival, so interactive
+    calls overtake background flushes. Queue waits are recorded per kind.
+    """
+
+    def __init__(self, read_per_minute: int, write_per_minute: int):
+        self._buckets = {
+            "read": self._bucket(read_per_minute),
+            "write": self._bucket(write_per_minute),
+        }
+        self._cond = threading.Condition()
+        self._queues: dict[str, list[tuple[int, int]]] = {kind: [] for kind in self._buckets}
+        self._seq = itertools.count()
+        self._stats = {
+            kind: {
+                "requests": 0,
+                "queued": 0,
+                "retries": 0,
+                "wait_seconds_total": 0.0,
+                "wait_seconds_max": 0.0,
+            }
+            for kind in self._buckets
+        }
+
+    @staticmethod
+    def _bucket(per_minute: int) -> TokenBucket:
+        # Any 60 seconds may see the full burst plus a minute of refill, so
+        # the two together must stay within the quota.
+        capacity = max(1, per_minute // 10)
+        return TokenBucket(max(per_minute - capacity, 1) / 60, capacity)
+
+    def acquire(self, kind: str, priority: int = INTERACTIVE) -> float:
+        """Block until a ``kind`` request may be sent; returns the seconds waited."""
+        start = time.monotonic()
+        entry = (priority, next(self._seq))
+        queue = self._queues[kind]
+        with self._cond:
+            heapq.heappush(queue, entry)
+            try:
+                while True:
+                    if queue[0] != entry:
+                        self._cond.wait()
+                        continue
+                    delay = self._buckets[kind].take()
+                    if delay == 0:
+                        break
+                    self._cond.wait(delay)
+            finally:
+                if queue[0] == entry:
+                    heapq.heappop(queue)
+                else:
+                    queue.remove(entry)
+                    heapq.heapify(queue)
+                self._cond.notify_all()
+
+            waited = time.monotonic() - start
+            stats = self._stats[kind]
+            stats["requests"] += 1
+            if waited > 0.001:
+                stats["queued"] += 1
+            stats["wait_seconds_total"] += waited
+            stats["wait_seconds_max"] = max(stats["wait_seconds_max"], waited)
+        return waited
+
+    def record_retry(self, kind: str) -> None:
+        with self._cond:
+            self._stats[kind]["retries"] += 1
+
+    def metrics(self) -> dict:
+        with self._cond:
+            return {
+                kind: {
+                    **stats,
+                    "queue_depth": len(self._queues[kind]),
+                    "wait_seconds_avg": (
+                        stats["wait_seconds_total"] / stats["requests"] if stats["requests"] else 0.0
+                    ),
+                }
+                for kind, stats in self._stats.items()
+            }
+
+
+# spreadsheets.batchUpdate requests that change the sheet differently
+# when sent twice: a repeat appends again, or deletes or shifts whatever
+# moved into place after the first one was applied.
+_NON_IDEMPOTENT_REQUESTS = frozenset({
+    "appendCells", "appendDimension", "insertDimension", "deleteDimension",
+    "moveDimension", "insertRange", "deleteRange", "addSheet", "deleteSheet",
+    "duplicateSheet",
+})
+
+# POST endpoints that write the same values however often they are sent.
+_IDEMPOTENT_POSTS = ("values:batchUpdate", "values:batchClear", ":clear", ":batchGet")
+
+
+def _is_idempotent(method: str, endpoint: str, body) -> bool:
+    method = method.upper()
+    if method in ("GET", "PUT"):
+        return True
+    path = endpoint.split("?", 1)[0]
+    if path.endswith(_IDEMPOTENT_POSTS):
+        return True
+    if path.endswith(":batchUpdate"):
+        requests = (body or {}).get("requests", [])
+        return not any(_NON_IDEMPOTENT_REQUESTS.intersection(r) for r in requests)
+    # values:append and anything unknown.
+    return False
+
+
+def _is_retryable(err: APIError, idempotent: bool) -> bool:
+    # A 429 is rejected before anything is applied. A 5xx may come back
+    # after the write went through, so only a repeatable one is resent.
+    return err.code == 429 or (idempotent and err.code >= 500)
+
+
+class QuotaHTTPClient(HTTPClient):
+    """gspread HTTP client that paces requests and retries quota errors.
+
+    Every API call waits for quota first. Responses with status 429 are
+    retried with jittered exponential backoff, up to ``max_retries``
+    times, and so are 5xx responses to reads and idempotent writes.
+    Appends and row deletes are not resent after a 5xx, since the first
+    attempt may already have been applied.
+    """
+
+    def __init__(self, auth, session=None, *, limiter: QuotaLimiter, max_retries: int = 5):
+        super().__init__(auth, session)
+        self.limiter = limiter
+        self.max_retries = max_retries
+
+    def request(self, method: str, endpoint: str, *args, **kwargs):
+        kind = "read" if method.upper() == "GET" else "write"
+        priority = _priority.get()
+        idempotent = _is_idempotent(method, endpoint, kwargs.get("json"))
+        for attempt in itertools.count():
+            self.limiter.acquire(kind, priority)
+            try:
+                return super().request(method, endpoint, *args, **kwargs)
+            except APIError as err:
+                if attempt >= self.max_retries or not _is_retryable(err, idempotent):
+                    raise
+                delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
+                logger.warning(
+                    "Sheets %s request failed with %s; retrying in %.1fs", kind, err.code, delay
+                )
+                self.limiter.record_retry(kind)
+                time.sleep(delay)
@@ -0,0 +1,163 @@
+import bisect
+import heapq
+import math
+import re
+from collections import Counter
+
+# Contact columns that are searched, with how much a match in each counts.
+# Call-log summaries count as much as notes.
+CONTACT_FIELD_WEIGHTS = {
+    "name": 3,
+    "contact_person": 2,
+    "notes": 1,
+    "last_call_summary": 1,
+}
+CALL_LOG_WEIGHT = 1
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str | None) -> list[str]:
+    return _TOKEN_RE.findall(text.casefold()) if text else []
+
+
+class SearchIndex:
+    """Inverted index from word to contacts, with prefix lookup.
+
+    Each contact's document is its searchable columns plus the summaries of
+    its call logs. Postings hold a weighted term frequency per contact and
+    a sorted copy of the vocabulary makes a prefix a bisect away. Callers
+    keep it current with set_contact() and add_call_log().
+    """
+
+    def __init__(self):
+        self._postings: dict[str, dict[str, int]] = {}
+        # Sorted vocabulary, brought up to date by the next search rather
+        # than on every change, so rebuilding the index stays linear.
+        # Terms added since then wait in _new_terms; dropped terms stay in
+        # _terms until a re-sort and are skipped by lookups.
+        self._terms: list[str] = []
+        self._new_terms: set[str] = set()
+        self._dropped = 0
+        self._contact_terms: dict[str, Counter] = {}
+        self._log_terms: dict[str, Counter] = {}
+
+    def clear(self) -> None:
+        self._postings = {}
+        self._terms = []
+        self._new_terms = set()
+        self._dropped = 0
+        self._contact_terms = {}
+        self._log_terms = {}
+
+    def set_contact(self, contact_id: str, record: dict | None) -> None:
+        """Index the current ``record`` for a contact, or drop it if None."""
+        old = self._contact_terms.pop(contact_id, None)
+        if old:
+            self._adjust(contact_id, old, -1)
+        if record is not None:
+            terms = Counter()
+            for field, weight in CONTACT_FIELD_WEIGHTS.items():
+                for term in tokenize(record.get(field)):
+                    terms[term] += weight
+            self._contact_terms[contact_id] = terms
+            self._adjust(contact_id, terms, 1)
+
+    def clear_contacts(self) -> None:
+        for contact_id, terms in self._contact_terms.items():
+            self._adjust(contact_id, terms, -1)
+        self._contact_terms = {}
+
+    def add_call_log(self, record: dict) -> None:
+        contact_id = record.get("contact_id")
+        terms = Counter()
+        for term in tokenize(record.get("summary")):
+            terms[term] += CALL_LOG_WEIGHT
+        if contact_id is None or not terms:
+            return
+        self._log_terms.setdefault(contact_id, Counter()).update(terms)
+        self._adjust(contact_id, terms, 1)
+
+    def clear_call_logs(self) -> None:
+        for contact_id, terms in self._log_terms.items():
+            self._adjust(contact_id, terms, -1)
+        self._log_terms = {}
+
+    def _adjust(self, contact_id: str, terms: Counter, sign: int) -> None:
+        for term, weight in terms.items():
+            docs = self._postings.get(term)
+            if docs is None:
+                docs = self._postings[term] = {}
+                self._new_terms.add(term)
+            weight = docs.get(contact_id, 0) + sign * weight
+            if weight > 0:
+                docs[contact_id] = weight
+                continue
+            docs.pop(contact_id, None)
+            if not docs:
+                del self._postings[term]
+                self._new_terms.discard(term)
+                self._dropped += 1
+
+    def _sort_terms(self) -> None:
+        if len(self._new_terms) + self._dropped > len(self._terms) // 8:
+            self._terms = sorted(self._postings)
+            self._dropped = 0
+        else:
+            # A few writes since the last search: cheaper to slot them in.
+            for term in self._new_terms:
+                pos = bisect.bisect_left(self._terms, term)
+                if pos == len(self._terms) or self._terms[pos] != term:
+                    self._terms.insert(pos, term)
+        self._new_terms = set()
+
+    def _expand(self, prefix: str) -> list[str]:
+        if self._new_terms or self._dropped > len(self._terms) // 2:
+            self._sort_terms()
+        start = bisect.bisect_left(self._terms, prefix)
+        end = bisect.bisect_left(self._terms, prefix + "\U0010ffff", start)
+        return [self._terms[i] for i in range(start, end) if self._terms[i] in self._postings]
+
+    def search(self, query: str, limit: int) -> list[str]:
+        """Ids of the best ``limit`` contacts matching every word of ``query``.
+
+        Each query word matches terms it is a prefix of. A contact scores
+        the weighted frequency times the inverse document frequency of its
+        best term per word, with exact words counting double.
+
+        Every term a word prefixes is scored, however short the word. The
+        word with the fewest postings goes first, and later words only
+        look up the contacts still matching.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        total = len(self._contact_terms) or 1
+        expanded = [(token, self._expand(token)) for token in tokens]
+        expanded.sort(key=lambda item: sum(len(self._postings[term]) for term in item[1]))
+        scores: dict[str, float] | None = None
+        for token, terms in expanded:
+            token_scores: dict[str, float] = {}
+            for term in terms:
+                docs = self._postings[term]
+                idf = math.log(1 + total / len(docs))
+                boost = 2.0 if term == token else 1.0
+                candidates = docs if scores is None or len(docs) <= len(scores) else scores
+                for contact_id in candidates:
+                    weight = docs.get(contact_id)
+                    # Logs can outlive their contact; only live contacts match.
+                    if weight is None or contact_id not in self._contact_terms:
+                        continue
+                    if scores is not None and contact_id not in scores:
+                        continue
+                    score = weight * idf * boost
+                    if score > token_scores.get(contact_id, 0.0):
+                        token_scores[contact_id] = score
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {cid: scores[cid] + s for cid, s in token_scores.items()}
+            if not scores:
+                return []
+        ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [contact_id for contact_id, _ in ranked]
@@ -1,10 +1,42 @@
+import bisect
+import copy
 import json
+import logging
+import threading
+import time
 import uuid
-from datetime import UTC, datetime
+from array import array
+from collections import Counter
+from collections.abc import Callable, Collection, Mapping
+from datetime import UTC, date, datetime, timedelta
+from functools import partial
 
 import gspread
+from gspread.exceptions import WorksheetNotFound
+from gspread.utils import ValueInputOption, rowcol_to_a1
+from requests.adapters import HTTPAdapter
 
 from app.config import settings
+from app.services.analytics import bucket_starts, summarize
+from app.services.call_plan import CallPlan, priority, top
+from app.services.columnar import Table
+from app.services.partitions import (
+    END_OF_TIME,
+    LEGACY_TITLE,
+    MANIFEST_TITLE,
+    Partition,
+    PartitionManifest,
+    archive_partition,
+    archive_title,
+    month_of,
+    month_partition,
+)
+from app.services.quota import QuotaHTTPClient, QuotaLimiter, background_priority
+from app.services.search import SearchIndex
+from app.services.singleflight import Singleflight
+from app.services.write_behind import Journal, WriteBatch
+
+logger = logging.getLogger(__name__)
 
 # Must match the actual Google Sheet column order exactly.
 CONTACT_HEADERS = [
@@ -18,18 +50,392 @@ CALL_LOG_HEADERS = [
     "disposition", "summary", "recording_url", "deal_stage", "deal_stage_after",
 ]
 
+# Contact columns with a value -> ids index, for filters and counts.
+INDEXED_FIELDS = ("deal_stage", "city", "industry")
 
-def get_sheets_service() -> "SheetsService":
+# Date ranges whose call series are kept; the cache starts over when full.
+SERIES_CACHE_SIZE = 64
+
+# Partitioned, logs older than this are cold. The call plan reads last-call
+# dispositions from newer partitions only, and a cold partition, once
+# loaded, is not downloaded again when the TTL runs out: only backdated
+# appends through this service still change it.
+RECENT_LOG_DAYS = 92
+
+
+def _contact_table() -> Table:
+    return Table(
+        CONTACT_HEADERS,
+        int_columns=("call_count",),
+        enum_columns=("city", "industry", "source", "deal_stage"),
+    )
+
+
+def _call_log_table() -> Table:
+    # contact_id and contact_name repeat for every call to the same lead.
+    return Table(
+        CALL_LOG_HEADERS,
+        int_columns=("duration_seconds",),
+        enum_columns=("contact_id", "contact_name", "disposition", "deal_stage", "deal_stage_after"),
+    )
+
+
+_service: "SheetsService | None" = None
+_service_lock = threading.Lock()
+
+
+def _create_service() -> "SheetsService":
+    if settings.storage_backend == "sqlite":
+        # Imported here because the SQLite store mirrors into SheetsService.
+        from app.services.sqlite_store import SQLiteService
+
+        return SQLiteService()
     return SheetsService()
 
 
+def init_sheets_service() -> "SheetsService":
+    """Create the process-wide data service if it does not exist yet.
+
+    This is a SheetsService, or a SQLiteService with the same interface
+    when ``storage_backend`` is ``"sqlite"``.
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = _create_service()
+        return _service
+
+
+def close_sheets_service() -> None:
+    global _service
+    with _service_lock:
+        if _service is not None:
+            _service.close()
+            _service = None
+
+
+def get_sheets_service() -> "SheetsService":
+    # Normally created once in the app lifespan; fall back to lazy creation
+    # so scripts and workers that skip the lifespan still share one instance.
+    return _service or init_sheets_service()
+
+
 class SheetsService:
     def __init__(self):
         creds = json.loads(settings.google_service_account_json)
-        client = gspread.service_account_from_dict(creds)
-        spreadsheet = client.open_by_key(settings.spreadsheet_id)
-        self._contacts_ws = spreadsheet.worksheet("Contacts")
-        self._call_logs_ws = spreadsheet.worksheet("CallLogs")
+        self._limiter = QuotaLimiter(
+            settings.sheets_read_quota_per_minute, settings.sheets_write_quota_per_minute
+        )
+        self._client = gspread.service_account_from_dict(
+            creds,
+            http_client=partial(
+                QuotaHTTPClient, limiter=self._limiter, max_retries=settings.sheets_max_retries
+            ),
+        )
+        # gspread talks to Google through an AuthorizedSession, which refreshes
+        # the service-account token on its own. Widen its connection pool so
+        # concurrent requests reuse keep-alive connections instead of
+        # reconnecting.
+        adapter = HTTPAdapter(
+            pool_connections=settings.sheets_pool_size,
+            pool_maxsize=settings.sheets_pool_size,
+        )
+        self._client.http_client.session.mount("https://", adapter)
+        self._spreadsheet = self._client.open_by_key(settings.spreadsheet_id)
+        self._contacts_ws = self._spreadsheet.worksheet("Contacts")
+
+        # Call logs live in one worksheet per partition, as listed by the
+        # manifest. Unpartitioned, the CallLogs worksheet is the only
+        # partition. _partition_lock serializes call-log appends with
+        # partition creation and archival, so no append can land in a
+        # worksheet that is being merged away.
+        self._partitioned = settings.sheets_partition_call_logs
+        self._partition_lock = threading.Lock()
+        self._log_sheets: dict[str, gspread.Worksheet] = {}
+        if self._partitioned:
+            self._archive_after_months = settings.sheets_archive_after_months
+            self._manifest = self._load_manifest()
+        else:
+            self._manifest = PartitionManifest.unpartitioned()
+            self._log_sheets[LEGACY_TITLE] = self._spreadsheet.worksheet(LEGACY_TITLE)
+
+        # Normalized contacts in sheet order. Reads are served from here until
+        # the TTL expires; writes through this service keep it up to date so
+        # the TTL only bounds staleness from edits made directly in the sheet.
+        # Cached rows are held in columnar Tables and only turned back into
+        # dicts when handed to callers.
+        self._lock = threading.RLock()
+        self._cache_ttl = settings.sheets_cache_ttl_seconds
+        self._contacts = _contact_table()
+        self._contacts_loaded_at: float | None = None
+        # Contact id -> 1-indexed sheet row. Kept in step with _contacts so
+        # lookups and writes never need to scan or re-download the sheet.
+        self._contact_rows: dict[str, int] = {}
+        # Serializes row-addressed writes so a delete cannot shift rows out
+        # from under a concurrent update.
+        self._write_lock = threading.Lock()
+
+        # Call logs are append-only, so they are cached the same way and
+        # indexed for range queries: _log_keys holds timestamps in sorted
+        # order and _log_order the matching offsets into _call_logs.
+        # Partitions are downloaded as queries need them. _call_logs holds
+        # the rows of every loaded partition, with each row's partition in
+        # _log_partition (codes from _partition_codes).
+        self._call_logs = _call_log_table()
+        self._log_partition = array("H")
+        self._partition_codes: dict[str, int] = {}
+        self._partitions_loaded_at: dict[str, float] = {}
+        self._log_keys: list[str] = []
+        self._log_order = array("q")
+        self._logs_by_contact: dict[str, array] = {}
+        # Each contact's latest loaded call as (timestamp, disposition), for
+        # scoring the call plan without scanning its logs.
+        self._last_calls: dict[str, tuple[str, str | None]] = {}
+        # Calls and connected calls per day (the timestamp's date part), so
+        # the dashboard never has to count log rows.
+        self._calls_per_day: Counter[str] = Counter()
+        self._connected_per_day: Counter[str] = Counter()
+        # Range analytics keyed by (start, end, interval), valid while
+        # _call_logs_version stays at _series_version.
+        self._series_cache: dict[tuple, list[dict]] = {}
+        self._series_version = -1
+
+        # Full-sheet downloads run outside _lock and are shared by every
+        # caller that needs the same sheet while one is in flight. The
+        # versions count cache writes, so a download that raced a write
+        # can be told apart and discarded.
+        self._flights = Singleflight()
+        self._contacts_version = 0
+        self._call_logs_version = 0
+
+        # With write-behind enabled, mutations are journaled and acknowledged
+        # straight away, then flushed to Sheets in coalesced batches by a
+        # background thread. _pending collects new operations while
+        # _inflight holds the batch currently being written; reads overlay
+        # both on top of the cached sheet. _journal_lock serializes
+        # write-behind mutations from their read to their enqueue, and is
+        # taken before _lock so the journal's fsync never blocks readers.
+        self._pending: WriteBatch | None = None
+        self._inflight = WriteBatch()
+        self._journal_lock = threading.Lock()
+
+        # Change feed for delta sync. Every mutation made through this
+        # service, and every edit found in the sheet on reload, gets the
+        # next revision. _changes holds (revision, "contact", id) and
+        # (revision, "call_log", record) entries in revision order; cursors
+        # older than _changes_floor have been trimmed away. The epoch makes
+        # cursors from another process (or a dropped cache) invalid.
+        self._epoch = uuid.uuid4().hex[:12]
+        self._revision = 0
+        self._changes: list[tuple[int, str, object]] = []
+        self._changes_floor = 0
+        self._changelog_size = settings.sync_changelog_size
+
+        # Secondary indexes over the contacts readers see (cached rows plus
+        # unflushed writes): column -> value -> ids, and each indexed id's
+        # current values so an update can be moved between sets.
+        self._field_index: dict[str, dict[str | None, set[str]]] = {
+            field: {} for field in INDEXED_FIELDS
+        }
+        self._indexed_values: dict[str, tuple] = {}
+        # Full-text index over contact text and call-log summaries.
+        self._search = SearchIndex()
+        # Today's call plan, rebuilt with the indexes and at day rollover.
+        self._call_plan = CallPlan()
+        if settings.sheets_write_behind:
+            self._journal = Journal(settings.sheets_journal_path)
+            self._pending = WriteBatch()
+            for op in self._journal.read():
+                self._pending.add(op)
+            self._flush_interval = settings.sheets_flush_interval_seconds
+            self._stop_flushing = threading.Event()
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="sheets-flush", daemon=True
+            )
+            self._flusher.start()
+        if self._partitioned:
+            self._archive_interval = settings.sheets_archive_interval_seconds
+            self._stop_archiving = threading.Event()
+            self._archiver = threading.Thread(
+                target=self._archive_loop, name="sheets-archive", daemon=True
+            )
+            self._archiver.start()
+
+    def close(self) -> None:
+        if self._partitioned:
+            self._stop_archiving.set()
+            self._archiver.join()
+        if self._pending is not None:
+            self._stop_flushing.set()
+            self._flusher.join()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Final write-behind flush failed; kept in journal")
+            self._journal.close()
+        self._client.http_client.session.close()
+
+    def quota_metrics(self) -> dict:
+        """Request counts, retries and quota queue waits per request kind."""
+        return self._limiter.metrics()
+
+    def invalidate_cache(self) -> None:
+        with self._lock:
+            # Without the old rows there is nothing to diff a reload against,
+            # so clients have to resync from scratch.
+            self._epoch = uuid.uuid4().hex[:12]
+            self._changes = []
+            self._changes_floor = self._revision
+            self._contacts_version += 1
+            self._call_logs_version += 1
+            self._contacts = _contact_table()
+            self._contacts_loaded_at = None
+            self._contact_rows = {}
+            self._call_logs = _call_log_table()
+            self._log_partition = array("H")
+            self._partitions_loaded_at = {}
+            self._field_index = {field: {} for field in INDEXED_FIELDS}
+            self._indexed_values = {}
+            self._search.clear()
+            self._call_plan = CallPlan()
+            self._log_keys = []
+            self._log_order = array("q")
+            self._logs_by_contact = {}
+            self._last_calls = {}
+            self._calls_per_day = Counter()
+            self._connected_per_day = Counter()
+
+    def _is_fresh(self, loaded_at: float | None) -> bool:
+        return loaded_at is not None and time.monotonic() - loaded_at < self._cache_ttl
+
+    def _batches(self) -> tuple[WriteBatch, ...]:
+        if self._pending is None:
+            return ()
+        return (self._inflight, self._pending)
+
+    def _fetch_contacts(self) -> tuple[int, float, Table]:
+        with self._lock:
+            version = self._contacts_version
+        rows = self._contacts_ws.get_all_values()
+        contacts = _contact_table()
+        for row in rows[1:]:
+            contacts.append(self._normalize_contact(dict(zip(CONTACT_HEADERS, row))))
+        return version, time.monotonic(), contacts
+
+    def _prefetch_contacts(self) -> float | None:
+        """Refresh stale contacts without holding _lock during the download.
+
+        Public readers call this before taking the lock and pass the result
+        to _load_contacts; concurrent callers share one get_all_values.
+        """
+        loaded_at = self._contacts_loaded_at
+        if self._is_fresh(loaded_at):
+            return loaded_at
+        version, fetched_at, contacts = self._flights.do("contacts", self._fetch_contacts)
+        with self._lock:
+            # If a write updated the cache during the download, the rows may
+            # predate it; _load_contacts then re-reads under the lock.
+            if self._contacts_loaded_at == loaded_at and version == self._contacts_version:
+                self._apply_contacts(contacts, fetched_at)
+            return self._contacts_loaded_at
+
+    def _load_contacts(self, accept: float | None = None) -> Table:
+        """Cached contacts, reloaded under the lock if stale.
+
+        ``accept`` is a load the caller has just prefetched, used even if
+        the TTL has run out since.
+        """
+        with self._lock:
+            loaded_at = self._contacts_loaded_at
+            if not (self._is_fresh(loaded_at) or (accept is not None and loaded_at == accept)):
+                _, fetched_at, contacts = self._fetch_contacts()
+                self._apply_contacts(contacts, fetched_at)
+            return self._contacts
+
+    def _apply_contacts(self, contacts: Table, fetched_at: float) -> None:
+        previous = (
+            {c["id"]: c for c in self._contacts}
+            if self._contacts_loaded_at is not None else None
+        )
+        self._contacts = contacts
+        self._contacts_loaded_at = fetched_at
+        self._contacts_version += 1
+        self._reindex_contacts()
+        self._overlay_pending_contacts()
+        if previous is not None:
+            self._record_sheet_edits(previous)
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self) -> None:
+        self._field_index = {field: {} for field in INDEXED_FIELDS}
+        self._indexed_values = {}
+        self._search.clear_contacts()
+        self._call_plan.reset(date.today().isoformat())
+        for record in self._iter_contacts():
+            if record["id"] is not None:
+                self._index_contact(record["id"], record)
+
+    def _index_contact(self, contact_id: str, record: dict | None) -> None:
+        old = self._indexed_values.pop(contact_id, None)
+        if old is not None:
+            for field, value in zip(INDEXED_FIELDS, old):
+                ids = self._field_index[field][value]
+                ids.discard(contact_id)
+                if not ids:
+                    del self._field_index[field][value]
+        self._search.set_contact(contact_id, record)
+        self._call_plan.update(contact_id, record)
+        if record is not None:
+            values = tuple(record[field] for field in INDEXED_FIELDS)
+            self._indexed_values[contact_id] = values
+            for field, value in zip(INDEXED_FIELDS, values):
+                self._field_index[field].setdefault(value, set()).add(contact_id)
+
+    def _contacts_changed(self, contact_ids) -> None:
+        """Publish changes to the given contacts to the indexes and change feed."""
+        with self._lock:
+            contact_ids = list(contact_ids)
+            # Unloaded indexes are built from scratch on the next read.
+            if self._contacts_loaded_at is not None:
+                for contact_id in contact_ids:
+                    self._index_contact(contact_id, self._get_contact(contact_id))
+            self._record_changes("contact", contact_ids)
+
+    def _record_sheet_edits(self, previous: dict[str | None, dict]) -> None:
+        # Rows edited, added or removed directly in the sheet show up in the
+        # change feed like any other mutation.
+        current = {c["id"]: c for c in self._contacts}
+        changed = [
+            contact_id for contact_id, record in current.items()
+            if previous.get(contact_id) != record
+        ]
+        changed.extend(contact_id for contact_id in previous if contact_id not in current)
+        self._record_changes("contact", [cid for cid in changed if cid is not None])
+
+    def _overlay_pending_contacts(self) -> None:
+        # The reloaded sheet does not have unflushed updates yet. A create
+        # that already reached the sheet (e.g. replayed from the journal
+        # after a crash) is downgraded to an update of the row it wrote.
+        for batch in self._batches():
+            for contact_id in [cid for cid in batch.creates if cid in self._contact_rows]:
+                record = batch.creates.pop(contact_id)
+                changes = {k: v for k, v in record.items() if k != "id"}
+                batch.updates.setdefault(contact_id, {}).update(changes)
+            for contact_id, changes in batch.updates.items():
+                row_num = self._contact_rows.get(contact_id)
+                if row_num is not None:
+                    self._contacts[row_num - 2] = self._merge_contact(
+                        self._contacts[row_num - 2], changes
+                    )
+
+    def _reindex_contacts(self) -> None:
+        # Walk backwards so the first row wins when an id is duplicated,
+        # matching what a top-down scan of the sheet would find.
+        self._contact_rows = {
+            contact_id: i + 2  # +1 for the header, +1 because rows are 1-indexed
+            for i, contact_id in reversed(list(enumerate(self._contacts.column("id"))))
+            if contact_id is not None
+        }
 
     @staticmethod
     def _normalize_contact(record: dict) -> dict:
@@ -46,6 +452,18 @@ class SheetsService:
                 result[key] = val
         return result
 
+    @staticmethod
+    def _contact_to_row(record: dict) -> list:
+        return ["" if record.get(key) is None else record[key] for key in CONTACT_HEADERS]
+
+    @classmethod
+    def _merge_contact(cls, record: dict, changes: dict) -> dict:
+        row = cls._contact_to_row(record)
+        for key, value in changes.items():
+            if key in CONTACT_HEADERS and value is not None:
+                row[CONTACT_HEADERS.index(key)] = value
+        return cls._normalize_contact(dict(zip(CONTACT_HEADERS, row)))
+
     @staticmethod
     def _normalize_call_log(record: dict) -> dict:
         result = {}
@@ -59,34 +477,178 @@ class SheetsService:
                 result[key] = val
         return result
 
+    @staticmethod
+    def _call_log_to_row(record: dict) -> list:
+        return ["" if record.get(key) is None else record[key] for key in CALL_LOG_HEADERS]
+
+    def _get_contact(self, contact_id: str) -> Mapping | None:
+        """Current record for ``contact_id``, including unflushed writes."""
+        batches = self._batches()
+        if any(contact_id in batch.deletes for batch in batches):
+            return None
+        row_num = self._contact_rows.get(contact_id)
+        if row_num is not None:
+            return self._contacts[row_num - 2]
+        record = None
+        for batch in batches:
+            if contact_id in batch.creates:
+                record = self._normalize_contact(batch.creates[contact_id])
+        # Updates made while the create was in flight wait in _pending.
+        if record is not None and contact_id in self._pending.updates:
+            record = self._merge_contact(record, self._pending.updates[contact_id])
+        return record
+
+    def _iter_contacts(self):
+        batches = self._batches()
+        hidden = set().union(*(batch.deletes for batch in batches))
+        for c in self._contacts:
+            if c["id"] not in hidden:
+                yield c
+        for batch in batches:
+            for contact_id in batch.creates:
+                if contact_id not in self._contact_rows and contact_id not in hidden:
+                    yield self._get_contact(contact_id)
+
     def get_all_contacts(self) -> list[dict]:
-        rows = self._contacts_ws.get_all_values()
-        if len(rows) <= 1:
-            return []
-        return [
-            self._normalize_contact(dict(zip(CONTACT_HEADERS, row)))
-            for row in rows[1:]
-        ]
+        contacts_at = self._prefetch_contacts()
+        with self._lock:
+            self._load_contacts(contacts_at)
+            return [c.copy() for c in self._iter_contacts()]
 
     def get_contact_by_id(self, contact_id: str) -> dict | None:
-        for c in self.get_all_contacts():
-            if c["id"] == contact_id:
-                return c
-        return None
+        contacts_at = self._prefetch_contacts()
+        with self._lock:
+            self._load_contacts(contacts_at)
+            record = self._get_contact(contact_id)
+            return record.copy() if record is not None else None
+
+    def find_contacts(self, exclude: dict[str, Collection] | None = None, **match) -> list[dict]:
+        """Contacts matching indexed column filters, in sheet order.
+
+        Each keyword names a column in INDEXED_FIELDS and gives a value or
+        a collection of accepted values. ``exclude`` maps columns to values
+        to leave out. Filters are answered from the indexes, smallest
+        candidate set first, so the cost follows the size of the result.
+        """
+        contacts_at = self._prefetch_contacts()
+        with self._lock:
+            self._load_contacts(contacts_at)
+            index = self._field_index
+            allowed = {}
+            for field in {*match, *(exclude or {})}:
+                values = _as_values(match[field]) if field in match else set(index[field])
+                if exclude and field in exclude:
+                    values -= _as_values(exclude[field])
+                allowed[field] = values
+
+            if not allowed:
+                ids = set(self._indexed_values)
+            else:
+                # Materialize only the smallest candidate set and check the
+                # other filters against each survivor's indexed values.
+                first, *rest = sorted(allowed, key=lambda field: sum(
+                    len(index[field].get(v, ())) for v in allowed[field]
+                ))
+                ids = set().union(*(index[first].get(v, ()) for v in allowed[first]))
+                checks = [(INDEXED_FIELDS.index(field), allowed[field]) for field in rest]
+                ids = {
+                    contact_id for contact_id in ids
+                    if all(self._indexed_values[contact_id][pos] in values for pos, values in checks)
+                }
+            return [self._get_contact(contact_id).copy() for contact_id in self._sheet_order(ids)]
+
+    def count_contacts_by(self, field: str) -> dict[str, int]:
+        """Number of contacts per non-empty value of an indexed column."""
+        contacts_at = self._prefetch_contacts()
+        with self._lock:
+            self._load_contacts(contacts_at)
+            return {
+                value: len(ids)
+                for value, ids in self._field_index[field].items()
+                if value is not None
+            }
+
+    def search_contacts(self, query: str, limit: int = 20) -> list[dict]:
+        """Best-matching contacts for a free-text query, most relevant first.
+
+        Every word in ``query`` must prefix-match a word in the contact's
+        name, contact person, notes, last call summary or call-log summaries.
+        """
+        contacts_at = self._prefetch_contacts()
+        logs_at = self._prefetch_call_logs()
+        with self._lock:
+            self._load_contacts(contacts_at)
+            self._load_call_logs(logs_at)
+            return [
+                self._get_contact(contact_id).copy()
+                for contact_id in self._search.search(query, limit)
+            ]
+
+    def get_call_plan(
+        self, limit: int | None = None, offset: int = 0
+    ) -> tuple[int, list[tuple[str, int, dict]]]:
+        """Today's call plan, highest priority first.
+
+        Returns the number of contacts in the plan and the requested page of
+        (reason, priority, contact) entries. Ties keep sheet order. Only the
+        best ``offset + limit`` entries are ranked.
+        """
+        # Dispositions only count from recent calls, so only their
+        # partitions are needed.
+        recent = self._recent_day()
+        contacts_at = self._prefetch_contacts()
+        logs_at = self._prefetch_call_logs(recent)
+        with self._lock:
+            self._load_contacts(contacts_at)
+            self._load_call_logs(logs_at, recent)
+            today = date.today()
+            if self._call_plan.day != today.isoformat():
+                # Follow-ups dated today only become due at rollover.
+                self._call_plan.reset(today.isoformat())
+                for record in self._iter_contacts():
+                    if record["id"] is not None:
+                        self._call_plan.update(record["id"], record)
+
+            def scored():
+                # Unflushed creates have no row yet and rank after the sheet.
+                unwritten = len(self._contact_rows) + 2
+                for contact_id, reason in self._call_plan.items():
+                    contact = self._get_contact(contact_id)
+                    _, last = self._last_calls.get(contact_id, (None, None))
+                    score = priority(contact, reason, today, last)
+                    position = (self._contact_rows.get(contact_id, unwritten), contact_id)
+                    yield score, position, (reason, score, contact_id)
+
+            end = offset + limit if limit is not None else None
+            ranked = top(scored(), end)[offset:end]
+            return len(self._call_plan), [
+                (reason, score, self._get_contact(contact_id).copy())
+                for reason, score, contact_id in ranked
+            ]
+
+    def _sheet_order(self, contact_ids: set[str]) -> list[str]:
+        rows = self._contact_rows
+        ordered = [contact_id for _, contact_id in sorted(
+            (rows[contact_id], contact_id) for contact_id in contact_ids if contact_id in rows
+        )]
+        if len(ordered) < len(contact_ids):
+            # Unflushed creates have no row yet; they follow in creation order.
+            for batch in self._batches():
+                ordered.extend(
+                    contact_id for contact_id in batch.creates
+                    if contact_id in contact_ids and contact_id not in rows
+                )
+        return ordered
 
     def _find_contact_row(self, contact_id: str) -> int | None:
-        values = self._contacts_ws.get_all_values()
-        for i, row in enumerate(values):
-            if i == 0:
-                continue
-            if row[0] == contact_id:
-                return i + 1  # gspread rows are 1-indexed
-        return None
+        with self._lock:
+            self._load_contacts()
+            return self._contact_rows.get(contact_id)
 
-    def create_contact(self, data: dict) -> dict:
-        contact_id = str(uuid.uuid4())
-        row = [
-            contact_id,
+    @staticmethod
+    def _new_contact_row(data: dict) -> list:
+        return [
+            data.get("id") or str(uuid.uuid4()),
             data["name"],
             data.get("contact_person", ""),
             data["phone"],
@@ -101,36 +663,811 @@ class SheetsService:
             "",   # recording_link
             data.get("notes", ""),
         ]
-        self._contacts_ws.append_row(row)
-        return self._normalize_contact(dict(zip(CONTACT_HEADERS, row)))
+
+    def _cache_new_contacts(self, records: list[dict]) -> None:
+        with self._lock:
+            if self._contacts_loaded_at is None:
+                return
+            self._contacts_version += 1
+            # Updates made while the creates were being flushed wait in
+            # _pending; once cached, the row is what readers see.
+            pending = self._pending.updates if self._pending is not None else {}
+            merged = []
+            for record in records:
+                # Already there if the cache was reloaded after the append.
+                if record["id"] in self._contact_rows:
+                    continue
+                if record["id"] in pending:
+                    record = self._merge_contact(record, pending[record["id"]])
+                    merged.append(record["id"])
+                self._contacts.append(record)
+                self._contact_rows[record["id"]] = len(self._contacts) + 1
+            if merged:
+                self._contacts_changed(merged)
+
+    def _journal_ops(self, ops: list[dict]) -> None:
+        # Journal first: once this returns the write survives a restart.
+        # Call with _journal_lock held but not _lock, then _queue the same
+        # ops before releasing _journal_lock.
+        self._journal.append(ops)
+
+    def _queue(self, ops: list[dict]) -> None:
+        # Call with _lock held, in the same section that updates the
+        # caches, so a reload in between cannot overlay the ops twice.
+        for op in ops:
+            self._pending.add(op)
+
+    def create_contact(self, data: dict) -> dict:
+        if self._pending is not None:
+            return self.create_contacts([data])[0]
+        row = self._new_contact_row(data)
+        record = self._normalize_contact(dict(zip(CONTACT_HEADERS, row)))
+        with self._write_lock:
+            self._contacts_ws.append_row(row)
+            self._cache_new_contacts([record])
+        self._contacts_changed([record["id"]])
+        return dict(record)
+
+    def create_contacts(self, items: list[dict]) -> list[dict]:
+        """Create many contacts with a single append_rows call."""
+        if not items:
+            return []
+        rows = [self._new_contact_row(data) for data in items]
+        records = [self._normalize_contact(dict(zip(CONTACT_HEADERS, row))) for row in rows]
+        if self._pending is not None:
+            ops = [{"op": "create", "record": r} for r in records]
+            with self._journal_lock:
+                self._journal_ops(ops)
+                with self._lock:
+                    self._queue(ops)
+        else:
+            with self._write_lock:
+                self._contacts_ws.append_rows(rows)
+                self._cache_new_contacts(records)
+        self._contacts_changed([r["id"] for r in records])
+        return [dict(r) for r in records]
 
     def update_contact(self, contact_id: str, data: dict) -> dict:
-        row_num = self._find_contact_row(contact_id)
-        if row_num is None:
+        updated = self.update_contacts({contact_id: data})
+        if contact_id not in updated:
             raise ValueError(f"Contact {contact_id} not found")
+        return updated[contact_id]
 
-        for key, value in data.items():
-            if key in CONTACT_HEADERS and value is not None:
-                col = CONTACT_HEADERS.index(key) + 1
-                self._contacts_ws.update_cell(row_num, col, value)
+    def update_contacts(self, updates: dict[str, dict]) -> dict[str, dict]:
+        """Apply per-contact field updates with a single batch_update.
 
-        row = self._contacts_ws.row_values(row_num)
-        return self._normalize_contact(dict(zip(CONTACT_HEADERS, row)))
+        Returns the updated records keyed by id; ids that are not found are
+        left out.
+        """
+        if self._pending is None:
+            with self._write_lock:
+                result = self._write_contact_updates(updates)
+            self._contacts_changed(result)
+            return result
+
+        with self._journal_lock:
+            with self._lock:
+                self._load_contacts()
+                changed = {
+                    contact_id: self._contact_changes(data)
+                    for contact_id, data in updates.items()
+                    if self._get_contact(contact_id) is not None
+                }
+            ops = [{"op": "update", "id": cid, "changes": c} for cid, c in changed.items()]
+            self._journal_ops(ops)
+            with self._lock:
+                self._queue(ops)
+                result = self._cache_queued_updates(changed)
+            self._contacts_changed(result)
+        return result
+
+    @staticmethod
+    def _contact_changes(data: dict) -> dict:
+        return {
+            k: v for k, v in data.items()
+            if k in CONTACT_HEADERS and k != "id" and v is not None
+        }
+
+    def _cache_queued_updates(self, changed: dict[str, dict]) -> dict[str, dict]:
+        # Changes are merged into the rows as they are now, which a flush
+        # may have reloaded since the changes were worked out. Returns
+        # copies of the updated records.
+        self._contacts_version += 1
+        result = {}
+        for contact_id, changes in changed.items():
+            row_num = self._contact_rows.get(contact_id)
+            if row_num is not None:
+                self._contacts[row_num - 2] = self._merge_contact(
+                    self._contacts[row_num - 2], changes
+                )
+            record = self._get_contact(contact_id)
+            if record is not None:
+                result[contact_id] = dict(record)
+        return result
+
+    def _locate_contacts(self, contact_ids) -> dict[str, tuple[int, dict]]:
+        """Sheet row and cached record of each contact that exists.
+
+        Cached row numbers can be a TTL old, and rows deleted or sorted in
+        the sheet since then would send a write to another lead. So the id
+        cells of the rows are read back in one request, and contacts are
+        downloaded again if any of them no longer match. Call with
+        _write_lock held.
+        """
+        contacts_at = self._prefetch_contacts()
+        with self._lock:
+            self._load_contacts(contacts_at)
+            rows = {
+                contact_id: self._contact_rows[contact_id]
+                for contact_id in contact_ids if contact_id in self._contact_rows
+            }
+        if rows:
+            cells = self._contacts_ws.batch_get([f"A{row_num}" for row_num in rows.values()])
+            if [_first_cell(values) for values in cells] != list(rows):
+                _, fetched_at, contacts = self._fetch_contacts()
+                with self._lock:
+                    self._apply_contacts(contacts, fetched_at)
+        with self._lock:
+            located = {}
+            for contact_id in contact_ids:
+                row_num = self._contact_rows.get(contact_id)
+                if row_num is not None:
+                    located[contact_id] = (row_num, self._contacts[row_num - 2].copy())
+            return located
+
+    def _write_contact_updates(self, updates: dict[str, dict]) -> dict[str, dict]:
+        located = [
+            (contact_id, row_num, self._contact_to_row(record), updates[contact_id])
+            for contact_id, (row_num, record) in self._locate_contacts(updates).items()
+        ]
+
+        # Every changed cell goes out in one request instead of an
+        # update_cell per field plus a row_values read-back; returned
+        # records are rebuilt from the cached rows.
+        changes = []
+        for _, row_num, row, data in located:
+            for key, value in data.items():
+                if key in CONTACT_HEADERS and value is not None:
+                    col = CONTACT_HEADERS.index(key)
+                    row[col] = value
+                    changes.append({
+                        "range": rowcol_to_a1(row_num, col + 1),
+                        "values": [[value]],
+                    })
+        if changes:
+            self._contacts_ws.batch_update(
+                changes, value_input_option=ValueInputOption.user_entered
+            )
+
+        result = {}
+        with self._lock:
+            self._contacts_version += 1
+            for contact_id, row_num, row, _ in located:
+                record = self._normalize_contact(dict(zip(CONTACT_HEADERS, row)))
+                if self._contact_rows.get(contact_id) == row_num:
+                    self._contacts[row_num - 2] = record
+                result[contact_id] = dict(record)
+        return result
 
     def delete_contact(self, contact_id: str) -> None:
+        if self._pending is None:
+            with self._write_lock:
+                self._write_delete(contact_id)
+            self._contacts_changed([contact_id])
+            return
+
+        ops = [{"op": "delete", "id": contact_id}]
+        with self._journal_lock:
+            with self._lock:
+                self._load_contacts()
+                if self._get_contact(contact_id) is None:
+                    raise ValueError(f"Contact {contact_id} not found")
+            self._journal_ops(ops)
+            with self._lock:
+                self._queue(ops)
+            self._contacts_changed([contact_id])
+
+    def _write_delete(self, contact_id: str) -> None:
         row_num = self._find_contact_row(contact_id)
+        # Deleting by a stale row number would remove someone else's
+        # lead, so confirm the id cell before trusting the index.
+        if row_num is not None and self._contacts_ws.cell(row_num, 1).value != contact_id:
+            self.invalidate_cache()
+            row_num = self._find_contact_row(contact_id)
         if row_num is None:
             raise ValueError(f"Contact {contact_id} not found")
         self._contacts_ws.delete_rows(row_num)
+        with self._lock:
+            self._contacts_version += 1
+            if self._contact_rows.get(contact_id) == row_num:
+                del self._contacts[row_num - 2]
+                self._reindex_contacts()
 
-    def append_call_log(self, data: dict) -> dict:
-        log_id = str(uuid.uuid4())
-        now = datetime.now(UTC).isoformat()
-        row = [
-            log_id,
+    def flush(self) -> None:
+        """Write pending write-behind operations to Sheets.
+
+        Whatever fails stays queued (and journaled) for the next attempt.
+        Does nothing when write-behind is disabled.
+        """
+        if self._pending is None:
+            return
+        with self._write_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, WriteBatch()
+                self._inflight = batch
+            try:
+                self._write_batch(batch)
+            finally:
+                # Holding _journal_lock keeps new ops out of the journal
+                # until it is rewritten with everything still queued.
+                with self._journal_lock:
+                    with self._lock:
+                        batch.extend(self._pending)
+                        self._pending = batch
+                        self._inflight = WriteBatch()
+                        ops = batch.ops()
+                    self._journal.rewrite(ops)
+
+    def _write_batch(self, batch: WriteBatch) -> None:
+        # Each step drops what it wrote from the batch, so a failure part
+        # way through never writes the same rows twice.
+        with self._lock:
+            self._load_contacts()
+            # Loading overlays the batch, dropping logs already in the sheet.
+            if batch.logs:
+                days = [(record["timestamp"] or "")[:10] for record in batch.logs]
+                self._load_call_logs(None, min(days), max(days))
+            creates = [self._normalize_contact(r) for r in batch.creates.values()]
+        if creates:
+            self._contacts_ws.append_rows([self._contact_to_row(r) for r in creates])
+            with self._lock:
+                self._cache_new_contacts(creates)
+                for record in creates:
+                    batch.creates.pop(record["id"], None)
+
+        with self._lock:
+            updates = dict(batch.updates)
+        if updates:
+            self._write_contact_updates(updates)
+            with self._lock:
+                for contact_id in updates:
+                    batch.updates.pop(contact_id, None)
+
+        for contact_id in list(batch.deletes):
+            try:
+                self._write_delete(contact_id)
+            except ValueError:
+                pass  # Already gone from the sheet.
+            with self._lock:
+                batch.deletes.pop(contact_id, None)
+
+        with self._lock:
+            logs = list(batch.logs)
+        if logs:
+            with self._partition_lock:
+                titles = [self._partition_for(record) for record in logs]
+                for title, group in _group_by(logs, titles).items():
+                    self._log_sheet(title).append_rows([self._call_log_to_row(r) for r in group])
+                    written = {r["id"] for r in group}
+                    with self._lock:
+                        batch.logs = [r for r in batch.logs if r["id"] not in written]
+
+    def _flush_loop(self) -> None:
+        delay = self._flush_interval
+        while not self._stop_flushing.wait(delay):
+            try:
+                with background_priority():
+                    self.flush()
+                delay = self._flush_interval
+            except Exception:
+                logger.exception("Write-behind flush to Google Sheets failed")
+                # Back off so quota errors are not hammered every interval.
+                delay = min(delay * 2, 300.0)
+
+    def _record_changes(self, kind: str, keys) -> None:
+        with self._lock:
+            for key in keys:
+                self._revision += 1
+                self._changes.append((self._revision, kind, key))
+            excess = len(self._changes) - self._changelog_size
+            # Trim in bulk once the log is twice its size so appends stay
+            # amortized O(1).
+            if excess > self._changelog_size:
+                self._changes_floor = self._changes[excess - 1][0]
+                del self._changes[:excess]
+
+    def _parse_cursor(self, cursor: str | None) -> int | None:
+        epoch, _, revision = (cursor or "").partition(".")
+        if epoch != self._epoch or not revision.isdigit():
+            return None
+        revision = int(revision)
+        if revision < self._changes_floor or revision > self._revision:
+            return None
+        return revision
+
+    def get_changes(self, cursor: str | None) -> dict:
+        """Contacts and call logs changed since ``cursor``.
+
+        Returns the changed contacts, the ids of deleted contacts, new call
+        logs and a cursor for the next call. A missing, foreign or expired
+        cursor gets a full snapshot with ``reset`` set instead.
+        """
+        # Deltas come from the change feed, which only needs recent
+        # partitions checked for edits; a full snapshot needs them all.
+        first_day = self._recent_day() if self._parse_cursor(cursor) is not None else ""
+        contacts_at = self._prefetch_contacts()
+        logs_at = self._prefetch_call_logs(first_day)
+        with self._lock:
+            self._load_contacts(contacts_at)
+            self._load_call_logs(logs_at, first_day)
+            since = self._parse_cursor(cursor)
+            next_cursor = f"{self._epoch}.{self._revision}"
+            if since is None:
+                # The cursor may have expired since it was checked above.
+                self._load_call_logs()
+                return {
+                    "cursor": next_cursor,
+                    "reset": True,
+                    "contacts": [c.copy() for c in self._iter_contacts()],
+                    "deleted": [],
+                    "call_logs": self._call_logs.records(),
+                }
+
+            start = bisect.bisect_right(self._changes, since, key=lambda change: change[0])
+            contact_ids: dict[str, None] = {}
+            call_logs = []
+            for _, kind, key in self._changes[start:]:
+                if kind == "contact":
+                    # Re-insert so each contact is listed once, by its
+                    # latest change.
+                    contact_ids.pop(key, None)
+                    contact_ids[key] = None
+                else:
+                    call_logs.append(dict(key))
+            contacts, deleted = [], []
+            for contact_id in contact_ids:
+                record = self._get_contact(contact_id)
+                if record is None:
+                    deleted.append(contact_id)
+                else:
+                    contacts.append(record.copy())
+            return {
+                "cursor": next_cursor,
+                "reset": False,
+                "contacts": contacts,
+                "deleted": deleted,
+                "call_logs": call_logs,
+            }
+
+    def _log_sheet(self, title: str) -> gspread.Worksheet:
+        worksheet = self._log_sheets.get(title)
+        if worksheet is None:
+            worksheet = self._log_sheets[title] = self._spreadsheet.worksheet(title)
+        return worksheet
+
+    def _open_worksheet(self, title: str, rows: list[list]) -> tuple[gspread.Worksheet, bool]:
+        """The worksheet titled ``title``, created holding ``rows`` if missing.
+
+        An existing worksheet is adopted as it is, never replaced: another
+        process, or an interrupted run, may have written to it. Returns
+        the worksheet and whether it was created.
+        """
+        try:
+            return self._spreadsheet.worksheet(title), False
+        except WorksheetNotFound:
+            worksheet = self._spreadsheet.add_worksheet(title, rows=1, cols=len(rows[0]))
+        worksheet.append_rows(rows)
+        return worksheet, True
+
+    def _load_manifest(self) -> PartitionManifest:
+        try:
+            self._manifest_ws = self._spreadsheet.worksheet(MANIFEST_TITLE)
+        except WorksheetNotFound:
+            return self._migrate_legacy_call_logs()
+        return PartitionManifest.from_rows(self._manifest_ws.get_all_values())
+
+    def _migrate_legacy_call_logs(self) -> PartitionManifest:
+        """Split the single CallLogs worksheet into monthly partitions.
+
+        The manifest is written last, so an interrupted migration starts
+        over on the next start and fills in the months it left. CallLogs
+        itself is left as it was.
+        """
+        try:
+            rows = self._spreadsheet.worksheet(LEGACY_TITLE).get_all_values()[1:]
+        except WorksheetNotFound:
+            rows = []
+        position = CALL_LOG_HEADERS.index("timestamp")
+        months = [month_of(row[position] if len(row) > position else None) for row in rows]
+        by_month = _group_by(rows, months)
+        undated = by_month.pop(None, [])
+        if undated:
+            newest = max(by_month, default=date.today().isoformat()[:7])
+            by_month.setdefault(newest, []).extend(undated)
+        partitions = []
+        for month in sorted(by_month):
+            partition = month_partition(month)
+            worksheet, created = self._open_worksheet(
+                partition.title, [CALL_LOG_HEADERS, *by_month[month]]
+            )
+            if not created:
+                have = _logged_ids(worksheet)
+                missing = [row for row in by_month[month] if row[0] not in have]
+                if missing:
+                    worksheet.append_rows(missing)
+            self._log_sheets[partition.title] = worksheet
+            partitions.append(partition)
+        manifest = PartitionManifest(partitions)
+        self._manifest_ws, created = self._open_worksheet(MANIFEST_TITLE, manifest.rows())
+        if not created:
+            # Another process finished the migration first.
+            return PartitionManifest.from_rows(self._manifest_ws.get_all_values())
+        return manifest
+
+    def _reload_manifest(self) -> None:
+        """Pick up partitions other processes added or archived since the
+        manifest was last read. Call with _partition_lock held.
+        """
+        listed = PartitionManifest.from_rows(self._manifest_ws.get_all_values())
+        with self._lock:
+            for partition in listed.partitions:
+                if self._manifest.get(partition.title) is None:
+                    # Served until now as a partition of just queued logs.
+                    self._partitions_loaded_at.pop(partition.title, None)
+            gone = [p for p in self._manifest.partitions if listed.get(p.title) is None]
+            self._manifest = listed
+            archives = [listed.route(p.first_day) for p in gone]
+            for title, months in _group_by(gone, [a and a.title for a in archives]).items():
+                for month in months:
+                    self._log_sheets.pop(month.title, None)
+                if title is not None:
+                    # Archived by another process.
+                    self._merge_cached_partitions(
+                        title, [month.title for month in months], created=False
+                    )
+
+    def _write_manifest(self, manifest: PartitionManifest) -> None:
+        # Manifests only shrink when rewritten, so the new rows fit the
+        # grid; leftover rows past them are cleared.
+        rows = manifest.rows()
+        self._manifest_ws.update(rows, "A1")
+        self._manifest_ws.batch_clear([f"A{len(rows) + 1}:C"])
+        with self._lock:
+            self._manifest = manifest
+
+    def _partition_of(self, record: Mapping) -> str | None:
+        partition = self._manifest.route((record["timestamp"] or "")[:10])
+        return partition.title if partition is not None else None
+
+    def _planned_partition(self, record: Mapping) -> Partition:
+        """The partition ``record`` belongs in, which may not exist yet."""
+        partition = self._manifest.route((record["timestamp"] or "")[:10])
+        if partition is not None:
+            return partition
+        month = month_of(record["timestamp"])
+        if month is None:
+            # Undated logs join the newest partition.
+            if self._manifest.partitions:
+                return self._manifest.partitions[-1]
+            month = date.today().isoformat()[:7]
+        return month_partition(month)
+
+    def _partition_for(self, record: Mapping) -> str:
+        """Title of the partition ``record`` is written to, created if needed.
+
+        Call with _partition_lock held.
+        """
+        partition = self._planned_partition(record)
+        if self._manifest.get(partition.title) is not None:
+            return partition.title
+        # Another process may have created it since the manifest was read.
+        self._reload_manifest()
+        partition = self._planned_partition(record)
+        if self._manifest.get(partition.title) is not None:
+            return partition.title
+        worksheet, created = self._open_worksheet(partition.title, [CALL_LOG_HEADERS])
+        self._log_sheets[partition.title] = worksheet
+        self._manifest_ws.append_row([partition.title, partition.first_day, partition.last_day])
+        with self._lock:
+            self._manifest = self._manifest.replace(added=partition)
+            self._partition_codes.setdefault(partition.title, len(self._partition_codes))
+            if created:
+                # A sheet that was just created has nothing to download.
+                self._partitions_loaded_at[partition.title] = time.monotonic()
+            else:
+                # Left by an interrupted run; its rows are read on next use.
+                self._partitions_loaded_at.pop(partition.title, None)
+        return partition.title
+
+    def archive_call_logs(self, today: date | None = None) -> list[str]:
+        """Compact old monthly partitions into one archive worksheet per year.
+
+        Months that ended more than ``sheets_archive_after_months`` months
+        before the current one are appended to their year's archive and
+        then deleted. Rows already in the archive are skipped, so a rerun
+        after a failure never duplicates them. Returns the titles of the
+        archived month worksheets.
+        """
+        if not self._partitioned:
+            return []
+        today = today or date.today()
+        months_back = today.year * 12 + today.month - 1 - self._archive_after_months
+        cutoff = date(months_back // 12, months_back % 12 + 1, 1).isoformat()
+        archived = []
+        with self._partition_lock:
+            # The manifest is rewritten below, so it must include whatever
+            # other processes added to it.
+            self._reload_manifest()
+            old = [p for p in self._manifest.partitions if p.is_month and p.last_day < cutoff]
+            for year, months in _group_by(old, [p.first_day[:4] for p in old]).items():
+                title = archive_title(year)
+                current = self._manifest.get(title)
+                if current is None:
+                    worksheet, created = self._open_worksheet(title, [CALL_LOG_HEADERS])
+                else:
+                    worksheet, created = self._log_sheet(title), False
+                have = set() if created else _logged_ids(worksheet)
+                rows = [
+                    row
+                    for month in months
+                    for row in self._log_sheet(month.title).get_all_values()[1:]
+                    if row and row[0] not in have
+                ]
+                if rows:
+                    worksheet.append_rows(rows)
+                self._log_sheets[title] = worksheet
+                spans = months + ([current] if current is not None else [])
+                archive = archive_partition(
+                    year,
+                    min(p.first_day for p in spans),
+                    max(p.last_day for p in spans),
+                )
+                month_titles = [month.title for month in months]
+                self._write_manifest(
+                    self._manifest.replace(removed=month_titles, added=archive)
+                )
+                with self._lock:
+                    self._merge_cached_partitions(title, month_titles, created=created)
+                for month_title in month_titles:
+                    self._spreadsheet.del_worksheet(self._log_sheet(month_title))
+                    del self._log_sheets[month_title]
+                archived.extend(month_titles)
+        return archived
+
+    def _merge_cached_partitions(self, title: str, merged: list[str], created: bool) -> None:
+        # Cached rows of the merged months now belong to the archive. If
+        # every piece was cached, the rows are relabeled in place; otherwise
+        # they are dropped and the archive is downloaded on next use.
+        code = self._partition_codes.setdefault(title, len(self._partition_codes))
+        merged_codes = {self._partition_codes[t] for t in merged if t in self._partition_codes}
+        stamps = [self._partitions_loaded_at.pop(t, None) for t in merged]
+        stamps.append(time.monotonic() if created else self._partitions_loaded_at.get(title))
+        if None not in stamps:
+            for i, c in enumerate(self._log_partition):
+                if c in merged_codes:
+                    self._log_partition[i] = code
+            self._partitions_loaded_at[title] = min(stamps)
+        else:
+            merged_codes.add(code)
+            keep = [i for i, c in enumerate(self._log_partition) if c not in merged_codes]
+            combined = _call_log_table()
+            for record in self._call_logs.records(keep):
+                combined.append(record)
+            self._log_partition = array("H", (self._log_partition[i] for i in keep))
+            self._call_logs = combined
+            self._partitions_loaded_at.pop(title, None)
+            self._reindex_call_logs()
+        self._call_logs_version += 1
+
+    def _archive_loop(self) -> None:
+        while not self._stop_archiving.wait(self._archive_interval):
+            try:
+                with background_priority():
+                    self.archive_call_logs()
+            except Exception:
+                logger.exception("Call-log archival failed")
+
+    def _fetch_call_logs(self, title: str) -> tuple[int, float, Table]:
+        with self._lock:
+            version = self._call_logs_version
+        rows = self._log_sheet(title).get_all_values()
+        call_logs = _call_log_table()
+        for row in rows[1:]:
+            call_logs.append(self._normalize_call_log(dict(zip(CALL_LOG_HEADERS, row))))
+        return version, time.monotonic(), call_logs
+
+    def _prefetch_call_logs(
+        self, first_day: str = "", last_day: str = END_OF_TIME
+    ) -> dict[str, float | None]:
+        """Call-log counterpart of _prefetch_contacts.
+
+        Only the partitions that may hold logs dated ``first_day`` to
+        ``last_day`` are downloaded. Returns their load stamps by title.
+        """
+        stamps = {}
+        for partition in self._manifest.covering(first_day, last_day):
+            title = partition.title
+            loaded_at = self._partitions_loaded_at.get(title)
+            if not self._is_current(partition, loaded_at):
+                version, fetched_at, call_logs = self._flights.do(
+                    f"call_logs:{title}", partial(self._fetch_call_logs, title)
+                )
+                with self._lock:
+                    if (
+                        self._partitions_loaded_at.get(title) == loaded_at
+                        and version == self._call_logs_version
+                    ):
+                        self._apply_call_logs(title, call_logs, fetched_at)
+                    loaded_at = self._partitions_loaded_at.get(title)
+            stamps[title] = loaded_at
+        return stamps
+
+    def _load_call_logs(
+        self,
+        accept: dict[str, float | None] | None = None,
+        first_day: str = "",
+        last_day: str = END_OF_TIME,
+    ) -> Table:
+        with self._lock:
+            for partition in self._manifest.covering(first_day, last_day):
+                title = partition.title
+                loaded_at = self._partitions_loaded_at.get(title)
+                accepted = loaded_at is not None and (accept or {}).get(title) == loaded_at
+                if not (self._is_current(partition, loaded_at) or accepted):
+                    _, fetched_at, call_logs = self._fetch_call_logs(title)
+                    self._apply_call_logs(title, call_logs, fetched_at)
+            self._cache_unrouted_call_logs()
+            return self._call_logs
+
+    def _recent_day(self) -> str:
+        """First day of the logs that are not cold."""
+        if not self._partitioned:
+            return ""
+        return (date.today() - timedelta(days=RECENT_LOG_DAYS)).isoformat()
+
+    def _is_current(self, partition: Partition, loaded_at: float | None) -> bool:
+        if loaded_at is None:
+            return False
+        return self._is_fresh(loaded_at) or partition.last_day < self._recent_day()
+
+    def _apply_call_logs(self, title: str, call_logs: Table, fetched_at: float) -> None:
+        code = self._partition_codes.setdefault(title, len(self._partition_codes))
+        own = [i for i, c in enumerate(self._log_partition) if c == code]
+        previous = (
+            {self._call_logs.get(i, "id") for i in own}
+            if title in self._partitions_loaded_at else None
+        )
+        if len(own) == len(self._call_logs):
+            self._call_logs = call_logs
+            self._log_partition = array("H", [code]) * len(call_logs)
+        else:
+            # Other partitions' rows stay; this partition's are swapped out.
+            own = set(own)
+            keep = [i for i in range(len(self._call_logs)) if i not in own]
+            combined = _call_log_table()
+            for record in self._call_logs.records(keep):
+                combined.append(record)
+            for record in call_logs.records():
+                combined.append(record)
+            self._log_partition = (
+                array("H", (self._log_partition[i] for i in keep))
+                + array("H", [code]) * len(call_logs)
+            )
+            self._call_logs = combined
+        self._partitions_loaded_at[title] = fetched_at
+        self._call_logs_version += 1
+        self._reindex_call_logs()
+        self._overlay_pending_call_logs(title, call_logs)
+        if previous is not None:
+            self._record_changes(
+                "call_log",
+                self._call_logs.records(
+                    i for i, (c, log_id) in enumerate(
+                        zip(self._log_partition, self._call_logs.column("id"))
+                    )
+                    if c == code and log_id not in previous
+                ),
+            )
+
+    def _overlay_pending_call_logs(self, title: str, fetched: Table) -> None:
+        batches = self._batches()
+        if not batches:
+            return
+        # Drop queued logs the reload shows are already in the sheet.
+        written = set(fetched.column("id"))
+        for batch in batches:
+            batch.logs = [r for r in batch.logs if r["id"] not in written]
+            for record in batch.logs:
+                if self._partition_of(record) == title:
+                    self._index_call_log(record, title)
+
+    def _cache_queued_call_logs(self, records: list[dict]) -> None:
+        # A queued log's partition may not exist yet; the flusher creates
+        # it. Until then it is served as a partition holding just the
+        # queued logs.
+        self._call_logs_version += 1
+        for record in records:
+            title = self._planned_partition(record).title
+            if self._manifest.get(title) is None:
+                self._partition_codes.setdefault(title, len(self._partition_codes))
+                self._partitions_loaded_at.setdefault(title, time.monotonic())
+            if title in self._partitions_loaded_at:
+                self._index_call_log(record, title)
+
+    def _cache_unrouted_call_logs(self) -> None:
+        # Queued logs for partitions not created yet, after the cache was
+        # dropped or the journal replayed.
+        unrouted = []
+        for batch in self._batches():
+            for record in batch.logs:
+                title = self._planned_partition(record).title
+                if self._manifest.get(title) is None and title not in self._partitions_loaded_at:
+                    unrouted.append(record)
+        if unrouted:
+            self._cache_queued_call_logs(unrouted)
+
+    def _reindex_call_logs(self) -> None:
+        # Rows are normally already in timestamp order; sorting anyway keeps
+        # the index correct if someone pasted older rows into the sheet.
+        timestamps = [ts or "" for ts in self._call_logs.column("timestamp")]
+        order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+        self._log_order = array("q", order)
+        self._log_keys = [timestamps[i] for i in order]
+        self._logs_by_contact = {}
+        self._last_calls = {}
+        self._search.clear_call_logs()
+        for i, log in enumerate(self._call_logs):
+            self._logs_by_contact.setdefault(log["contact_id"], array("q")).append(i)
+            self._note_last_call(log)
+            self._search.add_call_log(log)
+        days = [ts[:10] for ts in timestamps]
+        self._calls_per_day = Counter(days)
+        self._connected_per_day = Counter(
+            day for day, disposition in zip(days, self._call_logs.column("disposition"))
+            if disposition == "Connected"
+        )
+
+    def _index_call_log(self, record: dict, title: str) -> None:
+        offset = len(self._call_logs)
+        self._call_logs.append(record)
+        self._log_partition.append(self._partition_codes[title])
+        key = record["timestamp"] or ""
+        if not self._log_keys or key >= self._log_keys[-1]:
+            self._log_keys.append(key)
+            self._log_order.append(offset)
+        else:
+            pos = bisect.bisect_right(self._log_keys, key)
+            self._log_keys.insert(pos, key)
+            self._log_order.insert(pos, offset)
+        self._logs_by_contact.setdefault(record["contact_id"], array("q")).append(offset)
+        self._note_last_call(record)
+        self._search.add_call_log(record)
+        self._calls_per_day[key[:10]] += 1
+        if record["disposition"] == "Connected":
+            self._connected_per_day[key[:10]] += 1
+
+    def _note_last_call(self, record: Mapping) -> None:
+        timestamp = record["timestamp"] or ""
+        last = self._last_calls.get(record["contact_id"])
+        if last is None or timestamp > last[0]:
+            self._last_calls[record["contact_id"]] = (timestamp, record["disposition"])
+
+    def _day_range(self, date_str: str) -> tuple[int, int]:
+        # Every timestamp on the day sorts between the bare date and the date
+        # followed by the highest code point.
+        lo = bisect.bisect_left(self._log_keys, date_str)
+        hi = bisect.bisect_left(self._log_keys, date_str + "\U0010ffff", lo)
+        return lo, hi
+
+    @staticmethod
+    def _new_call_log_row(data: dict) -> list:
+        return [
+            data.get("id") or str(uuid.uuid4()),
             data["contact_id"],
             data.get("contact_name") or "",
-            now,
+            data.get("timestamp") or datetime.now(UTC).isoformat(),
             data["duration_seconds"],
             data["disposition"],
             data.get("summary") or "",
@@ -138,25 +1475,312 @@ class SheetsService:
             data.get("deal_stage") or "",
             data.get("deal_stage_after") or "",
         ]
-        self._call_logs_ws.append_row(row)
-        return self._normalize_call_log(dict(zip(CALL_LOG_HEADERS, row)))
 
-    def get_call_logs_for_contact(self, contact_id: str) -> list[dict]:
-        rows = self._call_logs_ws.get_all_values()
-        if len(rows) <= 1:
+    def append_call_log(self, data: dict) -> dict:
+        if self._pending is not None:
+            return self.append_call_logs([data])[0]
+        row = self._new_call_log_row(data)
+        record = self._normalize_call_log(dict(zip(CALL_LOG_HEADERS, row)))
+        with self._partition_lock:
+            title = self._partition_for(record)
+            self._log_sheet(title).append_row(row)
+        with self._lock:
+            self._call_logs_version += 1
+            if title in self._partitions_loaded_at:
+                self._index_call_log(record, title)
+            self._record_changes("call_log", [record])
+        return dict(record)
+
+    def append_call_logs(self, items: list[dict]) -> list[dict]:
+        """Append many call logs with one append_rows call per partition."""
+        if not items:
             return []
-        return [
-            self._normalize_call_log(dict(zip(CALL_LOG_HEADERS, row)))
-            for row in rows[1:]
-            if row[1] == contact_id
-        ]
+        rows = [self._new_call_log_row(data) for data in items]
+        records = [self._normalize_call_log(dict(zip(CALL_LOG_HEADERS, row))) for row in rows]
+        if self._pending is not None:
+            ops = [{"op": "log", "record": r} for r in records]
+            with self._journal_lock:
+                self._journal_ops(ops)
+                with self._lock:
+                    self._queue(ops)
+                    self._cache_queued_call_logs(records)
+                    self._record_changes("call_log", records)
+            return [dict(r) for r in records]
 
-    def get_call_logs_by_date(self, date_str: str) -> list[dict]:
-        rows = self._call_logs_ws.get_all_values()
-        if len(rows) <= 1:
+        with self._partition_lock:
+            titles = [self._partition_for(record) for record in records]
+            for title, group in _group_by(records, titles).items():
+                self._log_sheet(title).append_rows([self._call_log_to_row(r) for r in group])
+        with self._lock:
+            self._call_logs_version += 1
+            for record, title in zip(records, titles):
+                if title in self._partitions_loaded_at:
+                    self._index_call_log(record, title)
+            self._record_changes("call_log", records)
+        return [dict(r) for r in records]
+
+    def record_call(
+        self, contact_id: str, build: Callable[[dict], tuple[dict, dict]]
+    ) -> tuple[dict, dict] | None:
+        """Log a call and apply the contact changes it implies, together.
+
+        ``build`` is called with the current contact and returns the call
+        log data and the contact changes. Returns the call log and the
+        updated contact, or None if the contact does not exist.
+        """
+        return self.record_calls([(contact_id, build)])[0]
+
+    def record_calls(
+        self, calls: list[tuple[str, Callable[[dict], tuple[dict, dict]]]]
+    ) -> list[tuple[dict, dict] | None]:
+        """record_call for many calls, written together.
+
+        Each ``build`` sees the contact as the calls before it in ``calls``
+        left it. Once the contacts' cached rows are confirmed, the log rows
+        and the changed contact cells go out in a single spreadsheet
+        batch_update; with write-behind on, they are journaled as one entry
+        instead. Returns record_call's result for each call, in order.
+        """
+        if not calls:
             return []
-        return [
-            self._normalize_call_log(dict(zip(CALL_LOG_HEADERS, row)))
-            for row in rows[1:]
-            if row[3].startswith(date_str)
-        ]
+        # A lock is held from the read to the write, so two calls to the
+        # same contact never both count from the same call_count.
+        contacts_at = self._prefetch_contacts()
+        if self._pending is not None:
+            with self._journal_lock:
+                with self._lock:
+                    self._load_contacts(contacts_at)
+                    contacts = {cid: self._get_contact(cid) for cid, _ in calls}
+                    _, changed, call_logs, results = self._build_calls(calls, contacts)
+                ops = [
+                    *({"op": "update", "id": cid, "changes": c} for cid, c in changed.items()),
+                    *({"op": "log", "record": call_log} for call_log in call_logs),
+                ]
+                # One journal entry, so a crash keeps all the writes or none.
+                self._journal_ops(ops)
+                with self._lock:
+                    self._queue(ops)
+                    records = self._cache_queued_updates(changed)
+                    self._cache_queued_call_logs(call_logs)
+                    self._record_changes("call_log", call_logs)
+                self._contacts_changed(records)
+            return results
+
+        with self._write_lock:
+            located = self._locate_contacts(list(dict.fromkeys(cid for cid, _ in calls)))
+            records, changed, call_logs, results = self._build_calls(
+                calls, {contact_id: contact for contact_id, (_, contact) in located.items()}
+            )
+            if not call_logs:
+                return results
+
+            contacts_id = self._contacts_ws.id
+            requests = [
+                {
+                    "updateCells": {
+                        "range": {
+                            "sheetId": contacts_id,
+                            "startRowIndex": located[contact_id][0] - 1,
+                            "endRowIndex": located[contact_id][0],
+                            "startColumnIndex": CONTACT_HEADERS.index(key),
+                            "endColumnIndex": CONTACT_HEADERS.index(key) + 1,
+                        },
+                        "rows": [_row_data([value], user_entered=True)],
+                        "fields": "userEnteredValue",
+                    }
+                }
+                for contact_id, changes in changed.items()
+                for key, value in changes.items()
+            ]
+            with self._partition_lock:
+                titles = [self._partition_for(call_log) for call_log in call_logs]
+                for title, group in _group_by(call_logs, titles).items():
+                    requests.append({
+                        "appendCells": {
+                            "sheetId": self._log_sheet(title).id,
+                            "rows": [_row_data(self._call_log_to_row(r)) for r in group],
+                            "fields": "userEnteredValue",
+                        }
+                    })
+                self._spreadsheet.batch_update({"requests": requests})
+
+            with self._lock:
+                self._contacts_version += 1
+                for contact_id, record in records.items():
+                    row_num = located[contact_id][0]
+                    if self._contact_rows.get(contact_id) == row_num:
+                        self._contacts[row_num - 2] = record
+                self._call_logs_version += 1
+                for call_log, title in zip(call_logs, titles):
+                    if title in self._partitions_loaded_at:
+                        self._index_call_log(call_log, title)
+                self._record_changes("call_log", call_logs)
+        self._contacts_changed(records)
+        return results
+
+    def _build_calls(self, calls, contacts: dict[str, dict | None]):
+        # Runs each build against the contact as the calls before it left
+        # it. Returns the updated records, the merged changes per contact,
+        # the new call logs and record_calls' results.
+        records: dict[str, dict] = {}
+        changed: dict[str, dict] = {}
+        call_logs: list[dict] = []
+        results: list[tuple[dict, dict] | None] = []
+        for contact_id, build in calls:
+            contact = records.get(contact_id) or contacts.get(contact_id)
+            if contact is None:
+                results.append(None)
+                continue
+            log_data, changes = build(dict(contact))
+            changes = self._contact_changes(changes)
+            records[contact_id] = self._merge_contact(contact, changes)
+            changed.setdefault(contact_id, {}).update(changes)
+            call_log = self._normalize_call_log(
+                dict(zip(CALL_LOG_HEADERS, self._new_call_log_row(log_data)))
+            )
+            call_logs.append(call_log)
+            results.append((dict(call_log), dict(records[contact_id])))
+        return records, changed, call_logs, results
+
+    def get_all_call_logs(self) -> list[dict]:
+        logs_at = self._prefetch_call_logs()
+        with self._lock:
+            return self._load_call_logs(logs_at).records()
+
+    def get_call_logs_for_contact(self, contact_id: str) -> list[dict]:
+        logs_at = self._prefetch_call_logs()
+        with self._lock:
+            logs = self._load_call_logs(logs_at)
+            return logs.records(self._logs_by_contact.get(contact_id, ()))
+
+    def get_call_history(
+        self, contact_id: str, limit: int | None = None, offset: int = 0
+    ) -> tuple[int, list[dict]]:
+        """A contact's call count and one page of its calls, newest first.
+
+        Served from the contact_id index, so only that contact's rows are
+        touched.
+        """
+        logs_at = self._prefetch_call_logs()
+        with self._lock:
+            logs = self._load_call_logs(logs_at)
+            offsets = self._logs_by_contact.get(contact_id, ())
+            newest_first = sorted(
+                offsets, key=lambda i: (logs.get(i, "timestamp") or "", i), reverse=True
+            )
+            end = offset + limit if limit is not None else None
+            return len(offsets), logs.records(newest_first[offset:end])
+
+    def get_call_logs_by_date(self, date_str: str) -> list[dict]:
+        logs_at = self._prefetch_call_logs(date_str, date_str)
+        with self._lock:
+            logs = self._load_call_logs(logs_at, date_str, date_str)
+            lo, hi = self._day_range(date_str)
+            return logs.records(self._log_order[lo:hi])
+
+    def get_call_activity(self, day: date) -> dict:
+        """Summarize calls on ``day`` from the per-day call counters.
+
+        ``streak`` is the number of consecutive days with at least one call,
+        ending on ``day``.
+        """
+        logs_at = self._prefetch_call_logs(day.isoformat(), day.isoformat())
+        with self._lock:
+            self._load_call_logs(logs_at, day.isoformat(), day.isoformat())
+            calls = self._calls_per_day[day.isoformat()]
+            connected = self._connected_per_day[day.isoformat()]
+
+            streak = 0
+            check_date = day
+            while True:
+                # A streak that reaches back into an older partition
+                # loads it.
+                key = check_date.isoformat()
+                partition = self._manifest.route(key)
+                if partition is not None and partition.title not in self._partitions_loaded_at:
+                    self._load_call_logs(None, key, key)
+                if not self._calls_per_day[key]:
+                    break
+                streak += 1
+                check_date -= timedelta(days=1)
+
+        return {"calls": calls, "connected": connected, "streak": streak}
+
+    def get_call_series(self, start: date, end: date, interval: str) -> list[dict]:
+        """Calls, connect rate, average duration and disposition mix per
+        day or week from ``start`` to ``end`` inclusive.
+
+        Each bucket is a contiguous run of the timestamp index and is
+        aggregated straight from the column arrays. Results are cached per
+        range until the call logs change.
+        """
+        logs_at = self._prefetch_call_logs(start.isoformat(), end.isoformat())
+        with self._lock:
+            logs = self._load_call_logs(logs_at, start.isoformat(), end.isoformat())
+            if self._series_version != self._call_logs_version:
+                self._series_cache = {}
+                self._series_version = self._call_logs_version
+            key = (start, end, interval)
+            series = self._series_cache.get(key)
+            if series is None:
+                starts = bucket_starts(start, end, interval)
+                bounds = [bisect.bisect_left(self._log_keys, day.isoformat()) for day in starts]
+                bounds.append(
+                    bisect.bisect_left(self._log_keys, (end + timedelta(days=1)).isoformat())
+                )
+                durations = logs.ints("duration_seconds")
+                codes, vocabulary = logs.codes("disposition")
+                series = []
+                for bucket, lo, hi in zip(starts, bounds, bounds[1:]):
+                    rows = self._log_order[lo:hi]
+                    mix = Counter(map(codes.__getitem__, rows))
+                    series.append(summarize(
+                        bucket,
+                        hi - lo,
+                        sum(map(durations.__getitem__, rows)),
+                        Counter({vocabulary[code]: n for code, n in mix.items()}),
+                    ))
+                if len(self._series_cache) >= SERIES_CACHE_SIZE:
+                    self._series_cache = {}
+                self._series_cache[key] = series
+            return copy.deepcopy(series)
+
+
+def _group_by(items: list, keys: list) -> dict:
+    """``items`` grouped by the matching ``keys``, in first-seen order."""
+    groups: dict = {}
+    for item, key in zip(items, keys):
+        groups.setdefault(key, []).append(item)
+    return groups
+
+
+def _logged_ids(worksheet: gspread.Worksheet) -> set[str]:
+    return {row[0] for row in worksheet.get_all_values()[1:] if row and row[0]}
+
+
+def _first_cell(values: list[list]) -> str:
+    return values[0][0] if values and values[0] else ""
+
+
+def _row_data(values: list, user_entered: bool = False) -> dict:
+    """``values`` as Sheets API RowData.
+
+    Strings are stored as given like a RAW write, or, with
+    ``user_entered``, parsed the way USER_ENTERED parses typed input, so
+    dates and numbers in text become real dates and numbers.
+    """
+    cells = []
+    for value in values:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append({"userEnteredValue": {"numberValue": value}})
+        elif user_entered:
+            cells.append({"userEnteredValue": {"formulaValue": str(value)}})
+        else:
+            cells.append({"userEnteredValue": {"stringValue": str(value)}})
+    return {"values": cells}
+
+
+def _as_values(values) -> set:
+    if isinstance(values, str) or values is None:
+        return {values}
+    return set(values)
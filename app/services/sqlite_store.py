@@ -0,0 +1,575 @@
+import bisect
+import logging
+import sqlite3
+import threading
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from app.config import settings
+from app.services.analytics import bucket_starts, summarize
+from app.services.call_plan import plan_reason, priority, top
+from app.services.quota import background_priority
+from app.services.search import SearchIndex
+from app.services.sheets import (
+    CALL_LOG_HEADERS,
+    CONTACT_HEADERS,
+    INDEXED_FIELDS,
+    SheetsService,
+    _as_values,
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    contact_person TEXT,
+    phone TEXT,
+    city TEXT,
+    industry TEXT,
+    source TEXT,
+    deal_stage TEXT,
+    last_called TEXT,
+    next_follow_up TEXT,
+    call_count INTEGER NOT NULL DEFAULT 0,
+    last_call_summary TEXT,
+    recording_link TEXT,
+    notes TEXT
+);
+CREATE INDEX IF NOT EXISTS contacts_phone ON contacts (phone);
+CREATE INDEX IF NOT EXISTS contacts_deal_stage ON contacts (deal_stage);
+CREATE INDEX IF NOT EXISTS contacts_city ON contacts (city);
+CREATE INDEX IF NOT EXISTS contacts_industry ON contacts (industry);
+CREATE INDEX IF NOT EXISTS contacts_next_follow_up ON contacts (next_follow_up);
+
+CREATE TABLE IF NOT EXISTS call_logs (
+    id TEXT PRIMARY KEY,
+    contact_id TEXT,
+    contact_name TEXT,
+    timestamp TEXT,
+    duration_seconds INTEGER NOT NULL DEFAULT 0,
+    disposition TEXT,
+    summary TEXT,
+    recording_url TEXT,
+    deal_stage TEXT,
+    deal_stage_after TEXT
+);
+CREATE INDEX IF NOT EXISTS call_logs_contact_id ON call_logs (contact_id);
+CREATE INDEX IF NOT EXISTS call_logs_timestamp ON call_logs (timestamp);
+
+-- Per-day call counters for the dashboard, kept by a trigger so stats
+-- and streaks never count call_logs rows.
+CREATE TABLE IF NOT EXISTS daily_calls (
+    day TEXT PRIMARY KEY,
+    calls INTEGER NOT NULL DEFAULT 0,
+    connected INTEGER NOT NULL DEFAULT 0
+);
+CREATE TRIGGER IF NOT EXISTS call_logs_daily_calls AFTER INSERT ON call_logs
+WHEN NEW.timestamp IS NOT NULL
+BEGIN
+    INSERT INTO daily_calls (day, calls, connected)
+    VALUES (substr(NEW.timestamp, 1, 10), 1, NEW.disposition = 'Connected')
+    ON CONFLICT (day) DO UPDATE SET
+        calls = calls + 1, connected = connected + excluded.connected;
+END;
+
+CREATE TABLE IF NOT EXISTS changes (
+    revision INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_epoch (
+    epoch TEXT NOT NULL,
+    floor INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+_CONTACT_COLUMNS = ", ".join(CONTACT_HEADERS)
+_CALL_LOG_COLUMNS = ", ".join(CALL_LOG_HEADERS)
+
+
+def _insert_sql(table: str, headers: list[str], verb: str = "INSERT") -> str:
+    return (
+        f"{verb} INTO {table} ({', '.join(headers)}) "
+        f"VALUES ({', '.join('?' for _ in headers)})"
+    )
+
+
+class SQLiteService:
+    """Local SQLite store with the same public interface as SheetsService.
+
+    Every read and write is served from the database. When
+    ``sheets_mirror`` is enabled, mutations are replayed to Google Sheets
+    in order on a background thread, and an empty database is seeded from
+    the sheet on first start.
+    """
+
+    def __init__(self):
+        self._conn = sqlite3.connect(settings.sqlite_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        # Revisions live in the changes table, so cursors survive restarts;
+        # the epoch only changes when the database itself is replaced.
+        # Revisions up to the floor have been trimmed away.
+        with self._conn:
+            row = self._conn.execute("SELECT epoch FROM sync_epoch").fetchone()
+            if row is None:
+                row = (uuid.uuid4().hex[:12],)
+                self._conn.execute("INSERT INTO sync_epoch (epoch) VALUES (?)", row)
+        self._epoch = row[0]
+        self._changelog_size = settings.sync_changelog_size
+        # Full-text index, built from the tables on the first search and
+        # kept current by writes after that.
+        self._search: SearchIndex | None = None
+
+        self._mirror: SheetsService | None = None
+        self._mirror_queue: ThreadPoolExecutor | None = None
+        if settings.sheets_mirror:
+            self._mirror = SheetsService()
+            # A single worker keeps replayed mutations in their original order.
+            self._mirror_queue = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mirror")
+            self._seed_from_mirror()
+
+    def close(self) -> None:
+        if self._mirror_queue is not None:
+            self._mirror_queue.shutdown(wait=True)
+        if self._mirror is not None:
+            self._mirror.close()
+        self._conn.close()
+
+    def quota_metrics(self) -> dict:
+        return self._mirror.quota_metrics() if self._mirror is not None else {}
+
+    def invalidate_cache(self) -> None:
+        # Nothing is cached in front of the database.
+        pass
+
+    def _seed_from_mirror(self) -> None:
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM contacts LIMIT 1").fetchone():
+                return
+        contacts = [c for c in self._mirror.get_all_contacts() if c["id"] is not None]
+        call_logs = [log for log in self._mirror.get_all_call_logs() if log["id"] is not None]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                _insert_sql("contacts", CONTACT_HEADERS, "INSERT OR IGNORE"),
+                [[c[key] for key in CONTACT_HEADERS] for c in contacts],
+            )
+            self._conn.executemany(
+                _insert_sql("call_logs", CALL_LOG_HEADERS, "INSERT OR IGNORE"),
+                [[log[key] for key in CALL_LOG_HEADERS] for log in call_logs],
+            )
+
+    def _replay(self, method: str, *args) -> None:
+        if self._mirror_queue is None:
+            return
+
+        def _run():
+            try:
+                with background_priority():
+                    getattr(self._mirror, method)(*args)
+            except Exception:
+                logger.exception("Failed to mirror %s to Google Sheets", method)
+
+        self._mirror_queue.submit(_run)
+
+    def _query(self, sql: str, params: tuple = ()) -> list[dict]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def _record_changes(self, kind: str, keys) -> None:
+        # Called inside the mutation's transaction.
+        self._conn.executemany(
+            "INSERT INTO changes (kind, key) VALUES (?, ?)", [(kind, key) for key in keys]
+        )
+        # AUTOINCREMENT revisions are contiguous above the floor, so their
+        # difference is the number of rows kept. Trim in bulk once the log
+        # is twice its size so writes stay amortized O(1).
+        revision, floor = self._conn.execute(
+            "SELECT (SELECT COALESCE(MAX(revision), 0) FROM changes), floor FROM sync_epoch"
+        ).fetchone()
+        if revision - floor > 2 * self._changelog_size:
+            floor = revision - self._changelog_size
+            self._conn.execute("DELETE FROM changes WHERE revision <= ?", (floor,))
+            self._conn.execute("UPDATE sync_epoch SET floor = ?", (floor,))
+
+    def get_changes(self, cursor: str | None) -> dict:
+        with self._lock:
+            revision, floor = self._conn.execute(
+                "SELECT (SELECT COALESCE(MAX(revision), 0) FROM changes), floor FROM sync_epoch"
+            ).fetchone()
+            next_cursor = f"{self._epoch}.{revision}"
+            epoch, _, since = (cursor or "").partition(".")
+            if (
+                epoch != self._epoch
+                or not since.isdigit()
+                or not floor <= int(since) <= revision
+            ):
+                return {
+                    "cursor": next_cursor,
+                    "reset": True,
+                    "contacts": [dict(row) for row in self._conn.execute(
+                        f"SELECT {_CONTACT_COLUMNS} FROM contacts ORDER BY rowid"
+                    )],
+                    "deleted": [],
+                    "call_logs": [dict(row) for row in self._conn.execute(
+                        f"SELECT {_CALL_LOG_COLUMNS} FROM call_logs ORDER BY rowid"
+                    )],
+                }
+
+            params = (int(since), revision)
+            contacts = [dict(row) for row in self._conn.execute(
+                f"SELECT {', '.join('c.' + key for key in CONTACT_HEADERS)} FROM contacts c "
+                "JOIN (SELECT key, MAX(revision) AS revision FROM changes "
+                "WHERE kind = 'contact' AND revision > ? AND revision <= ? GROUP BY key) ch "
+                "ON ch.key = c.id ORDER BY ch.revision",
+                params,
+            )]
+            deleted = [row[0] for row in self._conn.execute(
+                "SELECT key FROM changes WHERE kind = 'contact' AND revision > ? "
+                "AND revision <= ? AND key NOT IN (SELECT id FROM contacts) "
+                "GROUP BY key ORDER BY MAX(revision)",
+                params,
+            )]
+            call_logs = [dict(row) for row in self._conn.execute(
+                f"SELECT {', '.join('l.' + key for key in CALL_LOG_HEADERS)} FROM call_logs l "
+                "JOIN changes ch ON ch.kind = 'call_log' AND ch.key = l.id "
+                "WHERE ch.revision > ? AND ch.revision <= ? ORDER BY ch.revision",
+                params,
+            )]
+        return {
+            "cursor": next_cursor,
+            "reset": False,
+            "contacts": contacts,
+            "deleted": deleted,
+            "call_logs": call_logs,
+        }
+
+    # --- Contacts ---
+
+    def get_all_contacts(self) -> list[dict]:
+        return self._query(f"SELECT {_CONTACT_COLUMNS} FROM contacts ORDER BY rowid")
+
+    def get_contact_by_id(self, contact_id: str) -> dict | None:
+        rows = self._query(f"SELECT {_CONTACT_COLUMNS} FROM contacts WHERE id = ?", (contact_id,))
+        return rows[0] if rows else None
+
+    def find_contacts(self, exclude: dict | None = None, **match) -> list[dict]:
+        clauses, params = [], []
+        for filters, negate in ((match, False), (exclude or {}, True)):
+            for field, values in filters.items():
+                clause, args = _match_clause(field, values, negate)
+                clauses.append(clause)
+                params.extend(args)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        return self._query(
+            f"SELECT {_CONTACT_COLUMNS} FROM contacts {where}ORDER BY rowid", tuple(params)
+        )
+
+    def search_contacts(self, query: str, limit: int = 20) -> list[dict]:
+        with self._lock:
+            if self._search is None:
+                self._search = SearchIndex()
+                for row in self._conn.execute(f"SELECT {_CONTACT_COLUMNS} FROM contacts"):
+                    self._search.set_contact(row["id"], dict(row))
+                for row in self._conn.execute("SELECT contact_id, summary FROM call_logs"):
+                    self._search.add_call_log(dict(row))
+            ids = self._search.search(query, limit)
+            records = {
+                row["id"]: dict(row)
+                for row in self._conn.execute(
+                    f"SELECT {_CONTACT_COLUMNS} FROM contacts "
+                    f"WHERE id IN ({', '.join('?' for _ in ids)})",
+                    ids,
+                )
+            }
+        return [records[contact_id] for contact_id in ids if contact_id in records]
+
+    def get_call_plan(
+        self, limit: int | None = None, offset: int = 0
+    ) -> tuple[int, list[tuple[str, int, dict]]]:
+        # Only plan candidates are read: due follow-ups via the
+        # next_follow_up index and uncalled contacts via deal_stage.
+        today = date.today()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_CONTACT_COLUMNS}, ("
+                "SELECT disposition FROM call_logs WHERE contact_id = contacts.id "
+                "ORDER BY timestamp DESC LIMIT 1"
+                ") AS last_disposition, rowid FROM contacts "
+                "WHERE next_follow_up <= ? OR (deal_stage = 'New' AND call_count = 0)",
+                (today.isoformat(),),
+            ).fetchall()
+        scored = []
+        for row in rows:
+            contact = {key: row[key] for key in CONTACT_HEADERS}
+            reason = plan_reason(contact, today.isoformat())
+            if reason is not None:
+                score = priority(contact, reason, today, row["last_disposition"])
+                scored.append((score, row["rowid"], (reason, score, contact)))
+        end = offset + limit if limit is not None else None
+        return len(scored), top(scored, end)[offset:end]
+
+    def count_contacts_by(self, field: str) -> dict[str, int]:
+        if field not in INDEXED_FIELDS:
+            raise KeyError(field)
+        with self._lock:
+            return dict(self._conn.execute(
+                f"SELECT {field}, COUNT(*) FROM contacts WHERE {field} IS NOT NULL GROUP BY {field}"
+            ).fetchall())
+
+    def create_contact(self, data: dict) -> dict:
+        return self.create_contacts([data])[0]
+
+    def create_contacts(self, items: list[dict]) -> list[dict]:
+        records = [
+            SheetsService._normalize_contact(
+                dict(zip(CONTACT_HEADERS, SheetsService._new_contact_row(data)))
+            )
+            for data in items
+        ]
+        if not records:
+            return []
+        with self._lock, self._conn:
+            self._conn.executemany(
+                _insert_sql("contacts", CONTACT_HEADERS),
+                [[r[key] for key in CONTACT_HEADERS] for r in records],
+            )
+            self._record_changes("contact", [r["id"] for r in records])
+            if self._search is not None:
+                for record in records:
+                    self._search.set_contact(record["id"], record)
+        self._replay("create_contacts", [dict(r) for r in records])
+        return records
+
+    def update_contact(self, contact_id: str, data: dict) -> dict:
+        updated = self.update_contacts({contact_id: data})
+        if contact_id not in updated:
+            raise ValueError(f"Contact {contact_id} not found")
+        return updated[contact_id]
+
+    def update_contacts(self, updates: dict[str, dict]) -> dict[str, dict]:
+        result = {}
+        mirrored = {}
+        with self._lock, self._conn:
+            for contact_id, data in updates.items():
+                changes = {
+                    key: (None if value == "" else value)
+                    for key, value in data.items()
+                    if key in CONTACT_HEADERS and key != "id" and value is not None
+                }
+                if changes:
+                    assignments = ", ".join(f"{key} = ?" for key in changes)
+                    self._conn.execute(
+                        f"UPDATE contacts SET {assignments} WHERE id = ?",
+                        (*changes.values(), contact_id),
+                    )
+                row = self._conn.execute(
+                    f"SELECT {_CONTACT_COLUMNS} FROM contacts WHERE id = ?", (contact_id,)
+                ).fetchone()
+                if row is not None:
+                    result[contact_id] = dict(row)
+                    mirrored[contact_id] = data
+            self._record_changes("contact", result)
+            if self._search is not None:
+                for contact_id, record in result.items():
+                    self._search.set_contact(contact_id, record)
+        if mirrored:
+            self._replay("update_contacts", mirrored)
+        return result
+
+    def delete_contact(self, contact_id: str) -> None:
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM contacts WHERE id = ?", (contact_id,))
+            if cursor.rowcount:
+                self._record_changes("contact", [contact_id])
+                if self._search is not None:
+                    self._search.set_contact(contact_id, None)
+        if cursor.rowcount == 0:
+            raise ValueError(f"Contact {contact_id} not found")
+        self._replay("delete_contact", contact_id)
+
+    # --- Call logs ---
+
+    def append_call_log(self, data: dict) -> dict:
+        return self.append_call_logs([data])[0]
+
+    def append_call_logs(self, items: list[dict]) -> list[dict]:
+        records = [
+            SheetsService._normalize_call_log(
+                dict(zip(CALL_LOG_HEADERS, SheetsService._new_call_log_row(data)))
+            )
+            for data in items
+        ]
+        if not records:
+            return []
+        with self._lock, self._conn:
+            self._conn.executemany(
+                _insert_sql("call_logs", CALL_LOG_HEADERS),
+                [[r[key] for key in CALL_LOG_HEADERS] for r in records],
+            )
+            self._record_changes("call_log", [r["id"] for r in records])
+            if self._search is not None:
+                for record in records:
+                    self._search.add_call_log(record)
+        self._replay("append_call_logs", [dict(r) for r in records])
+        return records
+
+    def record_call(
+        self, contact_id: str, build: Callable[[dict], tuple[dict, dict]]
+    ) -> tuple[dict, dict] | None:
+        """Log a call and apply its contact changes in one transaction."""
+        return self.record_calls([(contact_id, build)])[0]
+
+    def record_calls(
+        self, calls: list[tuple[str, Callable[[dict], tuple[dict, dict]]]]
+    ) -> list[tuple[dict, dict] | None]:
+        """record_call for many calls, in one transaction."""
+        results: list[tuple[dict, dict] | None] = []
+        replayed = []
+        with self._lock, self._conn:
+            for contact_id, build in calls:
+                row = self._conn.execute(
+                    f"SELECT {_CONTACT_COLUMNS} FROM contacts WHERE id = ?", (contact_id,)
+                ).fetchone()
+                if row is None:
+                    results.append(None)
+                    continue
+                log_data, data = build(dict(row))
+                call_log = SheetsService._normalize_call_log(
+                    dict(zip(CALL_LOG_HEADERS, SheetsService._new_call_log_row(log_data)))
+                )
+                self._conn.execute(
+                    _insert_sql("call_logs", CALL_LOG_HEADERS),
+                    [call_log[key] for key in CALL_LOG_HEADERS],
+                )
+                changes = {
+                    key: (None if value == "" else value)
+                    for key, value in data.items()
+                    if key in CONTACT_HEADERS and key != "id" and value is not None
+                }
+                if changes:
+                    assignments = ", ".join(f"{key} = ?" for key in changes)
+                    self._conn.execute(
+                        f"UPDATE contacts SET {assignments} WHERE id = ?",
+                        (*changes.values(), contact_id),
+                    )
+                contact = dict(self._conn.execute(
+                    f"SELECT {_CONTACT_COLUMNS} FROM contacts WHERE id = ?", (contact_id,)
+                ).fetchone())
+                self._record_changes("call_log", [call_log["id"]])
+                self._record_changes("contact", [contact_id])
+                if self._search is not None:
+                    self._search.add_call_log(call_log)
+                    self._search.set_contact(contact_id, contact)
+                results.append((call_log, contact))
+                replayed.append((contact_id, call_log, data))
+        if replayed:
+            # The mirror gets the values computed here rather than rebuilding
+            # them from its own copy of the contact.
+            self._replay("record_calls", [
+                (contact_id, lambda _, log=call_log, data=data: (dict(log), data))
+                for contact_id, call_log, data in replayed
+            ])
+        return results
+
+    def get_all_call_logs(self) -> list[dict]:
+        return self._query(f"SELECT {_CALL_LOG_COLUMNS} FROM call_logs ORDER BY rowid")
+
+    def get_call_logs_for_contact(self, contact_id: str) -> list[dict]:
+        return self._query(
+            f"SELECT {_CALL_LOG_COLUMNS} FROM call_logs WHERE contact_id = ? ORDER BY rowid",
+            (contact_id,),
+        )
+
+    def get_call_history(
+        self, contact_id: str, limit: int | None = None, offset: int = 0
+    ) -> tuple[int, list[dict]]:
+        with self._lock:
+            (total,) = self._conn.execute(
+                "SELECT COUNT(*) FROM call_logs WHERE contact_id = ?", (contact_id,)
+            ).fetchone()
+        page = self._query(
+            f"SELECT {_CALL_LOG_COLUMNS} FROM call_logs WHERE contact_id = ? "
+            "ORDER BY timestamp DESC, rowid DESC LIMIT ? OFFSET ?",
+            (contact_id, -1 if limit is None else limit, offset),
+        )
+        return total, page
+
+    def get_call_logs_by_date(self, date_str: str) -> list[dict]:
+        return self._query(
+            f"SELECT {_CALL_LOG_COLUMNS} FROM call_logs "
+            "WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp, rowid",
+            _day_bounds(date_str),
+        )
+
+    def get_call_activity(self, day: date) -> dict:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT calls, connected FROM daily_calls WHERE day = ?", (day.isoformat(),)
+            ).fetchone()
+            calls, connected = row if row else (0, 0)
+
+            streak = 0
+            check_date = day
+            for (active_day,) in self._conn.execute(
+                "SELECT day FROM daily_calls WHERE day <= ? AND calls > 0 ORDER BY day DESC",
+                (day.isoformat(),),
+            ):
+                if active_day != check_date.isoformat():
+                    break
+                streak += 1
+                check_date -= timedelta(days=1)
+
+        return {"calls": calls, "connected": connected, "streak": streak}
+
+    def get_call_series(self, start: date, end: date, interval: str) -> list[dict]:
+        starts = bucket_starts(start, end, interval)
+        with self._lock:
+            # Grouped by day and disposition on the timestamp index; days
+            # are then folded into their buckets.
+            rows = self._conn.execute(
+                "SELECT substr(timestamp, 1, 10), disposition, COUNT(*), SUM(duration_seconds) "
+                "FROM call_logs WHERE timestamp >= ? AND timestamp < ? GROUP BY 1, 2",
+                (start.isoformat(), (end + timedelta(days=1)).isoformat()),
+            ).fetchall()
+        keys = [day.isoformat() for day in starts]
+        calls, durations = [0] * len(starts), [0] * len(starts)
+        mixes = [Counter() for _ in starts]
+        for day, disposition, count, duration in rows:
+            i = bisect.bisect_right(keys, day) - 1
+            calls[i] += count
+            durations[i] += duration
+            mixes[i][disposition] += count
+        return [
+            summarize(day, n, duration, mix)
+            for day, n, duration, mix in zip(starts, calls, durations, mixes)
+        ]
+
+
+def _match_clause(field: str, values, negate: bool) -> tuple[str, list]:
+    if field not in INDEXED_FIELDS:
+        raise KeyError(field)
+    values = _as_values(values)
+    known = [v for v in values if v is not None]
+    parts = []
+    if known:
+        parts.append(f"{field} IN ({', '.join('?' for _ in known)})")
+    if None in values:
+        parts.append(f"{field} IS NULL")
+    clause = " OR ".join(parts) or "0"
+    if negate:
+        # IN yields NULL for NULL columns; those rows are not excluded.
+        clause = f"NOT COALESCE({clause}, 0)"
+    return f"({clause})", known
+
+
+def _day_bounds(date_str: str) -> tuple[str, str]:
+    # Timestamps are ISO strings, so one day is a range on the timestamp index.
+    return date_str, date_str + "\U0010ffff"
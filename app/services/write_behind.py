@@ -0,0 +1,104 @@
+import json
+import os
+
+
+class WriteBatch:
+    """Sheets mutations that have been acknowledged but not written yet.
+
+    Contact operations are coalesced per id, so at most one of create,
+    update or delete is kept: updates fold into a pending create or into
+    each other, a delete drops earlier updates, and a delete of a contact
+    that was never written cancels its create outright. Call logs are
+    append-only and kept in order.
+    """
+
+    def __init__(self):
+        self.creates: dict[str, dict] = {}
+        self.updates: dict[str, dict] = {}
+        self.deletes: dict[str, None] = {}
+        self.logs: list[dict] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.creates or self.updates or self.deletes or self.logs)
+
+    def add(self, op: dict) -> None:
+        kind = op["op"]
+        if kind == "create":
+            record = op["record"]
+            self.creates[record["id"]] = dict(record)
+        elif kind == "update":
+            contact_id = op["id"]
+            if contact_id in self.creates:
+                self.creates[contact_id].update(op["changes"])
+            else:
+                self.updates.setdefault(contact_id, {}).update(op["changes"])
+        elif kind == "delete":
+            contact_id = op["id"]
+            if self.creates.pop(contact_id, None) is None:
+                self.updates.pop(contact_id, None)
+                self.deletes[contact_id] = None
+        elif kind == "log":
+            self.logs.append(dict(op["record"]))
+        else:
+            raise ValueError(f"Unknown write-behind operation {kind!r}")
+
+    def extend(self, other: "WriteBatch") -> None:
+        for op in other.ops():
+            self.add(op)
+
+    def ops(self) -> list[dict]:
+        # An id appears under only one kind, so grouping by kind keeps the
+        # outcome of the original sequence.
+        return [
+            *({"op": "create", "record": r} for r in self.creates.values()),
+            *({"op": "update", "id": i, "changes": c} for i, c in self.updates.items()),
+            *({"op": "delete", "id": i} for i in self.deletes),
+            *({"op": "log", "record": r} for r in self.logs),
+        ]
+
+
+class Journal:
+    """JSON-lines file of pending operations, fsynced before a write is acknowledged."""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def read(self) -> list[dict]:
+        ops = []
+        with open(self._path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    op = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-append leaves at most one torn final line,
+                    # and that write was never acknowledged.
+                    break
+                ops.extend(op["ops"] if op["op"] == "group" else [op])
+        return ops
+
+    def append(self, ops: list[dict]) -> None:
+        if not ops:
+            return
+        # Operations acknowledged together share one line, so a torn
+        # write loses all of them rather than some.
+        line = json.dumps(ops[0] if len(ops) == 1 else {"op": "group", "ops": ops})
+        self._file.write(line + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def rewrite(self, ops: list[dict]) -> None:
+        """Atomically replace the journal with ``ops``."""
+        tmp_path = f"{self._path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("".join(json.dumps(op) + "\n" for op in ops))
+            f.flush()
+            os.fsync(f.fileno())
+        self._file.close()
+        os.replace(tmp_path, self._path)
+        self._file = open(self._path, "a", encoding="utf-8")
+
+    def close(self) -> None:
+        self._file.close()
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -7,6 +7,112 @@ from app.auth import get_current_user
 from app.main import app
 from app.services.sheets import get_sheets_service
 
+# Spelled out rather than imported so the tests catch a reordered sheet.
+CONTACT_HEADERS = [
+    "id", "name", "contact_person", "phone", "city", "industry",
+    "source", "deal_stage", "last_called", "next_follow_up", "call_count",
+    "last_call_summary", "recording_link", "notes",
+]
+
+CALL_LOG_HEADERS = [
+    "id", "contact_id", "contact_name", "timestamp", "duration_seconds",
+    "disposition", "summary", "recording_url", "deal_stage", "deal_stage_after",
+]
+
+
+def make_contact_row(**overrides):
+    defaults = dict(zip(CONTACT_HEADERS, [
+        "uuid-1", "Alice", "", "123", "", "",
+        "", "New", "", "", "0", "", "", "",
+    ]))
+    defaults.update(overrides)
+    return [str(defaults[h]) for h in CONTACT_HEADERS]
+
+
+def make_call_log_row(**overrides):
+    defaults = dict(zip(CALL_LOG_HEADERS, [
+        "log-1", "uuid-1", "", "2026-02-23T10:00:00", "120",
+        "Connected", "", "", "New", "",
+    ]))
+    defaults.update(overrides)
+    return [str(defaults[h]) for h in CALL_LOG_HEADERS]
+
+
+def _read_cells(worksheet, ranges):
+    # Single-cell A1 ranges, answered from the rows the mock serves.
+    rows = worksheet.get_all_values.return_value
+    cells = []
+    for a1 in ranges:
+        row, col = int(a1[1:]), ord(a1[0]) - ord("A")
+        value = rows[row - 1][col] if row <= len(rows) and col < len(rows[row - 1]) else ""
+        cells.append([[value]] if value else [])
+    return cells
+
+
+def mock_spreadsheet(contacts_ws, call_logs_ws):
+    """A MagicMock spreadsheet serving the two unpartitioned worksheets.
+
+    Cell reads on the contacts worksheet answer from whatever its
+    get_all_values returns.
+    """
+    contacts_ws.batch_get.side_effect = lambda ranges, **kwargs: _read_cells(contacts_ws, ranges)
+    spreadsheet = MagicMock()
+    spreadsheet.worksheet.side_effect = lambda name: {
+        "Contacts": contacts_ws,
+        "CallLogs": call_logs_ws,
+    }[name]
+    return spreadsheet
+
+
+@pytest.fixture
+def make_sheets_service(tmp_path):
+    """Build SheetsServices on ``spreadsheet`` with patched settings.
+
+    ``write_behind`` and ``partitioned`` switch those modes on; any other
+    keyword overrides a setting. Background threads are stopped on
+    teardown without flushing, so tests decide what reaches the sheet.
+    """
+    services = []
+    with patch("app.services.sheets.gspread") as mock_gspread, \
+         patch("app.services.sheets.settings") as mock_settings:
+
+        def _make(spreadsheet, write_behind=False, partitioned=False, **overrides):
+            values = {
+                "google_service_account_json": '{"type": "service_account"}',
+                "spreadsheet_id": "test-sheet-id",
+                "sheets_pool_size": 10,
+                "sheets_cache_ttl_seconds": 300.0,
+                "sync_changelog_size": 10000,
+                "sheets_read_quota_per_minute": 60,
+                "sheets_write_quota_per_minute": 60,
+                "sheets_max_retries": 5,
+                "sheets_write_behind": write_behind,
+                "sheets_journal_path": str(tmp_path / "journal.jsonl"),
+                "sheets_flush_interval_seconds": 3600.0,
+                "sheets_partition_call_logs": partitioned,
+                "sheets_archive_after_months": 3,
+                "sheets_archive_interval_seconds": 3600.0,
+                **overrides,
+            }
+            for name, value in values.items():
+                setattr(mock_settings, name, value)
+            mock_gspread.service_account_from_dict.return_value.open_by_key.return_value = (
+                spreadsheet
+            )
+
+            from app.services.sheets import SheetsService
+
+            services.append(SheetsService())
+            return services[-1]
+
+        yield _make
+
+        for service in services:
+            if service._pending is not None:
+                service._stop_flushing.set()
+            if service._partitioned:
+                service._stop_archiving.set()
+
 
 @pytest.fixture
 def mock_sheets():
@@ -1,3 +1,10 @@
+from datetime import date
+
+import pytest
+
+from app.services.call_plan import plan_reason, priority, top
+
+
 def _make_contact(**overrides):
     contact = {
         "id": "uuid-1", "name": "Alice", "contact_person": None,
@@ -12,83 +19,83 @@ def _make_contact(**overrides):
 
 
 def test_call_plan_includes_new_uncalled(client, mock_sheets):
-    mock_sheets.get_all_contacts.return_value = [
-        _make_contact(id="uuid-1", deal_stage="New", call_count=0),
-    ]
+    mock_sheets.get_call_plan.return_value = (1, [
+        ("New contact", 50, _make_contact(id="uuid-1", deal_stage="New", call_count=0)),
+    ])
     response = client.get("/api/callplan/today")
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 1
     assert data[0]["id"] == "uuid-1"
     assert data[0]["reason"] == "New contact"
+    assert data[0]["priority"] == 50
+    assert response.headers["X-Total-Count"] == "1"
 
 
-def test_call_plan_includes_follow_up_due(client, mock_sheets):
-    mock_sheets.get_all_contacts.return_value = [
-        _make_contact(
-            id="uuid-2", deal_stage="Contacted", call_count=3,
-            next_follow_up="2026-02-22",
-        ),
-    ]
+def test_call_plan_keeps_service_order(client, mock_sheets):
+    mock_sheets.get_call_plan.return_value = (2, [
+        ("Follow-up due", 106, _make_contact(
+            id="follow-1", deal_stage="Contacted", call_count=2,
+            next_follow_up="2026-02-20",
+        )),
+        ("New contact", 50, _make_contact(id="new-1", deal_stage="New", call_count=0)),
+    ])
     response = client.get("/api/callplan/today")
     data = response.json()
-    assert len(data) == 1
+    assert [item["id"] for item in data] == ["follow-1", "new-1"]
     assert data[0]["reason"] == "Follow-up due"
 
 
-def test_call_plan_excludes_won(client, mock_sheets):
-    mock_sheets.get_all_contacts.return_value = [
-        _make_contact(id="uuid-1", deal_stage="Won", call_count=0),
-    ]
-    response = client.get("/api/callplan/today")
-    assert response.json() == []
+def test_call_plan_paging(client, mock_sheets):
+    mock_sheets.get_call_plan.return_value = (40, [
+        ("New contact", 50, _make_contact(id="uuid-11")),
+    ])
+    response = client.get("/api/callplan/today?offset=10&limit=1")
+    assert [item["id"] for item in response.json()] == ["uuid-11"]
+    assert response.headers["X-Total-Count"] == "40"
+    mock_sheets.get_call_plan.assert_called_once_with(1, 10)
 
 
-def test_call_plan_excludes_lost(client, mock_sheets):
-    mock_sheets.get_all_contacts.return_value = [
-        _make_contact(id="uuid-1", deal_stage="Lost", call_count=0),
-    ]
-    response = client.get("/api/callplan/today")
-    assert response.json() == []
+def test_call_plan_rejects_oversized_limit(client, mock_sheets):
+    response = client.get("/api/callplan/today?limit=501")
+    assert response.status_code == 422
 
 
-def test_call_plan_excludes_not_interested(client, mock_sheets):
-    mock_sheets.get_all_contacts.return_value = [
-        _make_contact(id="uuid-1", deal_stage="NotInterested", call_count=0),
-    ]
-    response = client.get("/api/callplan/today")
-    assert response.json() == []
+def test_plan_reason_follow_up_due():
+    contact = _make_contact(deal_stage="Contacted", call_count=3, next_follow_up="2026-02-22")
+    assert plan_reason(contact, "2026-02-22") == "Follow-up due"
+    assert plan_reason(contact, "2026-02-21") is None
 
 
-def test_call_plan_excludes_new_already_called(client, mock_sheets):
-    mock_sheets.get_all_contacts.return_value = [
-        _make_contact(id="uuid-1", deal_stage="New", call_count=2),
-    ]
-    response = client.get("/api/callplan/today")
-    assert response.json() == []
+def test_plan_reason_new_uncalled():
+    assert plan_reason(_make_contact(deal_stage="New", call_count=0), "2026-02-22") == "New contact"
+    assert plan_reason(_make_contact(deal_stage="New", call_count=2), "2026-02-22") is None
 
 
-def test_call_plan_excludes_future_follow_up(client, mock_sheets):
-    mock_sheets.get_all_contacts.return_value = [
-        _make_contact(
-            id="uuid-1", deal_stage="Contacted", call_count=1,
-            next_follow_up="2099-12-31",
-        ),
-    ]
-    response = client.get("/api/callplan/today")
-    assert response.json() == []
+@pytest.mark.parametrize("stage", ["Won", "Lost", "NotInterested"])
+def test_plan_reason_excludes_closed_stages(stage):
+    contact = _make_contact(deal_stage=stage, call_count=0, next_follow_up="2026-02-20")
+    assert plan_reason(contact, "2026-02-22") is None
 
 
-def test_call_plan_sorts_follow_ups_before_new(client, mock_sheets):
-    mock_sheets.get_all_contacts.return_value = [
-        _make_contact(id="new-1", deal_stage="New", call_count=0),
-        _make_contact(
-            id="follow-1", deal_stage="Contacted", call_count=2,
-            next_follow_up="2026-02-20",
-        ),
-    ]
-    response = client.get("/api/callplan/today")
-    data = response.json()
-    assert len(data) == 2
-    assert data[0]["id"] == "follow-1"
-    assert data[1]["id"] == "new-1"
+def test_plan_reason_follow_up_before_new():
+    contact = _make_contact(deal_stage="New", call_count=0, next_follow_up="2026-02-20")
+    assert plan_reason(contact, "2026-02-22") == "Follow-up due"
+
+
+def test_priority_weighs_overdue_stage_calls_and_disposition():
+    today = date(2026, 2, 22)
+    due = _make_contact(deal_stage="Contacted", call_count=1, next_follow_up="2026-02-20")
+    assert priority(due, "Follow-up due", today, None) == 100 + 6 + 10 - 2
+    assert priority(due, "Follow-up due", today, "Callback") > priority(
+        due, "Follow-up due", today, "NoAnswer"
+    )
+    long_overdue = dict(due, next_follow_up="2025-01-01")
+    assert priority(long_overdue, "Follow-up due", today, None) == 100 + 90 + 10 - 2
+    assert priority(_make_contact(), "New contact", today, None) == 50
+
+
+def test_top_keeps_best_k_in_position_order():
+    scored = [(10, 0, "a"), (30, 1, "b"), (10, 2, "c"), (20, 3, "d")]
+    assert top(scored, 3) == ["b", "d", "a"]
+    assert top(scored, None) == ["b", "d", "a", "c"]
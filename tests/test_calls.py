@@ -14,47 +14,42 @@ def _make_contact(**overrides):
     return contact
 
 
-def test_log_call_creates_call_log(client, mock_sheets):
-    mock_sheets.get_contact_by_id.return_value = _make_contact()
-    mock_sheets.append_call_log.return_value = {
-        "id": "log-1", "contact_id": "uuid-1",
-        "timestamp": "2026-02-23T10:00:00", "duration_seconds": 60,
-        "disposition": "Connected", "summary": None,
-        "deal_stage": "New", "recording_url": None, "deal_stage_after": None,
-    }
-    mock_sheets.update_contact.return_value = _make_contact(call_count=1)
+def _record_call(contact):
+    """Stand-in for record_call that runs the router's build on ``contact``."""
+    def record_call(contact_id, build):
+        log_data, changes = build(dict(contact))
+        call_log = {"id": "log-1", "timestamp": "2026-02-23T10:00:00", **log_data}
+        return call_log, {**contact, **changes}
+    return record_call
+
 
+def _log_call(client, mock_sheets, contact, **call):
+    mock_sheets.record_call.side_effect = _record_call(contact)
     response = client.post("/api/calls/log", json={
-        "contact_id": "uuid-1",
-        "duration_seconds": 60,
-        "disposition": "Connected",
+        "contact_id": "uuid-1", "duration_seconds": 60, "disposition": "Connected", **call,
     })
+    build = mock_sheets.record_call.call_args[0][1]
+    return response, build(dict(contact))
+
+
+def test_log_call_creates_call_log(client, mock_sheets):
+    response, (log_data, _) = _log_call(client, mock_sheets, _make_contact())
     assert response.status_code == 201
-    mock_sheets.append_call_log.assert_called_once()
+    assert response.json()["id"] == "log-1"
+    assert log_data["contact_name"] == "Alice"
+    assert log_data["deal_stage"] == "New"
+    mock_sheets.record_call.assert_called_once()
+    mock_sheets.get_contact_by_id.assert_not_called()
 
 
 def test_log_call_updates_contact(client, mock_sheets):
-    mock_sheets.get_contact_by_id.return_value = _make_contact(call_count=2)
-    mock_sheets.append_call_log.return_value = {
-        "id": "log-1", "contact_id": "uuid-1",
-        "timestamp": "2026-02-23T10:00:00", "duration_seconds": 60,
-        "disposition": "Connected", "summary": None,
-        "deal_stage": "New", "recording_url": None, "deal_stage_after": None,
-    }
-    mock_sheets.update_contact.return_value = _make_contact(call_count=3)
-
-    client.post("/api/calls/log", json={
-        "contact_id": "uuid-1",
-        "duration_seconds": 60,
-        "disposition": "Connected",
-    })
-    mock_sheets.update_contact.assert_called_once()
-    update_data = mock_sheets.update_contact.call_args[0][1]
+    _, (_, update_data) = _log_call(client, mock_sheets, _make_contact(call_count=2))
     assert update_data["call_count"] == 3
+    assert update_data["last_called"] == date.today().isoformat()
 
 
 def test_log_call_contact_not_found(client, mock_sheets):
-    mock_sheets.get_contact_by_id.return_value = None
+    mock_sheets.record_call.return_value = None
     response = client.post("/api/calls/log", json={
         "contact_id": "nonexistent",
         "duration_seconds": 60,
@@ -64,119 +59,97 @@ def test_log_call_contact_not_found(client, mock_sheets):
 
 
 def test_callback_sets_follow_up_tomorrow(client, mock_sheets):
-    mock_sheets.get_contact_by_id.return_value = _make_contact()
-    mock_sheets.append_call_log.return_value = {
-        "id": "log-1", "contact_id": "uuid-1",
-        "timestamp": "2026-02-23T10:00:00", "duration_seconds": 30,
-        "disposition": "Callback", "summary": None,
-        "deal_stage": "New", "recording_url": None, "deal_stage_after": None,
-    }
-    mock_sheets.update_contact.return_value = _make_contact()
-
-    client.post("/api/calls/log", json={
-        "contact_id": "uuid-1",
-        "duration_seconds": 30,
-        "disposition": "Callback",
-    })
-    update_data = mock_sheets.update_contact.call_args[0][1]
+    _, (_, update_data) = _log_call(
+        client, mock_sheets, _make_contact(), duration_seconds=30, disposition="Callback",
+    )
     expected = (date.today() + timedelta(days=1)).isoformat()
     assert update_data["next_follow_up"] == expected
 
 
 def test_no_answer_sets_follow_up_3_days(client, mock_sheets):
-    mock_sheets.get_contact_by_id.return_value = _make_contact()
-    mock_sheets.append_call_log.return_value = {
-        "id": "log-1", "contact_id": "uuid-1",
-        "timestamp": "2026-02-23T10:00:00", "duration_seconds": 0,
-        "disposition": "NoAnswer", "summary": None,
-        "deal_stage": "New", "recording_url": None, "deal_stage_after": None,
-    }
-    mock_sheets.update_contact.return_value = _make_contact()
-
-    client.post("/api/calls/log", json={
-        "contact_id": "uuid-1",
-        "duration_seconds": 0,
-        "disposition": "NoAnswer",
-    })
-    update_data = mock_sheets.update_contact.call_args[0][1]
+    _, (_, update_data) = _log_call(
+        client, mock_sheets, _make_contact(), duration_seconds=0, disposition="NoAnswer",
+    )
     expected = (date.today() + timedelta(days=3)).isoformat()
     assert update_data["next_follow_up"] == expected
 
 
 def test_voicemail_sets_follow_up_7_days(client, mock_sheets):
-    mock_sheets.get_contact_by_id.return_value = _make_contact()
-    mock_sheets.append_call_log.return_value = {
-        "id": "log-1", "contact_id": "uuid-1",
-        "timestamp": "2026-02-23T10:00:00", "duration_seconds": 15,
-        "disposition": "Voicemail", "summary": None,
-        "deal_stage": "New", "recording_url": None, "deal_stage_after": None,
-    }
-    mock_sheets.update_contact.return_value = _make_contact()
-
-    client.post("/api/calls/log", json={
-        "contact_id": "uuid-1",
-        "duration_seconds": 15,
-        "disposition": "Voicemail",
-    })
-    update_data = mock_sheets.update_contact.call_args[0][1]
+    _, (_, update_data) = _log_call(
+        client, mock_sheets, _make_contact(), duration_seconds=15, disposition="Voicemail",
+    )
     expected = (date.today() + timedelta(days=7)).isoformat()
     assert update_data["next_follow_up"] == expected
 
 
 def test_not_interested_clears_follow_up(client, mock_sheets):
-    mock_sheets.get_contact_by_id.return_value = _make_contact(
-        next_follow_up="2026-03-01",
+    _, (_, update_data) = _log_call(
+        client, mock_sheets, _make_contact(next_follow_up="2026-03-01"),
+        duration_seconds=10, disposition="NotInterested",
     )
-    mock_sheets.append_call_log.return_value = {
-        "id": "log-1", "contact_id": "uuid-1",
-        "timestamp": "2026-02-23T10:00:00", "duration_seconds": 10,
-        "disposition": "NotInterested", "summary": None,
-        "deal_stage": "NotInterested", "recording_url": None, "deal_stage_after": None,
-    }
-    mock_sheets.update_contact.return_value = _make_contact()
-
-    client.post("/api/calls/log", json={
-        "contact_id": "uuid-1",
-        "duration_seconds": 10,
-        "disposition": "NotInterested",
-    })
-    update_data = mock_sheets.update_contact.call_args[0][1]
     assert update_data["next_follow_up"] == ""
 
 
-def test_log_call_update_contact_not_found(client, mock_sheets):
-    mock_sheets.get_contact_by_id.return_value = _make_contact()
-    mock_sheets.append_call_log.return_value = {
-        "id": "log-1", "contact_id": "uuid-1",
-        "timestamp": "2026-02-23T10:00:00", "duration_seconds": 60,
-        "disposition": "Connected", "summary": None,
-        "deal_stage": "New", "recording_url": None, "deal_stage_after": None,
-    }
-    mock_sheets.update_contact.side_effect = ValueError("Contact uuid-1 not found")
-
-    response = client.post("/api/calls/log", json={
-        "contact_id": "uuid-1",
-        "duration_seconds": 60,
-        "disposition": "Connected",
-    })
-    assert response.status_code == 404
-
-
 def test_connected_uses_request_follow_up(client, mock_sheets):
-    mock_sheets.get_contact_by_id.return_value = _make_contact()
-    mock_sheets.append_call_log.return_value = {
-        "id": "log-1", "contact_id": "uuid-1",
-        "timestamp": "2026-02-23T10:00:00", "duration_seconds": 120,
-        "disposition": "Connected", "summary": None,
-        "deal_stage": "Qualified", "recording_url": None, "deal_stage_after": None,
-    }
-    mock_sheets.update_contact.return_value = _make_contact()
-
-    client.post("/api/calls/log", json={
-        "contact_id": "uuid-1",
-        "duration_seconds": 120,
-        "disposition": "Connected",
-        "next_follow_up": "2026-03-15",
-    })
-    update_data = mock_sheets.update_contact.call_args[0][1]
+    _, (log_data, update_data) = _log_call(
+        client, mock_sheets, _make_contact(),
+        duration_seconds=120, next_follow_up="2026-03-15", deal_stage="Qualified",
+    )
     assert update_data["next_follow_up"] == "2026-03-15"
+    assert log_data["deal_stage"] == "Qualified"
+
+
+def _record_calls(contacts):
+    """Stand-in for record_calls that runs the router's builds in order."""
+    def record_calls(calls):
+        results = []
+        for i, (contact_id, build) in enumerate(calls):
+            contact = contacts.get(contact_id)
+            if contact is None:
+                results.append(None)
+                continue
+            log_data, changes = build(dict(contact))
+            contacts[contact_id] = {**contact, **changes}
+            results.append(({"id": f"log-{i}", **log_data}, contacts[contact_id]))
+        return results
+    return record_calls
+
+
+def test_log_calls_batch_counts_each_call(client, mock_sheets):
+    contacts = {
+        "uuid-1": _make_contact(id="uuid-1", call_count=2),
+        "uuid-2": _make_contact(id="uuid-2", name="Bob"),
+    }
+    mock_sheets.record_calls.side_effect = _record_calls(contacts)
+
+    response = client.post("/api/calls/log/batch", json=[
+        {"contact_id": "uuid-1", "duration_seconds": 0, "disposition": "NoAnswer"},
+        {"contact_id": "uuid-2", "duration_seconds": 60, "disposition": "Connected",
+         "summary": "Interested"},
+        {"contact_id": "missing", "duration_seconds": 5, "disposition": "NoAnswer"},
+        {"contact_id": "uuid-1", "duration_seconds": 30, "disposition": "Callback",
+         "summary": "Call back tomorrow"},
+    ])
+    assert response.status_code == 201
+    data = response.json()
+    assert data["logged"] == 3
+    assert data["failed"] == 1
+    assert [r["status"] for r in data["results"]] == ["logged", "logged", "error", "logged"]
+    assert data["results"][1]["call_log"]["contact_name"] == "Bob"
+
+    # The service applies every call in one go; the router reads nothing.
+    mock_sheets.record_calls.assert_called_once()
+    mock_sheets.get_contact_by_id.assert_not_called()
+    mock_sheets.update_contacts.assert_not_called()
+    assert contacts["uuid-1"]["call_count"] == 4
+    assert contacts["uuid-1"]["last_call_summary"] == "Call back tomorrow"
+    assert contacts["uuid-1"]["next_follow_up"] == (date.today() + timedelta(days=1)).isoformat()
+    assert contacts["uuid-2"]["call_count"] == 1
+    assert contacts["uuid-2"]["next_follow_up"] is None
+
+
+def test_log_calls_batch_empty(client, mock_sheets):
+    mock_sheets.record_calls.return_value = []
+    response = client.post("/api/calls/log/batch", json=[])
+    assert response.status_code == 201
+    assert response.json() == {"logged": 0, "failed": 0, "results": []}
@@ -0,0 +1,101 @@
+import tracemalloc
+
+import pytest
+
+from app.services.columnar import RowView, Table
+
+HEADERS = ["id", "stage", "count", "note"]
+
+
+def _table():
+    return Table(HEADERS, int_columns=["count"], enum_columns=["stage"])
+
+
+def _record(i, stage="New", note=None):
+    return {"id": f"id-{i}", "stage": stage, "count": i, "note": note}
+
+
+def test_rows_round_trip():
+    table = _table()
+    table.append(_record(1))
+    table.append(_record(2, stage=None, note="hi"))
+    assert len(table) == 2
+    assert isinstance(table[0], RowView)
+    assert table[0]["stage"] == "New"
+    assert table[1].copy() == _record(2, stage=None, note="hi")
+    assert table[-1]["id"] == "id-2"
+    assert table.records() == [_record(1), _record(2, stage=None, note="hi")]
+    assert table.records([1]) == [_record(2, stage=None, note="hi")]
+    assert table.column("count") == [1, 2]
+    with pytest.raises(IndexError):
+        table[2]
+
+
+def test_row_view_is_a_mapping():
+    table = _table()
+    table.append(_record(1))
+    view = table[0]
+    assert view == _record(1)
+    assert dict(view) == _record(1)
+    assert view.get("missing") is None
+    assert list(view) == HEADERS
+
+
+def test_update_and_delete():
+    table = _table()
+    for i in range(3):
+        table.append(_record(i))
+    table[1] = _record(9, stage="Won")
+    del table[0]
+    assert table.records() == [_record(9, stage="Won"), _record(2)]
+
+
+def test_enum_values_are_interned_codes():
+    table = _table()
+    for i in range(1000):
+        table.append(_record(i, stage=["New", "Won"][i % 2]))
+    stage = table._columns[1]
+    assert stage.codes.typecode == "H"
+    assert stage.vocabulary == [None, "New", "Won"]
+    assert table._columns[2].values.typecode == "q"
+
+
+def test_enum_codes_widen_past_16_bits():
+    table = Table(["key"], enum_columns=["key"])
+    for i in range(70000):
+        table.append({"key": f"k{i}"})
+    assert table._columns[0].codes.typecode == "I"
+    assert table[69999]["key"] == "k69999"
+    assert table[0]["key"] == "k0"
+
+
+def test_uses_far_less_memory_than_dicts():
+    records = [_record(i, stage="Contacted", note=None) for i in range(20000)]
+
+    tracemalloc.start()
+    as_dicts = [dict(r) for r in records]
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    table = _table()
+    for record in records:
+        table.append(record)
+    table_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert len(as_dicts) == len(table)
+    assert table_bytes * 4 < dict_bytes
+
+
+def test_raw_column_access():
+    table = _table()
+    table.append(_record(1))
+    table.append(_record(2, stage="Won"))
+    codes, vocabulary = table.codes("stage")
+    assert [vocabulary[code] for code in codes] == ["New", "Won"]
+    assert list(table.ints("count")) == [1, 2]
+    with pytest.raises(TypeError):
+        table.ints("stage")
+    with pytest.raises(TypeError):
+        table.codes("count")
@@ -1,3 +1,7 @@
+import pytest
+import requests
+
+
 def _make_contact(**overrides):
     contact = {
         "id": "uuid-1", "name": "Alice", "contact_person": None,
@@ -12,7 +16,7 @@ def _make_contact(**overrides):
 
 
 def test_list_contacts_returns_data(client, mock_sheets):
-    mock_sheets.get_all_contacts.return_value = [
+    mock_sheets.find_contacts.return_value = [
         _make_contact(),
         _make_contact(id="uuid-2", name="Bob"),
     ]
@@ -24,23 +28,71 @@ def test_list_contacts_returns_data(client, mock_sheets):
 
 
 def test_list_contacts_empty(client, mock_sheets):
-    mock_sheets.get_all_contacts.return_value = []
+    mock_sheets.find_contacts.return_value = []
     response = client.get("/api/contacts")
     assert response.status_code == 200
     assert response.json() == []
 
 
 def test_list_contacts_filter_by_deal_stage(client, mock_sheets):
-    mock_sheets.get_all_contacts.return_value = [
+    mock_sheets.find_contacts.return_value = [
         _make_contact(id="uuid-1", deal_stage="New"),
-        _make_contact(id="uuid-2", deal_stage="Won"),
         _make_contact(id="uuid-3", deal_stage="New"),
     ]
-    response = client.get("/api/contacts?deal_stage=New")
+    response = client.get("/api/contacts?deal_stage=New&city=Pune")
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 2
-    assert all(c["deal_stage"] == "New" for c in data)
+    mock_sheets.find_contacts.assert_called_once_with(deal_stage="New", city="Pune")
+
+
+def test_list_contacts_paginated(client, mock_sheets):
+    mock_sheets.find_contacts.return_value = [
+        _make_contact(id=f"uuid-{i}") for i in range(5)
+    ]
+    response = client.get("/api/contacts?offset=1&limit=2")
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()] == ["uuid-1", "uuid-2"]
+    assert response.headers["X-Total-Count"] == "5"
+
+
+def test_list_contacts_sorted(client, mock_sheets):
+    mock_sheets.find_contacts.return_value = [
+        _make_contact(id="uuid-1", next_follow_up="2026-03-02"),
+        _make_contact(id="uuid-2", next_follow_up=None),
+        _make_contact(id="uuid-3", next_follow_up="2026-03-01"),
+        _make_contact(id="uuid-4", next_follow_up="2026-03-03"),
+    ]
+    response = client.get("/api/contacts?sort=next_follow_up")
+    assert [c["id"] for c in response.json()] == ["uuid-3", "uuid-1", "uuid-4", "uuid-2"]
+
+    response = client.get("/api/contacts?sort=-next_follow_up&limit=2")
+    assert [c["id"] for c in response.json()] == ["uuid-4", "uuid-1"]
+
+
+def test_list_contacts_field_projection(client, mock_sheets):
+    mock_sheets.find_contacts.return_value = [_make_contact()]
+    response = client.get("/api/contacts?fields=id,name")
+    assert response.json() == [{"id": "uuid-1", "name": "Alice"}]
+
+
+def test_list_contacts_rejects_unknown_columns(client, mock_sheets):
+    mock_sheets.find_contacts.return_value = []
+    assert client.get("/api/contacts?fields=id,password").status_code == 422
+    assert client.get("/api/contacts?sort=password").status_code == 422
+    assert client.get("/api/contacts?limit=100000").status_code == 422
+
+
+def test_search_contacts(client, mock_sheets):
+    mock_sheets.search_contacts.return_value = [_make_contact()]
+    response = client.get("/api/contacts/search", params={"q": "ali", "limit": 5})
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == "uuid-1"
+    mock_sheets.search_contacts.assert_called_once_with("ali", 5)
+
+
+def test_search_contacts_requires_query(client, mock_sheets):
+    assert client.get("/api/contacts/search").status_code == 422
 
 
 def test_get_contact_found(client, mock_sheets):
@@ -56,6 +108,23 @@ def test_get_contact_not_found(client, mock_sheets):
     assert response.status_code == 404
 
 
+def test_get_contact_calls(client, mock_sheets):
+    mock_sheets.get_contact_by_id.return_value = _make_contact()
+    mock_sheets.get_call_history.return_value = (3, [{"id": "log-3"}])
+    response = client.get("/api/contacts/uuid-1/calls?offset=2&limit=1")
+    assert response.status_code == 200
+    assert response.json() == [{"id": "log-3"}]
+    assert response.headers["X-Total-Count"] == "3"
+    mock_sheets.get_call_history.assert_called_once_with("uuid-1", 1, 2)
+
+
+def test_get_contact_calls_not_found(client, mock_sheets):
+    mock_sheets.get_contact_by_id.return_value = None
+    response = client.get("/api/contacts/missing/calls")
+    assert response.status_code == 404
+    mock_sheets.get_call_history.assert_not_called()
+
+
 def test_create_contact(client, mock_sheets):
     mock_sheets.create_contact.return_value = _make_contact(name="Carol", phone="789")
     response = client.post("/api/contacts", json={"name": "Carol", "phone": "789"})
@@ -94,6 +163,99 @@ def test_delete_contact_not_found(client, mock_sheets):
     assert response.status_code == 404
 
 
+def _created(items):
+    return [_make_contact(id=f"new-{i}", **item) for i, item in enumerate(items)]
+
+
+def test_import_contacts_json(client, mock_sheets):
+    mock_sheets.create_contacts.side_effect = _created
+    response = client.post("/api/contacts/import", json=[
+        {"name": "Carol", "phone": "789"},
+        {"name": "Dan"},
+        {"name": "Eve", "phone": "456", "deal_stage": "Qualified"},
+    ])
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["failed"] == 1
+    assert [r["status"] for r in data["results"]] == ["created", "error", "created"]
+    assert data["results"][1]["errors"][0]["field"] == "phone"
+    mock_sheets.create_contacts.assert_called_once()
+    items = mock_sheets.create_contacts.call_args[0][0]
+    assert [i["name"] for i in items] == ["Carol", "Eve"]
+    assert items[1]["deal_stage"] == "Qualified"
+
+
+def test_import_contacts_json_requires_array(client, mock_sheets):
+    response = client.post("/api/contacts/import", json={"name": "Carol", "phone": "789"})
+    assert response.status_code == 422
+
+
+def test_import_contacts_csv(client, mock_sheets):
+    mock_sheets.create_contacts.side_effect = _created
+    body = (
+        "name,phone,city,notes\r\n"
+        "Carol,789,Pune,\r\n"
+        'Dan,000,,"line one\nline two"\r\n'
+        "Eve,,Delhi,\r\n"
+    )
+    response = client.post(
+        "/api/contacts/import", content=body, headers={"content-type": "text/csv"},
+    )
+    data = response.json()
+    assert data["created"] == 2
+    assert data["results"][2]["row"] == 3
+    assert data["results"][2]["status"] == "error"
+    items = mock_sheets.create_contacts.call_args[0][0]
+    assert items[0]["city"] == "Pune"
+    assert items[1]["city"] is None
+    assert items[1]["notes"] == "line one\nline two"
+
+
+def test_import_contacts_ndjson_chunks(client, mock_sheets, monkeypatch):
+    from app.routers import contacts
+
+    monkeypatch.setattr(contacts, "IMPORT_CHUNK_SIZE", 2)
+    mock_sheets.create_contacts.side_effect = _created
+    body = "\n".join([
+        '{"name": "A", "phone": "1"}',
+        '{"name": "B", "phone": "2"}',
+        "not json",
+        '{"name": "C", "phone": "3"}',
+    ])
+    response = client.post(
+        "/api/contacts/import", content=body,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    data = response.json()
+    assert data["created"] == 3
+    assert data["failed"] == 1
+    assert data["results"][2]["status"] == "error"
+    assert mock_sheets.create_contacts.call_count == 2
+
+
+def test_import_contacts_reports_failed_write(client, mock_sheets, caplog):
+    mock_sheets.create_contacts.side_effect = requests.ConnectionError("reset")
+    response = client.post("/api/contacts/import", json=[{"name": "Carol", "phone": "789"}])
+    data = response.json()
+    assert data["failed"] == 1
+    assert data["results"][0]["errors"][0]["message"] == "Write failed"
+    assert "Import of 1 contacts failed" in caplog.text
+
+
+def test_import_contacts_propagates_bugs(client, mock_sheets):
+    mock_sheets.create_contacts.side_effect = KeyError("name")
+    with pytest.raises(KeyError):
+        client.post("/api/contacts/import", json=[{"name": "Carol", "phone": "789"}])
+
+
+def test_import_contacts_unsupported_type(client, mock_sheets):
+    response = client.post(
+        "/api/contacts/import", content="x", headers={"content-type": "text/plain"},
+    )
+    assert response.status_code == 415
+
+
 def test_auth_required(unauthed_client):
     response = unauthed_client.get("/api/contacts")
     assert response.status_code == 401
@@ -0,0 +1,36 @@
+import asyncio
+import threading
+
+from app.services.executors import BoundedExecutor
+
+
+def test_run_returns_result():
+    executor = BoundedExecutor("test", max_workers=1)
+    result = asyncio.run(executor.run(lambda a, b=0: a + b, 1, b=2))
+    assert result == 3
+    executor.shutdown()
+
+
+def test_blocking_calls_overlap():
+    executor = BoundedExecutor("test", max_workers=2)
+    barrier = threading.Barrier(2, timeout=5)
+
+    def blocking_call():
+        # Only returns once both calls are running at the same time.
+        barrier.wait()
+        return threading.current_thread().name
+
+    async def main():
+        return await asyncio.gather(executor.run(blocking_call), executor.run(blocking_call))
+
+    names = asyncio.run(main())
+    assert len(set(names)) == 2
+    executor.shutdown()
+
+
+def test_shutdown_allows_reuse():
+    executor = BoundedExecutor("test", max_workers=1)
+    asyncio.run(executor.run(lambda: None))
+    executor.shutdown()
+    assert asyncio.run(executor.run(lambda: "again")) == "again"
+    executor.shutdown()
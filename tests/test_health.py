@@ -2,3 +2,15 @@ def test_health_returns_ok(client):
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+
+
+def test_sheets_health_reports_quota_metrics(client, mock_sheets):
+    mock_sheets.quota_metrics.return_value = {"read": {"requests": 3}}
+    response = client.get("/health/sheets")
+    assert response.status_code == 200
+    assert response.json() == {"read": {"requests": 3}}
+
+
+def test_sheets_health_requires_auth(unauthed_client):
+    response = unauthed_client.get("/health/sheets")
+    assert response.status_code == 401
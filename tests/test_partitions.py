@@ -0,0 +1,286 @@
+from datetime import date
+from functools import partial
+from unittest.mock import MagicMock
+
+import pytest
+from gspread.exceptions import WorksheetNotFound
+
+from app.services.call_plan import priority
+from app.services.partitions import (
+    Partition,
+    PartitionManifest,
+    archive_partition,
+    month_partition,
+)
+from tests.conftest import CALL_LOG_HEADERS, CONTACT_HEADERS, make_contact_row
+
+
+def _log_row(log_id, timestamp, disposition="Connected"):
+    return [log_id, "uuid-1", "", timestamp, "60", disposition, "", "", "New", ""]
+
+
+class FakeWorksheet:
+    """Just enough of a gspread Worksheet, backed by a list of rows."""
+
+    def __init__(self, rows=None):
+        self.rows = [list(map(str, row)) for row in rows or []]
+        self.get_all_values = MagicMock(side_effect=lambda: [list(row) for row in self.rows])
+
+    def append_row(self, row):
+        self.rows.append(list(map(str, row)))
+
+    def append_rows(self, rows):
+        self.rows.extend(list(map(str, row)) for row in rows)
+
+    def update(self, values, range_name):
+        assert range_name == "A1"
+        self.rows[:len(values)] = [list(map(str, row)) for row in values]
+
+    def batch_clear(self, ranges):
+        (cleared,) = ranges
+        del self.rows[int(cleared[1:cleared.index(":")]) - 1:]
+
+
+class FakeSpreadsheet:
+    def __init__(self, sheets):
+        self.sheets = sheets
+
+    def worksheet(self, title):
+        if title not in self.sheets:
+            raise WorksheetNotFound(title)
+        return self.sheets[title]
+
+    def add_worksheet(self, title, rows, cols):
+        assert title not in self.sheets
+        self.sheets[title] = FakeWorksheet()
+        return self.sheets[title]
+
+    def del_worksheet(self, worksheet):
+        title = next(t for t, ws in self.sheets.items() if ws is worksheet)
+        del self.sheets[title]
+
+
+@pytest.fixture
+def spreadsheet():
+    return FakeSpreadsheet({
+        "Contacts": FakeWorksheet([CONTACT_HEADERS]),
+        "CallLogs": FakeWorksheet([
+            CALL_LOG_HEADERS,
+            _log_row("log-1", "2026-01-10T10:00:00"),
+            _log_row("log-2", "2026-02-10T10:00:00"),
+            _log_row("log-3", "2026-02-11T10:00:00", "NoAnswer"),
+            _log_row("log-4", "2026-04-01T10:00:00"),
+        ]),
+    })
+
+
+@pytest.fixture
+def make_service(make_sheets_service, spreadsheet):
+    return partial(make_sheets_service, spreadsheet, partitioned=True)
+
+
+def test_manifest_routes_days_to_partitions():
+    manifest = PartitionManifest([month_partition("2026-02"), month_partition("2026-01")])
+    assert [p.title for p in manifest.partitions] == ["CallLogs 2026-01", "CallLogs 2026-02"]
+    assert manifest.route("2026-02-28").title == "CallLogs 2026-02"
+    assert manifest.route("2026-03-01") is None
+    assert [p.title for p in manifest.covering("2026-01-31", "2026-02-01")] == [
+        "CallLogs 2026-01", "CallLogs 2026-02",
+    ]
+    assert manifest.covering("2026-03-01", "2026-03-31") == []
+
+
+def test_manifest_drops_months_already_archived():
+    archive = archive_partition("2026", "2026-01-01", "2026-01-31")
+    rows = [
+        ["title", "first_day", "last_day"],
+        ["CallLogs 2026", "2026-01-01", "2026-01-31"],
+        ["CallLogs 2026-02", "2026-02-01", "2026-02-28"],
+        # Left over from an interrupted rewrite.
+        ["CallLogs 2026-01", "2026-01-01", "2026-01-31"],
+        ["CallLogs 2026-02", "2026-02-01", "2026-02-28"],
+    ]
+    manifest = PartitionManifest.from_rows(rows)
+    assert manifest.partitions == [archive, month_partition("2026-02")]
+    assert manifest.rows() == rows[:3]
+    assert not archive.is_month
+    assert Partition("CallLogs", "", "\U0010ffff").is_month is False
+
+
+def test_legacy_sheet_split_into_months(make_service, spreadsheet):
+    make_service()
+    assert sorted(spreadsheet.sheets) == [
+        "CallLogPartitions", "CallLogs", "CallLogs 2026-01", "CallLogs 2026-02",
+        "CallLogs 2026-04", "Contacts",
+    ]
+    assert [row[0] for row in spreadsheet.sheets["CallLogs 2026-02"].rows] == [
+        "id", "log-2", "log-3",
+    ]
+    assert spreadsheet.sheets["CallLogPartitions"].rows[1] == [
+        "CallLogs 2026-01", "2026-01-01", "2026-01-31",
+    ]
+
+    # The next start reads the manifest instead of migrating again.
+    spreadsheet.sheets["CallLogs"].rows.append(_log_row("log-5", "2026-05-01T10:00:00"))
+    make_service()
+    assert "CallLogs 2026-05" not in spreadsheet.sheets
+
+
+def test_date_queries_read_only_their_partitions(make_service, spreadsheet):
+    service = make_service()
+    logs = service.get_call_logs_by_date("2026-02-10")
+    assert [log["id"] for log in logs] == ["log-2"]
+    series = service.get_call_series(date(2026, 2, 1), date(2026, 2, 28), "week")
+    assert sum(point["calls"] for point in series) == 2
+
+    spreadsheet.sheets["CallLogs 2026-02"].get_all_values.assert_called_once()
+    spreadsheet.sheets["CallLogs 2026-01"].get_all_values.assert_not_called()
+    spreadsheet.sheets["CallLogs 2026-04"].get_all_values.assert_not_called()
+
+    # Full-history reads load the rest.
+    assert {log["id"] for log in service.get_all_call_logs()} == {
+        "log-1", "log-2", "log-3", "log-4",
+    }
+    assert [log["id"] for log in service.get_call_logs_by_date("2026-02-10")] == ["log-2"]
+    spreadsheet.sheets["CallLogs 2026-02"].get_all_values.assert_called_once()
+
+
+def test_streak_reaches_into_older_partition(make_service, spreadsheet):
+    service = make_service()
+    service.append_call_logs([
+        {"contact_id": "uuid-1", "timestamp": "2026-03-31T10:00:00",
+         "duration_seconds": 30, "disposition": "Connected"},
+        {"contact_id": "uuid-1", "timestamp": "2026-04-02T10:00:00",
+         "duration_seconds": 30, "disposition": "Connected"},
+    ])
+    activity = service.get_call_activity(date(2026, 4, 2))
+    assert activity == {"calls": 1, "connected": 1, "streak": 3}
+
+
+def test_append_creates_partition_for_new_month(make_service, spreadsheet):
+    service = make_service()
+    record = service.append_call_log({
+        "contact_id": "uuid-1", "timestamp": "2026-05-03T10:00:00",
+        "duration_seconds": 30, "disposition": "Connected",
+    })
+    sheet = spreadsheet.sheets["CallLogs 2026-05"]
+    assert [row[0] for row in sheet.rows] == ["id", record["id"]]
+    assert spreadsheet.sheets["CallLogPartitions"].rows[-1] == [
+        "CallLogs 2026-05", "2026-05-01", "2026-05-31",
+    ]
+    assert [log["id"] for log in service.get_call_logs_by_date("2026-05-03")] == [record["id"]]
+    sheet.get_all_values.assert_not_called()
+
+
+def test_archive_compacts_old_months_by_year(make_service, spreadsheet):
+    service = make_service()
+    service.get_all_call_logs()
+
+    archived = service.archive_call_logs(today=date(2026, 6, 15))
+    assert archived == ["CallLogs 2026-01", "CallLogs 2026-02"]
+    assert "CallLogs 2026-01" not in spreadsheet.sheets
+    assert "CallLogs 2026-02" not in spreadsheet.sheets
+    assert [row[0] for row in spreadsheet.sheets["CallLogs 2026"].rows] == [
+        "id", "log-1", "log-2", "log-3",
+    ]
+    assert spreadsheet.sheets["CallLogPartitions"].rows == [
+        ["title", "first_day", "last_day"],
+        ["CallLogs 2026", "2026-01-01", "2026-02-28"],
+        ["CallLogs 2026-04", "2026-04-01", "2026-04-30"],
+    ]
+
+    # Cached rows move to the archive without another download.
+    assert [log["id"] for log in service.get_call_logs_by_date("2026-02-11")] == ["log-3"]
+    spreadsheet.sheets["CallLogs 2026"].get_all_values.assert_not_called()
+
+    # Backdated logs land in the archive; later runs extend it.
+    service.append_call_log({
+        "contact_id": "uuid-1", "timestamp": "2026-02-20T10:00:00",
+        "duration_seconds": 30, "disposition": "Connected",
+    })
+    assert len(spreadsheet.sheets["CallLogs 2026"].rows) == 5
+    assert service.archive_call_logs(today=date(2026, 8, 1)) == ["CallLogs 2026-04"]
+    assert spreadsheet.sheets["CallLogPartitions"].rows == [
+        ["title", "first_day", "last_day"],
+        ["CallLogs 2026", "2026-01-01", "2026-04-30"],
+    ]
+
+    restarted = make_service()
+    assert len(restarted.get_all_call_logs()) == 5
+
+
+def test_services_sharing_a_spreadsheet_adopt_each_others_partitions(make_service, spreadsheet):
+    first, second = make_service(), make_service()
+    log = {"contact_id": "uuid-1", "duration_seconds": 30, "disposition": "Connected"}
+    a = first.append_call_log({**log, "timestamp": "2026-05-03T10:00:00"})
+    b = second.append_call_log({**log, "timestamp": "2026-05-04T10:00:00"})
+    assert [row[0] for row in spreadsheet.sheets["CallLogs 2026-05"].rows] == [
+        "id", a["id"], b["id"],
+    ]
+    titles = [row[0] for row in spreadsheet.sheets["CallLogPartitions"].rows]
+    assert titles.count("CallLogs 2026-05") == 1
+    assert [entry["id"] for entry in second.get_call_logs_by_date("2026-05-03")] == [a["id"]]
+
+    # The second service still lists the months the first one archives.
+    second.get_all_call_logs()
+    assert first.archive_call_logs(today=date(2026, 6, 15)) == [
+        "CallLogs 2026-01", "CallLogs 2026-02",
+    ]
+    assert second.archive_call_logs(today=date(2026, 6, 15)) == []
+    assert "CallLogs 2026-04" in [row[0] for row in spreadsheet.sheets["CallLogPartitions"].rows]
+    assert len(second.get_all_call_logs()) == 6
+
+
+def test_archive_adopts_worksheet_left_by_interrupted_run(make_service, spreadsheet):
+    service = make_service()
+    spreadsheet.sheets["CallLogs 2026"] = FakeWorksheet([
+        CALL_LOG_HEADERS, _log_row("log-1", "2026-01-10T10:00:00"),
+    ])
+    service.archive_call_logs(today=date(2026, 6, 15))
+    assert [row[0] for row in spreadsheet.sheets["CallLogs 2026"].rows] == [
+        "id", "log-1", "log-2", "log-3",
+    ]
+    assert len(service.get_all_call_logs()) == 4
+
+
+def test_call_plan_reads_only_recent_partitions(make_service, spreadsheet):
+    spreadsheet.sheets["Contacts"].rows.append(
+        make_contact_row(deal_stage="Contacted", call_count="1", next_follow_up="2026-04-01")
+    )
+    service = make_service()
+    service._recent_day = lambda: "2026-03-01"
+
+    _, plan = service.get_call_plan()
+    # The April call was Connected; older months are never read.
+    reason, score, contact = plan[0]
+    assert score == priority(contact, reason, date.today(), "Connected")
+    spreadsheet.sheets["CallLogs 2026-04"].get_all_values.assert_called_once()
+    spreadsheet.sheets["CallLogs 2026-01"].get_all_values.assert_not_called()
+    spreadsheet.sheets["CallLogs 2026-02"].get_all_values.assert_not_called()
+
+
+def test_cold_partitions_not_reloaded_on_expiry(make_service, spreadsheet):
+    service = make_service()
+    service._recent_day = lambda: "2026-03-01"
+    service.get_all_call_logs()
+    service._cache_ttl = 0
+    assert len(service.get_all_call_logs()) == 4
+    spreadsheet.sheets["CallLogs 2026-01"].get_all_values.assert_called_once()
+    spreadsheet.sheets["CallLogs 2026-02"].get_all_values.assert_called_once()
+    assert spreadsheet.sheets["CallLogs 2026-04"].get_all_values.call_count == 2
+
+
+def test_write_behind_defers_partition_creation(make_service, spreadsheet):
+    service = make_service(write_behind=True)
+    record = service.append_call_log({
+        "contact_id": "uuid-1", "timestamp": "2026-05-03T10:00:00",
+        "duration_seconds": 30, "disposition": "Connected",
+    })
+    assert "CallLogs 2026-05" not in spreadsheet.sheets
+    assert [log["id"] for log in service.get_call_logs_by_date("2026-05-03")] == [record["id"]]
+    service.invalidate_cache()
+    assert [log["id"] for log in service.get_call_logs_by_date("2026-05-03")] == [record["id"]]
+
+    service.flush()
+    assert [row[0] for row in spreadsheet.sheets["CallLogs 2026-05"].rows] == ["id", record["id"]]
+    assert [log["id"] for log in service.get_call_logs_by_date("2026-05-03")] == [record["id"]]
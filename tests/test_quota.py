@@ -0,0 +1,142 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from gspread.exceptions import APIError
+
+from app.services.quota import (
+    BACKGROUND,
+    INTERACTIVE,
+    QuotaHTTPClient,
+    QuotaLimiter,
+    TokenBucket,
+    background_priority,
+)
+
+
+def _api_error(code):
+    response = MagicMock()
+    response.json.return_value = {"error": {"code": code, "message": "", "status": ""}}
+    return APIError(response)
+
+
+def test_token_bucket_paces_after_burst():
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    assert bucket.take() == 0
+    assert bucket.take() == 0
+    assert 0 < bucket.take() <= 1.0
+
+
+def test_limiter_burst_stays_within_quota():
+    limiter = QuotaLimiter(read_per_minute=60, write_per_minute=60)
+    for _ in range(6):
+        assert limiter.acquire("read") < 0.01
+    metrics = limiter.metrics()
+    assert metrics["read"]["requests"] == 6
+    assert metrics["read"]["queued"] == 0
+    assert metrics["write"]["requests"] == 0
+
+
+def test_interactive_requests_overtake_background():
+    limiter = QuotaLimiter(read_per_minute=60, write_per_minute=60)
+    limiter._buckets["read"] = TokenBucket(rate=4.0, capacity=1)
+    limiter.acquire("read")  # drain the bucket
+    order = []
+
+    def worker(priority, name):
+        limiter.acquire("read", priority)
+        order.append(name)
+
+    background = threading.Thread(target=worker, args=(BACKGROUND, "background"))
+    background.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=worker, args=(INTERACTIVE, "interactive"))
+    interactive.start()
+    background.join(timeout=5)
+    interactive.join(timeout=5)
+
+    assert order == ["interactive", "background"]
+    metrics = limiter.metrics()["read"]
+    assert metrics["queued"] == 2
+    assert metrics["wait_seconds_max"] > 0.2
+    assert metrics["queue_depth"] == 0
+
+
+@pytest.fixture
+def http_client():
+    limiter = QuotaLimiter(read_per_minute=600, write_per_minute=600)
+    return QuotaHTTPClient(MagicMock(), session=MagicMock(), limiter=limiter, max_retries=2)
+
+
+def test_retries_quota_errors_with_jittered_backoff(http_client):
+    ok = MagicMock()
+    with patch("gspread.http_client.HTTPClient.request",
+               side_effect=[_api_error(429), _api_error(503), ok]) as request, \
+         patch("app.services.quota.time.sleep") as sleep, \
+         patch("app.services.quota.random.uniform", side_effect=lambda lo, hi: hi) as uniform:
+        assert http_client.request("get", "https://sheets") is ok
+
+    assert request.call_count == 3
+    assert [c.args for c in uniform.call_args_list] == [(0, 1.0), (0, 2.0)]
+    assert [c.args[0] for c in sleep.call_args_list] == [1.0, 2.0]
+    assert http_client.limiter.metrics()["read"]["retries"] == 2
+
+
+def test_gives_up_after_max_retries(http_client):
+    with patch("gspread.http_client.HTTPClient.request", side_effect=_api_error(429)) as request, \
+         patch("app.services.quota.time.sleep"):
+        with pytest.raises(APIError):
+            http_client.request("post", "https://sheets")
+    assert request.call_count == 3
+    assert http_client.limiter.metrics()["write"]["requests"] == 3
+
+
+def test_client_errors_are_not_retried(http_client):
+    with patch("gspread.http_client.HTTPClient.request", side_effect=_api_error(400)) as request:
+        with pytest.raises(APIError):
+            http_client.request("post", "https://sheets")
+    request.assert_called_once()
+
+
+def test_append_not_resent_after_server_error(http_client):
+    url = "https://sheets.googleapis.com/v4/spreadsheets/id/values/CallLogs:append"
+    with patch("gspread.http_client.HTTPClient.request", side_effect=_api_error(503)) as request:
+        with pytest.raises(APIError):
+            http_client.request("post", url, params={}, json={"values": [["log-1"]]})
+    request.assert_called_once()
+
+    # A 429 was rejected before it was applied, so it is still retried.
+    ok = MagicMock()
+    with patch("gspread.http_client.HTTPClient.request",
+               side_effect=[_api_error(429), ok]) as request, \
+         patch("app.services.quota.time.sleep"):
+        assert http_client.request("post", url, params={}, json={}) is ok
+    assert request.call_count == 2
+
+
+def test_batch_update_retried_only_when_idempotent(http_client):
+    url = "https://sheets.googleapis.com/v4/spreadsheets/id:batchUpdate"
+    update = {"requests": [{"updateCells": {"rows": [], "fields": "userEnteredValue"}}]}
+    delete = {"requests": [{"deleteDimension": {"range": {"sheetId": 0}}}]}
+    ok = MagicMock()
+    with patch("gspread.http_client.HTTPClient.request",
+               side_effect=[_api_error(503), ok]) as request, \
+         patch("app.services.quota.time.sleep"):
+        assert http_client.request("post", url, json=update) is ok
+    assert request.call_count == 2
+
+    with patch("gspread.http_client.HTTPClient.request", side_effect=_api_error(503)) as request:
+        with pytest.raises(APIError):
+            http_client.request("post", url, json=delete)
+    request.assert_called_once()
+
+
+def test_background_priority_is_scoped(http_client):
+    seen = []
+    http_client.limiter.acquire = lambda kind, priority: seen.append(priority)
+    with patch("gspread.http_client.HTTPClient.request"):
+        with background_priority():
+            http_client.request("get", "https://sheets")
+        http_client.request("get", "https://sheets")
+    assert seen == [BACKGROUND, INTERACTIVE]
@@ -0,0 +1,84 @@
+from app.services.search import SearchIndex, tokenize
+
+
+def _contact(contact_id, **fields):
+    return {"id": contact_id, **fields}
+
+
+def test_tokenize():
+    assert tokenize("Sharma Textiles, Pune — 2nd call") == [
+        "sharma", "textiles", "pune", "2nd", "call",
+    ]
+    assert tokenize(None) == []
+
+
+def test_prefix_match_on_every_word():
+    index = SearchIndex()
+    index.set_contact("uuid-1", _contact("uuid-1", name="Sharma Textiles"))
+    index.set_contact("uuid-2", _contact("uuid-2", name="Sharma Pharma"))
+    assert set(index.search("sha", 10)) == {"uuid-1", "uuid-2"}
+    assert index.search("sharma text", 10) == ["uuid-1"]
+    assert index.search("sharma steel", 10) == []
+    assert index.search("   ", 10) == []
+
+
+def test_ranking_prefers_name_and_exact_words():
+    index = SearchIndex()
+    index.set_contact("uuid-1", _contact("uuid-1", name="Acme", notes="met at expo"))
+    index.set_contact("uuid-2", _contact("uuid-2", name="Expo Traders"))
+    index.set_contact("uuid-3", _contact("uuid-3", name="Exporters Guild"))
+    assert index.search("expo", 10) == ["uuid-2", "uuid-3", "uuid-1"]
+    assert index.search("expo", 1) == ["uuid-2"]
+
+
+def test_call_log_summaries_are_searchable():
+    index = SearchIndex()
+    index.set_contact("uuid-1", _contact("uuid-1", name="Acme"))
+    index.add_call_log({"contact_id": "uuid-1", "summary": "Wants a quotation for 500 units"})
+    index.add_call_log({"contact_id": "uuid-9", "summary": "quotation sent"})  # no such contact
+    assert index.search("quot", 10) == ["uuid-1"]
+
+    index.clear_call_logs()
+    assert index.search("quot", 10) == []
+
+
+def test_updates_and_deletes_replace_terms():
+    index = SearchIndex()
+    index.set_contact("uuid-1", _contact("uuid-1", name="Acme", notes="call back Monday"))
+    index.set_contact("uuid-1", _contact("uuid-1", name="Acme", notes="call back Friday"))
+    assert index.search("monday", 10) == []
+    assert index.search("friday", 10) == ["uuid-1"]
+
+    index.set_contact("uuid-1", None)
+    assert index.search("acme", 10) == []
+    assert index._terms == []
+
+
+def test_vocabulary_sorted_lazily():
+    index = SearchIndex()
+    for i in range(100):
+        index.set_contact(f"uuid-{i}", _contact(f"uuid-{i}", name=f"Lead{i:03d}"))
+    # Bulk loads only touch the postings; the first search sorts once.
+    assert index._terms == []
+    assert len(index.search("lead", 200)) == 100
+    assert len(index._terms) == 100
+
+    # Dropped terms are skipped until the next re-sort, and re-added
+    # ones are not listed twice.
+    index.set_contact("uuid-5", None)
+    index.set_contact("uuid-6", _contact("uuid-6", name="Lead005"))
+    index.set_contact("uuid-7", _contact("uuid-7", name="Zeta"))
+    assert index.search("lead005", 10) == ["uuid-6"]
+    assert index.search("lead007", 10) == []
+    assert index.search("zet", 10) == ["uuid-7"]
+    assert index._terms.count("lead005") == 1
+
+
+def test_short_prefix_matches_every_term():
+    index = SearchIndex()
+    for i in range(100):
+        index.set_contact(f"uuid-{i}", _contact(f"uuid-{i}", name=f"Sa{i:03d}"))
+    index.set_contact("uuid-smith", _contact("uuid-smith", name="Smith"))
+    assert len(index.search("sa", 100)) == 100
+    assert "uuid-smith" in index.search("s", 200)
+    assert index.search("s smi", 10) == ["uuid-smith"]
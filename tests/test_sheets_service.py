@@ -1,67 +1,32 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-CONTACT_HEADERS = [
-    "id", "name", "contact_person", "phone", "city", "industry",
-    "source", "deal_stage", "last_called", "next_follow_up", "call_count",
-    "last_call_summary", "recording_link", "notes",
-]
-
-CALL_LOG_HEADERS = [
-    "id", "contact_id", "contact_name", "timestamp", "duration_seconds",
-    "disposition", "summary", "recording_url", "deal_stage", "deal_stage_after",
-]
-
-
-def _make_contact_row(**overrides):
-    defaults = dict(zip(CONTACT_HEADERS, [
-        "uuid-1", "Alice", "", "123", "", "",
-        "", "New", "", "", "0", "", "", "",
-    ]))
-    defaults.update(overrides)
-    return [str(defaults[h]) for h in CONTACT_HEADERS]
-
-
-def _make_call_log_row(**overrides):
-    defaults = dict(zip(CALL_LOG_HEADERS, [
-        "log-1", "uuid-1", "", "2026-02-23T10:00:00", "120",
-        "Connected", "", "", "New", "",
-    ]))
-    defaults.update(overrides)
-    return [str(defaults[h]) for h in CALL_LOG_HEADERS]
+from tests.conftest import (
+    CALL_LOG_HEADERS,
+    CONTACT_HEADERS,
+    make_call_log_row,
+    make_contact_row,
+    mock_spreadsheet,
+)
 
 
 @pytest.fixture
-def sheets_service():
-    with patch("app.services.sheets.gspread") as mock_gspread, \
-         patch("app.services.sheets.settings") as mock_settings:
-        mock_settings.google_service_account_json = '{"type": "service_account"}'
-        mock_settings.spreadsheet_id = "test-sheet-id"
-
-        mock_client = MagicMock()
-        mock_gspread.service_account_from_dict.return_value = mock_client
-        mock_spreadsheet = MagicMock()
-        mock_client.open_by_key.return_value = mock_spreadsheet
-
-        contacts_ws = MagicMock()
-        call_logs_ws = MagicMock()
-        mock_spreadsheet.worksheet.side_effect = lambda name: {
-            "Contacts": contacts_ws,
-            "CallLogs": call_logs_ws,
-        }[name]
-
-        from app.services.sheets import SheetsService
-        service = SheetsService()
-
-        yield service, contacts_ws, call_logs_ws
+def sheets_service(make_sheets_service):
+    contacts_ws = MagicMock()
+    call_logs_ws = MagicMock()
+    service = make_sheets_service(mock_spreadsheet(contacts_ws, call_logs_ws))
+    return service, contacts_ws, call_logs_ws
 
 
 def test_get_all_contacts(sheets_service):
     service, contacts_ws, _ = sheets_service
     contacts_ws.get_all_values.return_value = [
         CONTACT_HEADERS,
-        _make_contact_row(call_count="5", source="IndiaMart"),
+        make_contact_row(call_count="5", source="IndiaMart"),
     ]
     result = service.get_all_contacts()
     assert len(result) == 1
@@ -82,8 +47,8 @@ def test_get_contact_by_id_found(sheets_service):
     service, contacts_ws, _ = sheets_service
     contacts_ws.get_all_values.return_value = [
         CONTACT_HEADERS,
-        _make_contact_row(id="uuid-1"),
-        _make_contact_row(id="uuid-2", name="Bob"),
+        make_contact_row(id="uuid-1"),
+        make_contact_row(id="uuid-2", name="Bob"),
     ]
     result = service.get_contact_by_id("uuid-2")
     assert result is not None
@@ -94,7 +59,7 @@ def test_get_contact_by_id_not_found(sheets_service):
     service, contacts_ws, _ = sheets_service
     contacts_ws.get_all_values.return_value = [
         CONTACT_HEADERS,
-        _make_contact_row(id="uuid-1"),
+        make_contact_row(id="uuid-1"),
     ]
     result = service.get_contact_by_id("nonexistent")
     assert result is None
@@ -127,18 +92,180 @@ def test_create_contact_sets_defaults(sheets_service):
     assert result["call_count"] == 0
 
 
+def test_create_contacts_single_append(sheets_service):
+    service, contacts_ws, _ = sheets_service
+    contacts_ws.get_all_values.return_value = [CONTACT_HEADERS]
+    service.get_all_contacts()
+    result = service.create_contacts([
+        {"name": "Carol", "phone": "789"},
+        {"name": "Dan", "phone": "000", "deal_stage": "Qualified"},
+    ])
+
+    contacts_ws.append_rows.assert_called_once()
+    rows = contacts_ws.append_rows.call_args[0][0]
+    assert [r[1] for r in rows] == ["Carol", "Dan"]
+    assert result[1]["deal_stage"] == "Qualified"
+    assert service.get_contact_by_id(result[1]["id"])["name"] == "Dan"
+
+
 def test_update_contact(sheets_service):
     service, contacts_ws, _ = sheets_service
     contacts_ws.get_all_values.return_value = [
         CONTACT_HEADERS,
-        _make_contact_row(id="uuid-1"),
+        make_contact_row(id="uuid-1"),
     ]
-    contacts_ws.row_values.return_value = _make_contact_row(id="uuid-1", name="Alice Updated")
     result = service.update_contact("uuid-1", {"name": "Alice Updated"})
-    contacts_ws.update_cell.assert_called_once_with(2, 2, "Alice Updated")
+    contacts_ws.batch_update.assert_called_once()
+    changes = contacts_ws.batch_update.call_args[0][0]
+    assert changes == [{"range": "B2", "values": [["Alice Updated"]]}]
+    contacts_ws.update_cell.assert_not_called()
+    contacts_ws.row_values.assert_not_called()
     assert result["name"] == "Alice Updated"
 
 
+def test_update_checks_cached_row_still_holds_contact(sheets_service):
+    service, contacts_ws, _ = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1"),
+        make_contact_row(id="uuid-2", name="Bob"),
+    ]
+    service.get_all_contacts()
+    # Sorted in the sheet since the cache was loaded.
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-2", name="Bob"),
+        make_contact_row(id="uuid-1"),
+    ]
+    result = service.update_contact("uuid-1", {"notes": "VIP"})
+    assert contacts_ws.batch_get.call_args[0][0] == ["A2"]
+    assert contacts_ws.batch_update.call_args[0][0] == [{"range": "N3", "values": [["VIP"]]}]
+    assert contacts_ws.get_all_values.call_count == 2
+    assert result["notes"] == "VIP"
+    assert service.get_contact_by_id("uuid-2")["notes"] is None
+
+
+def _build_call(contact):
+    return (
+        {"contact_id": contact["id"], "timestamp": "2026-02-23T10:00:00",
+         "duration_seconds": 60, "disposition": "Connected"},
+        {"call_count": contact["call_count"] + 1, "last_called": "2026-02-23", "notes": None},
+    )
+
+
+def test_record_call_is_one_batch_update(sheets_service):
+    service, contacts_ws, call_logs_ws = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-0"),
+        make_contact_row(id="uuid-1", call_count="4"),
+    ]
+    call_logs_ws.get_all_values.return_value = [CALL_LOG_HEADERS]
+    contacts_ws.id = 0
+    call_logs_ws.id = 7
+    assert service.get_call_logs_for_contact("uuid-1") == []
+    spreadsheet = service._spreadsheet
+
+    call_log, contact = service.record_call("uuid-1", _build_call)
+    assert contact["call_count"] == 5
+    assert contact["last_called"] == "2026-02-23"
+
+    spreadsheet.batch_update.assert_called_once()
+    requests = spreadsheet.batch_update.call_args[0][0]["requests"]
+    assert [r["updateCells"]["range"] for r in requests[:2]] == [
+        {"sheetId": 0, "startRowIndex": 2, "endRowIndex": 3,
+         "startColumnIndex": 10, "endColumnIndex": 11},
+        {"sheetId": 0, "startRowIndex": 2, "endRowIndex": 3,
+         "startColumnIndex": 8, "endColumnIndex": 9},
+    ]
+    assert requests[0]["updateCells"]["rows"] == [
+        {"values": [{"userEnteredValue": {"numberValue": 5}}]},
+    ]
+    # Contact cells are parsed like typed input; the log row is stored raw.
+    assert requests[1]["updateCells"]["rows"] == [
+        {"values": [{"userEnteredValue": {"formulaValue": "2026-02-23"}}]},
+    ]
+    append = requests[2]["appendCells"]
+    assert append["sheetId"] == 7
+    assert append["rows"][0]["values"][0] == {"userEnteredValue": {"stringValue": call_log["id"]}}
+    contacts_ws.batch_update.assert_not_called()
+    call_logs_ws.append_row.assert_not_called()
+    assert contacts_ws.get_all_values.call_count == 1
+
+    # Caches reflect both writes without another read.
+    assert service.get_contact_by_id("uuid-1")["call_count"] == 5
+    assert [log["id"] for log in service.get_call_logs_for_contact("uuid-1")] == [call_log["id"]]
+    assert service.record_call("missing", _build_call) is None
+    spreadsheet.batch_update.assert_called_once()
+
+
+def test_record_calls_count_on_each_other(sheets_service):
+    service, contacts_ws, call_logs_ws = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1", call_count="4"),
+    ]
+    call_logs_ws.get_all_values.return_value = [CALL_LOG_HEADERS]
+    contacts_ws.id = 0
+    call_logs_ws.id = 7
+    spreadsheet = service._spreadsheet
+
+    results = service.record_calls([
+        ("uuid-1", _build_call), ("missing", _build_call), ("uuid-1", _build_call),
+    ])
+    assert [r and r[1]["call_count"] for r in results] == [5, None, 6]
+    spreadsheet.batch_update.assert_called_once()
+    requests = spreadsheet.batch_update.call_args[0][0]["requests"]
+    # One write per changed cell, holding the last value.
+    assert [r["updateCells"]["rows"] for r in requests[:2]] == [
+        [{"values": [{"userEnteredValue": {"numberValue": 6}}]}],
+        [{"values": [{"userEnteredValue": {"formulaValue": "2026-02-23"}}]}],
+    ]
+    assert len(requests[2]["appendCells"]["rows"]) == 2
+    assert service.get_contact_by_id("uuid-1")["call_count"] == 6
+
+
+def test_update_contact_batches_fields(sheets_service):
+    service, contacts_ws, _ = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1", next_follow_up="2026-03-01", city="Pune"),
+    ]
+    result = service.update_contact("uuid-1", {
+        "call_count": 3,
+        "last_called": "2026-02-23",
+        "next_follow_up": "",
+        "notes": None,
+    })
+    contacts_ws.batch_update.assert_called_once()
+    ranges = [c["range"] for c in contacts_ws.batch_update.call_args[0][0]]
+    assert ranges == ["K2", "I2", "J2"]
+    assert result["call_count"] == 3
+    assert result["last_called"] == "2026-02-23"
+    assert result["next_follow_up"] is None
+    assert result["city"] == "Pune"
+    assert service.get_contact_by_id("uuid-1")["call_count"] == 3
+
+
+def test_update_contacts_single_batch(sheets_service):
+    service, contacts_ws, _ = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1"),
+        make_contact_row(id="uuid-2", name="Bob"),
+    ]
+    result = service.update_contacts({
+        "uuid-1": {"call_count": 1},
+        "uuid-2": {"call_count": 4, "notes": "VIP"},
+        "missing": {"call_count": 1},
+    })
+    contacts_ws.batch_update.assert_called_once()
+    ranges = [c["range"] for c in contacts_ws.batch_update.call_args[0][0]]
+    assert ranges == ["K2", "K3", "N3"]
+    assert set(result) == {"uuid-1", "uuid-2"}
+    assert result["uuid-2"]["notes"] == "VIP"
+
+
 def test_update_contact_not_found(sheets_service):
     service, contacts_ws, _ = sheets_service
     contacts_ws.get_all_values.return_value = [CONTACT_HEADERS]
@@ -150,8 +277,9 @@ def test_delete_contact(sheets_service):
     service, contacts_ws, _ = sheets_service
     contacts_ws.get_all_values.return_value = [
         CONTACT_HEADERS,
-        _make_contact_row(id="uuid-1"),
+        make_contact_row(id="uuid-1"),
     ]
+    contacts_ws.cell.return_value.value = "uuid-1"
     service.delete_contact("uuid-1")
     contacts_ws.delete_rows.assert_called_once_with(2)
 
@@ -184,26 +312,565 @@ def test_append_call_log(sheets_service):
     assert result["id"] is not None  # UUID generated
 
 
+def test_append_call_logs_single_append(sheets_service):
+    service, _, call_logs_ws = sheets_service
+    result = service.append_call_logs([
+        {"contact_id": "uuid-1", "duration_seconds": 10, "disposition": "NoAnswer"},
+        {"contact_id": "uuid-2", "duration_seconds": 90, "disposition": "Connected"},
+    ])
+    call_logs_ws.append_rows.assert_called_once()
+    rows = call_logs_ws.append_rows.call_args[0][0]
+    assert [r[1] for r in rows] == ["uuid-1", "uuid-2"]
+    assert len({r["id"] for r in result}) == 2
+
+
 def test_get_call_logs_for_contact(sheets_service):
     service, _, call_logs_ws = sheets_service
     call_logs_ws.get_all_values.return_value = [
         CALL_LOG_HEADERS,
-        _make_call_log_row(contact_id="uuid-1"),
-        _make_call_log_row(id="log-2", contact_id="uuid-2"),
-        _make_call_log_row(id="log-3", contact_id="uuid-1"),
+        make_call_log_row(contact_id="uuid-1"),
+        make_call_log_row(id="log-2", contact_id="uuid-2"),
+        make_call_log_row(id="log-3", contact_id="uuid-1"),
     ]
     result = service.get_call_logs_for_contact("uuid-1")
     assert len(result) == 2
     assert all(r["contact_id"] == "uuid-1" for r in result)
 
 
+def test_get_call_history_newest_first(sheets_service):
+    service, _, call_logs_ws = sheets_service
+    call_logs_ws.get_all_values.return_value = [
+        CALL_LOG_HEADERS,
+        make_call_log_row(id="log-1", timestamp="2026-02-21T10:00:00"),
+        make_call_log_row(id="log-2", contact_id="uuid-2"),
+        make_call_log_row(id="log-3", timestamp="2026-02-23T10:00:00"),
+        make_call_log_row(id="log-4", timestamp="2026-02-22T10:00:00"),
+    ]
+    total, page = service.get_call_history("uuid-1", limit=2)
+    assert total == 3
+    assert [log["id"] for log in page] == ["log-3", "log-4"]
+
+    service.append_call_log({
+        "contact_id": "uuid-1", "timestamp": "2026-02-24T10:00:00",
+        "duration_seconds": 30, "disposition": "Connected",
+    })
+    total, page = service.get_call_history("uuid-1", limit=2, offset=2)
+    assert total == 4
+    assert [log["id"] for log in page] == ["log-4", "log-1"]
+    assert service.get_call_history("uuid-3") == (0, [])
+    call_logs_ws.get_all_values.assert_called_once()
+
+
 def test_get_call_logs_by_date(sheets_service):
     service, _, call_logs_ws = sheets_service
     call_logs_ws.get_all_values.return_value = [
         CALL_LOG_HEADERS,
-        _make_call_log_row(timestamp="2026-02-23T10:00:00"),
-        _make_call_log_row(id="log-2", timestamp="2026-02-22T15:00:00"),
-        _make_call_log_row(id="log-3", timestamp="2026-02-23T14:30:00"),
+        make_call_log_row(timestamp="2026-02-23T10:00:00"),
+        make_call_log_row(id="log-2", timestamp="2026-02-22T15:00:00"),
+        make_call_log_row(id="log-3", timestamp="2026-02-23T14:30:00"),
     ]
     result = service.get_call_logs_by_date("2026-02-23")
     assert len(result) == 2
+
+
+def test_get_call_logs_by_date_unordered_rows(sheets_service):
+    service, _, call_logs_ws = sheets_service
+    call_logs_ws.get_all_values.return_value = [
+        CALL_LOG_HEADERS,
+        make_call_log_row(timestamp="2026-02-23T10:00:00"),
+        make_call_log_row(id="log-2", timestamp="2026-02-21T15:00:00"),
+        make_call_log_row(id="log-3", timestamp="2026-02-22T08:00:00"),
+    ]
+    result = service.get_call_logs_by_date("2026-02-22")
+    assert [r["id"] for r in result] == ["log-3"]
+
+
+def test_append_call_log_updates_index(sheets_service):
+    service, _, call_logs_ws = sheets_service
+    call_logs_ws.get_all_values.return_value = [
+        CALL_LOG_HEADERS,
+        make_call_log_row(contact_id="uuid-1", timestamp="2026-02-22T10:00:00"),
+    ]
+    service.get_call_logs_for_contact("uuid-1")
+    created = service.append_call_log({
+        "contact_id": "uuid-1",
+        "duration_seconds": 30,
+        "disposition": "NoAnswer",
+    })
+
+    for_contact = service.get_call_logs_for_contact("uuid-1")
+    assert [r["id"] for r in for_contact] == ["log-1", created["id"]]
+    today = service.get_call_logs_by_date(created["timestamp"][:10])
+    assert [r["id"] for r in today] == [created["id"]]
+    call_logs_ws.get_all_values.assert_called_once()
+
+
+def test_get_call_activity(sheets_service):
+    service, _, call_logs_ws = sheets_service
+    call_logs_ws.get_all_values.return_value = [
+        CALL_LOG_HEADERS,
+        make_call_log_row(timestamp="2026-02-21T10:00:00"),
+        make_call_log_row(id="log-2", timestamp="2026-02-22T15:00:00"),
+        make_call_log_row(id="log-3", timestamp="2026-02-23T09:00:00"),
+        make_call_log_row(id="log-4", timestamp="2026-02-23T10:00:00", disposition="NoAnswer"),
+        make_call_log_row(id="log-5", timestamp="2026-02-19T10:00:00"),
+    ]
+    result = service.get_call_activity(date(2026, 2, 23))
+    assert result == {"calls": 2, "connected": 1, "streak": 3}
+    call_logs_ws.get_all_values.assert_called_once()
+
+
+def test_get_call_activity_no_calls_today(sheets_service):
+    service, _, call_logs_ws = sheets_service
+    call_logs_ws.get_all_values.return_value = [
+        CALL_LOG_HEADERS,
+        make_call_log_row(timestamp="2026-02-22T10:00:00"),
+    ]
+    result = service.get_call_activity(date(2026, 2, 23))
+    assert result == {"calls": 0, "connected": 0, "streak": 0}
+
+
+def test_call_activity_follows_appended_logs(sheets_service):
+    service, _, call_logs_ws = sheets_service
+    call_logs_ws.get_all_values.return_value = [
+        CALL_LOG_HEADERS,
+        make_call_log_row(timestamp="2026-02-22T10:00:00"),
+    ]
+    assert service.get_call_activity(date(2026, 2, 23))["streak"] == 0
+    service.append_call_logs([
+        {"contact_id": "uuid-1", "timestamp": "2026-02-23T11:00:00",
+         "duration_seconds": 30, "disposition": "Connected"},
+        {"contact_id": "uuid-2", "timestamp": "2026-02-23T11:05:00",
+         "duration_seconds": 0, "disposition": "NoAnswer"},
+    ])
+    result = service.get_call_activity(date(2026, 2, 23))
+    assert result == {"calls": 2, "connected": 1, "streak": 2}
+    call_logs_ws.get_all_values.assert_called_once()
+
+
+def test_get_call_series(sheets_service):
+    service, _, call_logs_ws = sheets_service
+    call_logs_ws.get_all_values.return_value = [
+        CALL_LOG_HEADERS,
+        make_call_log_row(id="log-1", timestamp="2026-02-15T10:00:00"),
+        make_call_log_row(id="log-2", timestamp="2026-02-16T10:00:00", duration_seconds="100"),
+        make_call_log_row(id="log-3", timestamp="2026-02-16T11:00:00", duration_seconds="0",
+                           disposition="NoAnswer"),
+        make_call_log_row(id="log-4", timestamp="2026-02-23T09:00:00", duration_seconds="60"),
+        make_call_log_row(id="log-5", timestamp="2026-02-24T09:00:00"),
+    ]
+    daily = service.get_call_series(date(2026, 2, 16), date(2026, 2, 17), "day")
+    assert daily == [
+        {"start": "2026-02-16", "calls": 2, "connected": 1, "connect_rate": 0.5,
+         "avg_duration_seconds": 50.0, "dispositions": {"Connected": 1, "NoAnswer": 1}},
+        {"start": "2026-02-17", "calls": 0, "connected": 0, "connect_rate": 0.0,
+         "avg_duration_seconds": 0.0, "dispositions": {}},
+    ]
+    weekly = service.get_call_series(date(2026, 2, 15), date(2026, 2, 23), "week")
+    assert [(p["start"], p["calls"]) for p in weekly] == [
+        ("2026-02-15", 1), ("2026-02-16", 2), ("2026-02-23", 1),
+    ]
+
+    # Served from the cache until a new call is logged.
+    daily[0]["calls"] = 99
+    assert service.get_call_series(date(2026, 2, 16), date(2026, 2, 17), "day")[0]["calls"] == 2
+    service.append_call_log({
+        "contact_id": "uuid-1", "timestamp": "2026-02-17T12:00:00",
+        "duration_seconds": 30, "disposition": "Callback",
+    })
+    daily = service.get_call_series(date(2026, 2, 16), date(2026, 2, 17), "day")
+    assert daily[1]["dispositions"] == {"Callback": 1}
+    call_logs_ws.get_all_values.assert_called_once()
+
+
+def test_get_all_contacts_served_from_cache(sheets_service):
+    service, contacts_ws, _ = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1"),
+    ]
+    service.get_all_contacts()
+    service.get_contact_by_id("uuid-1")
+    service.get_all_contacts()
+    contacts_ws.get_all_values.assert_called_once()
+
+
+def test_contact_cache_expires(sheets_service):
+    service, contacts_ws, _ = sheets_service
+    service._cache_ttl = 0
+    contacts_ws.get_all_values.return_value = [CONTACT_HEADERS]
+    service.get_all_contacts()
+    service.get_all_contacts()
+    assert contacts_ws.get_all_values.call_count == 2
+
+
+def test_create_contact_updates_cache(sheets_service):
+    service, contacts_ws, _ = sheets_service
+    contacts_ws.get_all_values.return_value = [CONTACT_HEADERS]
+    service.get_all_contacts()
+    created = service.create_contact({"name": "Carol", "phone": "789"})
+    result = service.get_all_contacts()
+    assert [c["id"] for c in result] == [created["id"]]
+    contacts_ws.get_all_values.assert_called_once()
+
+
+def test_delete_contact_updates_cache(sheets_service):
+    service, contacts_ws, _ = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1"),
+        make_contact_row(id="uuid-2", name="Bob"),
+    ]
+    service.get_all_contacts()
+    contacts_ws.cell.return_value.value = "uuid-1"
+    service.delete_contact("uuid-1")
+    assert [c["id"] for c in service.get_all_contacts()] == ["uuid-2"]
+    assert service.get_contact_by_id("uuid-1") is None
+
+
+def test_row_index_shifts_after_delete(sheets_service):
+    service, contacts_ws, _ = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1"),
+        make_contact_row(id="uuid-2", name="Bob"),
+        make_contact_row(id="uuid-3", name="Cat"),
+    ]
+    contacts_ws.cell.return_value.value = "uuid-1"
+    service.delete_contact("uuid-1")
+    assert service._find_contact_row("uuid-3") == 3
+    assert service.get_contact_by_id("uuid-3")["name"] == "Cat"
+    contacts_ws.get_all_values.assert_called_once()
+
+
+def test_row_index_includes_created_contact(sheets_service):
+    service, contacts_ws, _ = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1"),
+    ]
+    service.get_all_contacts()
+    created = service.create_contact({"name": "Carol", "phone": "789"})
+    assert service._find_contact_row(created["id"]) == 3
+    assert service.get_contact_by_id(created["id"])["name"] == "Carol"
+
+
+def test_delete_contact_rechecks_stale_row(sheets_service):
+    service, contacts_ws, _ = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1"),
+        make_contact_row(id="uuid-2", name="Bob"),
+    ]
+    service.get_all_contacts()
+    # Someone inserted a row above uuid-2 directly in the sheet.
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1"),
+        make_contact_row(id="uuid-9", name="Zed"),
+        make_contact_row(id="uuid-2", name="Bob"),
+    ]
+    contacts_ws.cell.return_value.value = "uuid-9"
+    service.delete_contact("uuid-2")
+    contacts_ws.delete_rows.assert_called_once_with(4)
+
+
+def test_cached_contacts_not_mutated_by_callers(sheets_service):
+    service, contacts_ws, _ = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1"),
+    ]
+    service.get_all_contacts()[0]["name"] = "Mallory"
+    assert service.get_contact_by_id("uuid-1")["name"] == "Alice"
+
+
+def _blocking_values(rows, release, started):
+    def get_all_values():
+        started.set()
+        release.wait(timeout=5)
+        return rows
+    return get_all_values
+
+
+def test_concurrent_reads_share_one_download(sheets_service):
+    service, contacts_ws, call_logs_ws = sheets_service
+    release, started = threading.Event(), threading.Event()
+    contacts_ws.get_all_values.side_effect = _blocking_values(
+        [CONTACT_HEADERS, make_contact_row(id="uuid-1")], release, started
+    )
+    call_logs_ws.get_all_values.return_value = [CALL_LOG_HEADERS, make_call_log_row()]
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [pool.submit(service.get_all_contacts)]
+        started.wait(timeout=5)
+        futures += [pool.submit(service.get_all_contacts) for _ in range(4)]
+        # The download does not hold the service lock, so other reads go on.
+        assert len(service.get_call_logs_by_date("2026-02-23")) == 1
+        threading.Event().wait(0.05)
+        release.set()
+        results = [f.result(timeout=5) for f in futures]
+
+    assert all([c["id"] for c in r] == ["uuid-1"] for r in results)
+    contacts_ws.get_all_values.assert_called_once()
+
+
+def test_download_racing_a_write_is_discarded(sheets_service):
+    service, contacts_ws, _ = sheets_service
+    contacts_ws.get_all_values.return_value = [CONTACT_HEADERS, make_contact_row(id="uuid-1")]
+    service.get_all_contacts()
+    service._contacts_loaded_at = -1e9  # expire the TTL
+
+    release, started = threading.Event(), threading.Event()
+    contacts_ws.get_all_values.side_effect = _blocking_values(
+        [CONTACT_HEADERS, make_contact_row(id="uuid-1")], release, started
+    )
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        reader = pool.submit(service.get_all_contacts)
+        started.wait(timeout=5)
+        created = service.create_contact({"name": "Carol", "phone": "789"})
+        contacts_ws.get_all_values.side_effect = None
+        contacts_ws.get_all_values.return_value = [
+            CONTACT_HEADERS,
+            make_contact_row(id="uuid-1"),
+            make_contact_row(id=created["id"], name="Carol", phone="789"),
+        ]
+        release.set()
+        reader.result(timeout=5)
+
+    assert [c["id"] for c in service.get_all_contacts()] == ["uuid-1", created["id"]]
+
+
+def test_find_contacts_intersects_indexes(sheets_service):
+    service, contacts_ws, _ = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1", city="Pune", industry="Textiles"),
+        make_contact_row(id="uuid-2", city="Pune", industry="Pharma"),
+        make_contact_row(id="uuid-3", city="Delhi", industry="Textiles", deal_stage="Won"),
+        make_contact_row(id="uuid-4", city="Pune", industry="Textiles", deal_stage="Lost"),
+    ]
+    assert [c["id"] for c in service.find_contacts(city="Pune", industry="Textiles")] == [
+        "uuid-1", "uuid-4",
+    ]
+    assert [c["id"] for c in service.find_contacts(deal_stage=["Won", "Lost"])] == [
+        "uuid-3", "uuid-4",
+    ]
+    assert [c["id"] for c in service.find_contacts(exclude={"deal_stage": {"Won", "Lost"}})] == [
+        "uuid-1", "uuid-2",
+    ]
+    assert service.find_contacts(city="Mumbai") == []
+    assert service.count_contacts_by("deal_stage") == {"New": 2, "Won": 1, "Lost": 1}
+
+
+def test_field_indexes_follow_writes(sheets_service):
+    service, contacts_ws, _ = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1"),
+        make_contact_row(id="uuid-2", name="Bob"),
+    ]
+    service.get_all_contacts()
+    created = service.create_contact({"name": "Carol", "phone": "789", "city": "Pune"})
+    service.update_contact("uuid-1", {"deal_stage": "Qualified"})
+    contacts_ws.cell.return_value.value = "uuid-2"
+    service.delete_contact("uuid-2")
+
+    assert service.count_contacts_by("deal_stage") == {"New": 1, "Qualified": 1}
+    assert [c["id"] for c in service.find_contacts(city="Pune")] == [created["id"]]
+    assert [c["id"] for c in service.find_contacts(deal_stage="Qualified")] == ["uuid-1"]
+    contacts_ws.get_all_values.assert_called_once()
+
+
+def test_search_contacts_follows_writes(sheets_service):
+    service, contacts_ws, call_logs_ws = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1", name="Sharma Textiles"),
+        make_contact_row(id="uuid-2", name="Bob", notes="Owns a textile mill"),
+    ]
+    call_logs_ws.get_all_values.return_value = [
+        CALL_LOG_HEADERS,
+        make_call_log_row(contact_id="uuid-2", summary="Asked for a brochure"),
+    ]
+    assert [c["id"] for c in service.search_contacts("text")] == ["uuid-1", "uuid-2"]
+    assert [c["id"] for c in service.search_contacts("brochure")] == ["uuid-2"]
+
+    service.update_contact("uuid-1", {"name": "Sharma Steel"})
+    service.append_call_log({
+        "contact_id": "uuid-1", "duration_seconds": 30,
+        "disposition": "Connected", "summary": "Send brochure",
+    })
+    assert [c["id"] for c in service.search_contacts("text")] == ["uuid-2"]
+    assert {c["id"] for c in service.search_contacts("brochure")} == {"uuid-1", "uuid-2"}
+    contacts_ws.get_all_values.assert_called_once()
+
+
+def test_call_plan_follows_writes(sheets_service):
+    service, contacts_ws, _ = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1"),
+        make_contact_row(id="uuid-2", deal_stage="Contacted", call_count="1",
+                          next_follow_up="2026-02-20"),
+        make_contact_row(id="uuid-3", deal_stage="Won"),
+    ]
+    total, plan = service.get_call_plan()
+    assert total == 2
+    assert [(reason, c["id"]) for reason, _, c in plan] == [
+        ("Follow-up due", "uuid-2"), ("New contact", "uuid-1"),
+    ]
+
+    created = service.create_contact({"name": "Carol", "phone": "789"})
+    service.update_contact("uuid-1", {"call_count": 1})
+    service.update_contact("uuid-3", {"deal_stage": "Contacted", "next_follow_up": "2026-02-21"})
+    contacts_ws.cell.return_value.value = "uuid-2"
+    service.delete_contact("uuid-2")
+
+    _, plan = service.get_call_plan()
+    assert [(reason, c["id"]) for reason, _, c in plan] == [
+        ("Follow-up due", "uuid-3"), ("New contact", created["id"]),
+    ]
+    contacts_ws.get_all_values.assert_called_once()
+
+
+def test_call_plan_ranked_by_priority(sheets_service):
+    service, contacts_ws, call_logs_ws = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1"),
+        make_contact_row(id="uuid-2", deal_stage="Contacted", call_count="1",
+                          next_follow_up="2026-02-20"),
+        make_contact_row(id="uuid-3", deal_stage="Contacted", call_count="1",
+                          next_follow_up="2026-02-20"),
+        make_contact_row(id="uuid-4", deal_stage="Negotiation", call_count="1",
+                          next_follow_up="2026-02-20"),
+    ]
+    call_logs_ws.get_all_values.return_value = [
+        CALL_LOG_HEADERS,
+        make_call_log_row(id="log-1", contact_id="uuid-2", timestamp="2026-02-19T10:00:00",
+                           disposition="Callback"),
+        make_call_log_row(id="log-2", contact_id="uuid-2", timestamp="2026-02-18T10:00:00",
+                           disposition="Connected"),
+        make_call_log_row(id="log-3", contact_id="uuid-3", disposition="NoAnswer"),
+    ]
+    total, plan = service.get_call_plan(limit=2)
+    assert total == 4
+    assert [c["id"] for _, _, c in plan] == ["uuid-4", "uuid-2"]
+    _, plan = service.get_call_plan(limit=2, offset=2)
+    assert [c["id"] for _, _, c in plan] == ["uuid-3", "uuid-1"]
+
+
+def test_call_plan_rebuilt_at_day_rollover(sheets_service):
+    service, contacts_ws, _ = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1", deal_stage="Contacted", call_count="1",
+                          next_follow_up="2026-03-02"),
+    ]
+    with patch("app.services.sheets.date") as mock_date:
+        mock_date.today.return_value = date(2026, 3, 1)
+        assert service.get_call_plan() == (0, [])
+        mock_date.today.return_value = date(2026, 3, 2)
+        assert [c["id"] for _, _, c in service.get_call_plan()[1]] == ["uuid-1"]
+    contacts_ws.get_all_values.assert_called_once()
+
+
+def test_get_changes_without_cursor_is_full_snapshot(sheets_service):
+    service, contacts_ws, call_logs_ws = sheets_service
+    contacts_ws.get_all_values.return_value = [CONTACT_HEADERS, make_contact_row(id="uuid-1")]
+    call_logs_ws.get_all_values.return_value = [CALL_LOG_HEADERS, make_call_log_row()]
+    result = service.get_changes(None)
+    assert result["reset"] is True
+    assert [c["id"] for c in result["contacts"]] == ["uuid-1"]
+    assert [log["id"] for log in result["call_logs"]] == ["log-1"]
+
+    # A cursor from another process is not trusted.
+    assert service.get_changes("other.0")["reset"] is True
+
+
+def test_get_changes_returns_only_changes_since_cursor(sheets_service):
+    service, contacts_ws, call_logs_ws = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1"),
+        make_contact_row(id="uuid-2", name="Bob"),
+        make_contact_row(id="uuid-3", name="Cat"),
+    ]
+    call_logs_ws.get_all_values.return_value = [CALL_LOG_HEADERS]
+    cursor = service.get_changes(None)["cursor"]
+
+    created = service.create_contact({"name": "Dan", "phone": "456"})
+    service.update_contact("uuid-1", {"notes": "first"})
+    service.update_contact("uuid-1", {"notes": "second"})
+    contacts_ws.cell.return_value.value = "uuid-2"
+    service.delete_contact("uuid-2")
+    log = service.append_call_log(
+        {"contact_id": "uuid-1", "duration_seconds": 5, "disposition": "NoAnswer"}
+    )
+
+    result = service.get_changes(cursor)
+    assert result["reset"] is False
+    assert [c["id"] for c in result["contacts"]] == [created["id"], "uuid-1"]
+    assert result["contacts"][1]["notes"] == "second"
+    assert result["deleted"] == ["uuid-2"]
+    assert [entry["id"] for entry in result["call_logs"]] == [log["id"]]
+
+    empty = service.get_changes(result["cursor"])
+    assert empty["contacts"] == empty["deleted"] == empty["call_logs"] == []
+    assert empty["cursor"] == result["cursor"]
+
+
+def test_get_changes_picks_up_sheet_edits_on_reload(sheets_service):
+    service, contacts_ws, call_logs_ws = sheets_service
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1"),
+        make_contact_row(id="uuid-2", name="Bob"),
+    ]
+    call_logs_ws.get_all_values.return_value = [CALL_LOG_HEADERS]
+    cursor = service.get_changes(None)["cursor"]
+
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1", name="Alicia"),
+    ]
+    call_logs_ws.get_all_values.return_value = [CALL_LOG_HEADERS, make_call_log_row()]
+    # Expire the TTL.
+    service._contacts_loaded_at = service._partitions_loaded_at["CallLogs"] = -1e9
+
+    result = service.get_changes(cursor)
+    assert [c["name"] for c in result["contacts"]] == ["Alicia"]
+    assert result["deleted"] == ["uuid-2"]
+    assert [log["id"] for log in result["call_logs"]] == ["log-1"]
+
+
+def test_get_changes_expired_cursor_resets(sheets_service):
+    service, contacts_ws, call_logs_ws = sheets_service
+    service._changelog_size = 2
+    contacts_ws.get_all_values.return_value = [CONTACT_HEADERS, make_contact_row(id="uuid-1")]
+    call_logs_ws.get_all_values.return_value = [CALL_LOG_HEADERS]
+    cursor = service.get_changes(None)["cursor"]
+    for i in range(5):
+        service.update_contact("uuid-1", {"notes": str(i)})
+    assert service.get_changes(cursor)["reset"] is True
+
+
+def test_get_sheets_service_reuses_instance():
+    with patch("app.services.sheets.SheetsService") as mock_cls:
+        from app.services import sheets
+
+        sheets.close_sheets_service()
+        first = sheets.get_sheets_service()
+        second = sheets.get_sheets_service()
+        assert first is second
+        mock_cls.assert_called_once()
+
+        sheets.close_sheets_service()
+        first.close.assert_called_once()
+        assert sheets._service is None
+
+
+def test_session_pool_mounted(sheets_service):
+    service, _, _ = sheets_service
+    service._client.http_client.session.mount.assert_called_once()
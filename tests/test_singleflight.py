@@ -0,0 +1,55 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.singleflight import Singleflight
+
+
+def _run_concurrently(flight, fn, callers=5):
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(timeout=5)
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        leader = pool.submit(flight.do, "key", slow)
+        started.wait(timeout=5)
+        followers = [pool.submit(flight.do, "key", fn) for _ in range(callers - 1)]
+        # Give the followers time to join the in-flight call.
+        threading.Event().wait(0.05)
+        release.set()
+        return [leader, *followers]
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = Singleflight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return ["rows"]
+
+    futures = _run_concurrently(flight, fetch)
+    results = [f.result() for f in futures]
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+
+    # Once finished, the next call runs again.
+    flight.do("key", fetch)
+    assert len(calls) == 2
+
+
+def test_exception_is_shared_and_not_cached():
+    flight = Singleflight()
+
+    def fail():
+        raise RuntimeError("quota exceeded")
+
+    for future in _run_concurrently(flight, fail):
+        with pytest.raises(RuntimeError):
+            future.result()
+    assert flight.do("key", lambda: "ok") == "ok"
@@ -0,0 +1,284 @@
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.sheets import SheetsService
+
+
+def _contact(**overrides):
+    contact = {
+        "id": "uuid-1", "name": "Alice", "contact_person": None,
+        "phone": "123", "city": None, "industry": None,
+        "source": None, "deal_stage": "New", "last_called": None,
+        "next_follow_up": None, "call_count": 0,
+        "last_call_summary": None, "recording_link": None,
+        "notes": None,
+    }
+    contact.update(overrides)
+    return contact
+
+
+def _make_service(tmp_path, mirror: bool, changelog_size: int = 10000):
+    with patch("app.services.sqlite_store.settings") as mock_settings:
+        mock_settings.sqlite_path = str(tmp_path / "aicc.db")
+        mock_settings.sheets_mirror = mirror
+        mock_settings.sync_changelog_size = changelog_size
+
+        from app.services.sqlite_store import SQLiteService
+        return SQLiteService()
+
+
+@pytest.fixture
+def sqlite_service(tmp_path):
+    service = _make_service(tmp_path, mirror=False)
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def mirror():
+    # Stand in for the Sheets API while keeping SheetsService's row helpers.
+    methods = {
+        name: MagicMock()
+        for name in (
+            "get_all_contacts", "get_all_call_logs", "create_contacts",
+            "update_contacts", "delete_contact", "append_call_logs", "record_calls", "close",
+        )
+    }
+    methods["get_all_contacts"].return_value = [_contact(call_count=2)]
+    methods["get_all_call_logs"].return_value = []
+    with patch.multiple(SheetsService, __init__=MagicMock(return_value=None), **methods):
+        yield methods
+
+
+def test_create_and_get_contact(sqlite_service):
+    created = sqlite_service.create_contact({"name": "Carol", "phone": "789", "city": "Pune"})
+    assert created["call_count"] == 0
+    assert created["deal_stage"] == "New"
+    assert sqlite_service.get_contact_by_id(created["id"]) == created
+    assert sqlite_service.get_all_contacts() == [created]
+    assert sqlite_service.get_contact_by_id("missing") is None
+
+
+def test_update_contact(sqlite_service):
+    created = sqlite_service.create_contact({
+        "name": "Carol", "phone": "789", "next_follow_up": "2026-03-01",
+    })
+    result = sqlite_service.update_contact(created["id"], {
+        "call_count": 1, "next_follow_up": "", "notes": None,
+    })
+    assert result["call_count"] == 1
+    assert result["next_follow_up"] is None
+    assert sqlite_service.get_contact_by_id(created["id"]) == result
+
+
+def test_update_contact_not_found(sqlite_service):
+    with pytest.raises(ValueError, match="not found"):
+        sqlite_service.update_contact("missing", {"name": "X"})
+
+
+def test_delete_contact(sqlite_service):
+    created = sqlite_service.create_contact({"name": "Carol", "phone": "789"})
+    sqlite_service.delete_contact(created["id"])
+    assert sqlite_service.get_all_contacts() == []
+    with pytest.raises(ValueError, match="not found"):
+        sqlite_service.delete_contact(created["id"])
+
+
+def test_record_call(sqlite_service):
+    created = sqlite_service.create_contact({
+        "name": "Carol", "phone": "789", "next_follow_up": "2026-03-01",
+    })
+    call_log, contact = sqlite_service.record_call(created["id"], lambda c: (
+        {"contact_id": c["id"], "contact_name": c["name"],
+         "duration_seconds": 30, "disposition": "NotInterested"},
+        {"call_count": c["call_count"] + 1, "next_follow_up": ""},
+    ))
+    assert call_log["contact_name"] == "Carol"
+    assert contact["call_count"] == 1
+    assert contact["next_follow_up"] is None
+    assert sqlite_service.get_contact_by_id(created["id"]) == contact
+    assert sqlite_service.get_call_logs_for_contact(created["id"]) == [call_log]
+    assert sqlite_service.record_call("missing", lambda c: ({}, {})) is None
+
+
+def test_call_log_queries(sqlite_service):
+    for contact_id, ts, disposition in [
+        ("uuid-1", "2026-02-21T10:00:00", "Connected"),
+        ("uuid-2", "2026-02-22T10:00:00", "NoAnswer"),
+        ("uuid-1", "2026-02-23T09:00:00", "Connected"),
+        ("uuid-2", "2026-02-23T11:00:00", "NoAnswer"),
+    ]:
+        sqlite_service.append_call_log({
+            "contact_id": contact_id, "timestamp": ts,
+            "duration_seconds": 30, "disposition": disposition,
+        })
+
+    assert len(sqlite_service.get_call_logs_for_contact("uuid-1")) == 2
+    total, page = sqlite_service.get_call_history("uuid-1", limit=1)
+    assert total == 2
+    assert [log["timestamp"] for log in page] == ["2026-02-23T09:00:00"]
+    by_date = sqlite_service.get_call_logs_by_date("2026-02-23")
+    assert [log["timestamp"] for log in by_date] == ["2026-02-23T09:00:00", "2026-02-23T11:00:00"]
+    assert sqlite_service.get_call_activity(date(2026, 2, 23)) == {
+        "calls": 2, "connected": 1, "streak": 3,
+    }
+    assert sqlite_service.get_call_activity(date(2026, 2, 24))["streak"] == 0
+
+
+def test_get_call_series(sqlite_service):
+    for timestamp, duration, disposition in [
+        ("2026-02-15T10:00:00", 10, "Connected"),
+        ("2026-02-16T10:00:00", 100, "Connected"),
+        ("2026-02-16T11:00:00", 0, "NoAnswer"),
+        ("2026-02-23T09:00:00", 60, "Connected"),
+    ]:
+        sqlite_service.append_call_log({
+            "contact_id": "uuid-1", "timestamp": timestamp,
+            "duration_seconds": duration, "disposition": disposition,
+        })
+    daily = sqlite_service.get_call_series(date(2026, 2, 16), date(2026, 2, 17), "day")
+    assert daily[0] == {
+        "start": "2026-02-16", "calls": 2, "connected": 1, "connect_rate": 0.5,
+        "avg_duration_seconds": 50.0, "dispositions": {"Connected": 1, "NoAnswer": 1},
+    }
+    assert daily[1]["calls"] == 0
+    weekly = sqlite_service.get_call_series(date(2026, 2, 15), date(2026, 2, 23), "week")
+    assert [(p["start"], p["calls"]) for p in weekly] == [
+        ("2026-02-15", 1), ("2026-02-16", 2), ("2026-02-23", 1),
+    ]
+
+
+def test_find_contacts(sqlite_service):
+    sqlite_service.create_contacts([
+        {"name": "Alice", "phone": "1", "id": "uuid-1", "city": "Pune"},
+        {"name": "Bob", "phone": "2", "id": "uuid-2", "city": "Pune", "deal_stage": "Won"},
+        {"name": "Cat", "phone": "3", "id": "uuid-3"},
+    ])
+    assert [c["id"] for c in sqlite_service.find_contacts(city="Pune")] == ["uuid-1", "uuid-2"]
+    assert [c["id"] for c in sqlite_service.find_contacts(exclude={"deal_stage": {"Won"}})] == [
+        "uuid-1", "uuid-3",
+    ]
+    assert [c["id"] for c in sqlite_service.find_contacts(city=None)] == ["uuid-3"]
+    assert sqlite_service.count_contacts_by("deal_stage") == {"New": 2, "Won": 1}
+
+
+def test_get_call_plan(sqlite_service):
+    sqlite_service.create_contacts([
+        {"name": "Alice", "phone": "1", "id": "uuid-1"},
+        {"name": "Bob", "phone": "2", "id": "uuid-2", "deal_stage": "Contacted",
+         "next_follow_up": "2026-02-20"},
+        {"name": "Cat", "phone": "3", "id": "uuid-3", "deal_stage": "Won",
+         "next_follow_up": "2026-02-20"},
+        {"name": "Dan", "phone": "4", "id": "uuid-4", "next_follow_up": "2099-12-31"},
+    ])
+    sqlite_service.update_contact("uuid-4", {"call_count": 1})
+    total, plan = sqlite_service.get_call_plan()
+    assert total == 2
+    assert [(reason, c["id"]) for reason, _, c in plan] == [
+        ("Follow-up due", "uuid-2"), ("New contact", "uuid-1"),
+    ]
+    sqlite_service.append_call_log({
+        "contact_id": "uuid-2", "duration_seconds": 0, "disposition": "NoAnswer",
+    })
+    sqlite_service.create_contact({
+        "name": "Eve", "phone": "5", "id": "uuid-5", "deal_stage": "Negotiation",
+        "next_follow_up": "2026-02-20",
+    })
+    assert [c["id"] for _, _, c in sqlite_service.get_call_plan(limit=1, offset=1)[1]] == [
+        "uuid-2",
+    ]
+
+
+def test_search_contacts(sqlite_service):
+    sqlite_service.create_contact({"name": "Sharma Textiles", "phone": "1", "id": "uuid-1"})
+    assert [c["id"] for c in sqlite_service.search_contacts("sharma")] == ["uuid-1"]
+
+    sqlite_service.create_contact({"name": "Bob", "phone": "2", "id": "uuid-2"})
+    sqlite_service.append_call_log({
+        "contact_id": "uuid-2", "duration_seconds": 30,
+        "disposition": "Connected", "summary": "Sharma referred us",
+    })
+    sqlite_service.delete_contact("uuid-1")
+    assert [c["id"] for c in sqlite_service.search_contacts("sharma")] == ["uuid-2"]
+
+
+def test_get_changes(sqlite_service):
+    sqlite_service.create_contact({"name": "Alice", "phone": "123", "id": "uuid-1"})
+    sqlite_service.create_contact({"name": "Bob", "phone": "456", "id": "uuid-2"})
+    first = sqlite_service.get_changes(None)
+    assert first["reset"] is True
+    assert len(first["contacts"]) == 2
+
+    sqlite_service.update_contact("uuid-1", {"notes": "hot"})
+    sqlite_service.delete_contact("uuid-2")
+    log = sqlite_service.append_call_log(
+        {"contact_id": "uuid-1", "duration_seconds": 5, "disposition": "NoAnswer"}
+    )
+
+    result = sqlite_service.get_changes(first["cursor"])
+    assert result["reset"] is False
+    assert [c["notes"] for c in result["contacts"]] == ["hot"]
+    assert result["deleted"] == ["uuid-2"]
+    assert [entry["id"] for entry in result["call_logs"]] == [log["id"]]
+    assert sqlite_service.get_changes(result["cursor"])["contacts"] == []
+
+
+def test_changes_trimmed_to_changelog_size(tmp_path):
+    service = _make_service(tmp_path, mirror=False, changelog_size=2)
+    service.create_contact({"name": "Alice", "phone": "123", "id": "uuid-1"})
+    stale = service.get_changes(None)["cursor"]
+    for i in range(5):
+        service.update_contact("uuid-1", {"notes": str(i)})
+    assert service._query("SELECT COUNT(*) AS n FROM changes")[0]["n"] <= 4
+    assert service.get_changes(stale)["reset"] is True
+    recent = service.get_changes(None)["cursor"]
+    service.close()
+
+    restarted = _make_service(tmp_path, mirror=False, changelog_size=2)
+    assert restarted.get_changes(stale)["reset"] is True
+    assert restarted.get_changes(recent)["reset"] is False
+    restarted.close()
+
+
+def test_data_survives_restart(tmp_path):
+    service = _make_service(tmp_path, mirror=False)
+    created = service.create_contact({"name": "Carol", "phone": "789"})
+    service.close()
+
+    service = _make_service(tmp_path, mirror=False)
+    assert service.get_contact_by_id(created["id"])["name"] == "Carol"
+    service.close()
+
+
+def test_seeds_from_sheets_and_mirrors_writes(tmp_path, mirror):
+    service = _make_service(tmp_path, mirror=True)
+    assert service.get_contact_by_id("uuid-1")["call_count"] == 2
+
+    service.update_contact("uuid-1", {"call_count": 3})
+    call_log, _ = service.record_call("uuid-1", lambda c: (
+        {"contact_id": "uuid-1", "duration_seconds": 5, "disposition": "NoAnswer"},
+        {"call_count": c["call_count"] + 1},
+    ))
+    created = service.create_contact({"name": "Carol", "phone": "789"})
+    service.delete_contact("uuid-1")
+    service.close()
+
+    mirror["update_contacts"].assert_called_once_with({"uuid-1": {"call_count": 3}})
+    assert mirror["create_contacts"].call_args[0][0][0]["id"] == created["id"]
+    mirror["delete_contact"].assert_called_once_with("uuid-1")
+    [(contact_id, build)] = mirror["record_calls"].call_args[0][0]
+    assert contact_id == "uuid-1"
+    assert build(None) == (call_log, {"call_count": 4})
+
+
+def test_mirror_failure_does_not_fail_write(tmp_path, mirror):
+    mirror["append_call_logs"].side_effect = RuntimeError("quota")
+    service = _make_service(tmp_path, mirror=True)
+    service.append_call_log({
+        "contact_id": "uuid-1", "duration_seconds": 5, "disposition": "NoAnswer",
+    })
+    assert len(service.get_call_logs_for_contact("uuid-1")) == 1
+    service.close()
+    mirror["append_call_logs"].assert_called_once()
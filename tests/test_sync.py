@@ -0,0 +1,21 @@
+def test_sync_passes_cursor(client, mock_sheets):
+    mock_sheets.get_changes.return_value = {
+        "cursor": "abc.7", "reset": False,
+        "contacts": [], "deleted": ["uuid-2"], "call_logs": [],
+    }
+
+    response = client.get("/api/sync", params={"since": "abc.5"})
+    assert response.status_code == 200
+    assert response.json()["deleted"] == ["uuid-2"]
+    mock_sheets.get_changes.assert_called_once_with("abc.5")
+
+
+def test_sync_without_cursor(client, mock_sheets):
+    mock_sheets.get_changes.return_value = {
+        "cursor": "abc.0", "reset": True,
+        "contacts": [], "deleted": [], "call_logs": [],
+    }
+
+    response = client.get("/api/sync")
+    assert response.json()["reset"] is True
+    mock_sheets.get_changes.assert_called_once_with(None)
@@ -0,0 +1,222 @@
+import json
+import threading
+from functools import partial
+from unittest.mock import MagicMock
+
+import pytest
+
+from tests.conftest import (
+    CALL_LOG_HEADERS,
+    CONTACT_HEADERS,
+    make_contact_row,
+    mock_spreadsheet,
+)
+
+@pytest.fixture
+def make_service(make_sheets_service):
+    """Build write-behind SheetsServices that share one journal and sheet."""
+    contacts_ws = MagicMock()
+    call_logs_ws = MagicMock()
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1"),
+        make_contact_row(id="uuid-2", name="Bob"),
+    ]
+    call_logs_ws.get_all_values.return_value = [CALL_LOG_HEADERS]
+    spreadsheet = mock_spreadsheet(contacts_ws, call_logs_ws)
+    make = partial(make_sheets_service, spreadsheet, write_behind=True)
+    return make, contacts_ws, call_logs_ws
+
+
+def _journal_ops(tmp_path):
+    with open(tmp_path / "journal.jsonl") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_writes_acknowledged_without_sheet_calls(make_service):
+    make, contacts_ws, call_logs_ws = make_service
+    service = make()
+    created = service.create_contact({"name": "Carol", "phone": "789"})
+    service.update_contact("uuid-1", {"call_count": 1})
+    service.delete_contact("uuid-2")
+    service.append_call_log({"contact_id": "uuid-1", "duration_seconds": 5, "disposition": "NoAnswer"})
+
+    contacts_ws.append_row.assert_not_called()
+    contacts_ws.append_rows.assert_not_called()
+    contacts_ws.batch_update.assert_not_called()
+    contacts_ws.delete_rows.assert_not_called()
+    call_logs_ws.append_rows.assert_not_called()
+
+    ids = [c["id"] for c in service.get_all_contacts()]
+    assert ids == ["uuid-1", created["id"]]
+    assert service.get_contact_by_id("uuid-1")["call_count"] == 1
+    assert service.get_contact_by_id("uuid-2") is None
+    assert len(service.get_call_logs_for_contact("uuid-1")) == 1
+    assert [c["id"] for c in service.find_contacts(deal_stage="New")] == ["uuid-1", created["id"]]
+
+
+def test_record_call_is_journaled(make_service, tmp_path):
+    make, contacts_ws, call_logs_ws = make_service
+    service = make()
+    call_log, contact = service.record_call("uuid-1", lambda c: (
+        {"contact_id": c["id"], "duration_seconds": 5, "disposition": "NoAnswer"},
+        {"call_count": c["call_count"] + 1},
+    ))
+    assert contact["call_count"] == 1
+    assert service.record_call("missing", lambda c: ({}, {})) is None
+    [entry] = _journal_ops(tmp_path)
+    assert [op["op"] for op in entry["ops"]] == ["update", "log"]
+    contacts_ws.batch_update.assert_not_called()
+    call_logs_ws.append_rows.assert_not_called()
+
+    service.flush()
+    assert contacts_ws.batch_update.call_args[0][0] == [{"range": "K2", "values": [[1]]}]
+    assert call_logs_ws.append_rows.call_args[0][0][0][0] == call_log["id"]
+
+
+def test_journal_synced_outside_cache_lock(make_service):
+    make, _, _ = make_service
+    service = make()
+    append = service._journal.append
+    readers = []
+
+    def slow_append(ops):
+        # A reader on another thread gets through while the journal syncs.
+        reader = threading.Thread(target=service.get_contact_by_id, args=("uuid-2",))
+        reader.start()
+        reader.join(timeout=5)
+        readers.append(reader.is_alive())
+        append(ops)
+
+    service._journal.append = slow_append
+    service.update_contact("uuid-1", {"notes": "hot lead"})
+    service.record_call("uuid-1", lambda c: (
+        {"contact_id": c["id"], "duration_seconds": 5, "disposition": "NoAnswer"},
+        {"call_count": c["call_count"] + 1},
+    ))
+    assert readers == [False, False]
+    assert service.get_contact_by_id("uuid-1")["notes"] == "hot lead"
+
+
+def test_flush_coalesces_writes(make_service):
+    make, contacts_ws, call_logs_ws = make_service
+    service = make()
+    created = service.create_contact({"name": "Carol", "phone": "789"})
+    service.update_contact(created["id"], {"call_count": 1})
+    service.update_contact(created["id"], {"call_count": 2, "notes": "VIP"})
+    service.update_contact("uuid-1", {"call_count": 1})
+    service.update_contact("uuid-1", {"call_count": 2})
+    temp = service.create_contact({"name": "Temp", "phone": "000"})
+    service.delete_contact(temp["id"])
+    contacts_ws.cell.return_value.value = "uuid-2"
+    service.delete_contact("uuid-2")
+    service.append_call_log({"contact_id": "uuid-1", "duration_seconds": 5, "disposition": "NoAnswer"})
+    service.append_call_log({"contact_id": "uuid-1", "duration_seconds": 9, "disposition": "NoAnswer"})
+
+    service.flush()
+
+    contacts_ws.append_rows.assert_called_once()
+    rows = contacts_ws.append_rows.call_args[0][0]
+    assert len(rows) == 1
+    assert rows[0][0] == created["id"]
+    assert rows[0][10] == 2
+    assert rows[0][13] == "VIP"
+    contacts_ws.batch_update.assert_called_once()
+    assert contacts_ws.batch_update.call_args[0][0] == [{"range": "K2", "values": [[2]]}]
+    contacts_ws.delete_rows.assert_called_once_with(3)
+    call_logs_ws.append_rows.assert_called_once()
+    assert len(call_logs_ws.append_rows.call_args[0][0]) == 2
+
+    assert not service._pending
+    assert [c["id"] for c in service.get_all_contacts()] == ["uuid-1", created["id"]]
+
+
+def test_update_during_create_flush_stays_visible(make_service):
+    make, contacts_ws, _ = make_service
+    service = make()
+    created = service.create_contact({"name": "Carol", "phone": "789"})
+
+    def update_mid_flush(rows):
+        service.update_contact(created["id"], {"notes": "VIP"})
+        assert service.get_contact_by_id(created["id"])["notes"] == "VIP"
+
+    contacts_ws.append_rows.side_effect = update_mid_flush
+    service.flush()
+
+    assert service.get_contact_by_id(created["id"])["notes"] == "VIP"
+    assert service.search_contacts("vip") == [service.get_contact_by_id(created["id"])]
+    assert service._pending.updates == {created["id"]: {"notes": "VIP"}}
+
+
+def test_failed_flush_keeps_operations(make_service, tmp_path):
+    make, contacts_ws, _ = make_service
+    service = make()
+    service.create_contact({"name": "Carol", "phone": "789"})
+    service.update_contact("uuid-1", {"call_count": 3})
+    contacts_ws.batch_update.side_effect = RuntimeError("429 quota exceeded")
+
+    with pytest.raises(RuntimeError):
+        service.flush()
+
+    # The create went out; only the update is still queued.
+    contacts_ws.append_rows.assert_called_once()
+    assert [op["op"] for op in _journal_ops(tmp_path)] == ["update"]
+    assert service.get_contact_by_id("uuid-1")["call_count"] == 3
+
+    contacts_ws.batch_update.side_effect = None
+    service.flush()
+    contacts_ws.append_rows.assert_called_once()
+    assert _journal_ops(tmp_path) == []
+
+
+def test_journal_replayed_after_restart(make_service):
+    make, contacts_ws, _ = make_service
+    service = make()
+    created = service.create_contact({"name": "Carol", "phone": "789"})
+    service.update_contact("uuid-1", {"notes": "hot lead"})
+    service._stop_flushing.set()  # simulate a crash: nothing was flushed
+
+    restarted = make()
+    assert restarted.get_contact_by_id(created["id"])["name"] == "Carol"
+    assert restarted.get_contact_by_id("uuid-1")["notes"] == "hot lead"
+
+    restarted.flush()
+    contacts_ws.append_rows.assert_called_once()
+
+
+def test_torn_record_call_replays_neither_write(make_service, tmp_path):
+    make, contacts_ws, call_logs_ws = make_service
+    service = make()
+    service.record_call("uuid-1", lambda c: (
+        {"contact_id": c["id"], "duration_seconds": 5, "disposition": "NoAnswer"},
+        {"call_count": c["call_count"] + 1},
+    ))
+    service._stop_flushing.set()
+    path = tmp_path / "journal.jsonl"
+    path.write_text(path.read_text()[:-20])
+
+    restarted = make()
+    assert restarted.get_contact_by_id("uuid-1")["call_count"] == 0
+    assert restarted.get_call_logs_for_contact("uuid-1") == []
+    restarted.flush()
+    contacts_ws.batch_update.assert_not_called()
+    call_logs_ws.append_rows.assert_not_called()
+
+
+def test_replayed_create_already_in_sheet_not_duplicated(make_service):
+    make, contacts_ws, _ = make_service
+    service = make()
+    created = service.create_contact({"name": "Carol", "phone": "789"})
+    service._stop_flushing.set()
+
+    # The append reached Google before the crash, the journal rewrite did not.
+    contacts_ws.get_all_values.return_value = [
+        CONTACT_HEADERS,
+        make_contact_row(id="uuid-1"),
+        make_contact_row(id="uuid-2", name="Bob"),
+        make_contact_row(id=created["id"], name="Carol", phone="789"),
+    ]
+    restarted = make()
+    restarted.flush()
+    contacts_ws.append_rows.assert_not_called()
+    assert len(restarted.get_all_contacts()) == 3